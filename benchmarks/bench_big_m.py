@@ -0,0 +1,158 @@
+"""
+bench_big_m.py
+
+Branch-and-bound nodes, simplex iterations, root LP bound and solve time of the
+big-M models before and after `utils.big_m.tighten_big_m`:
+
+    fixed_charge   practice_code/fixedCharge.py (M = 9999999)
+    either_or      practice_code/EitherOr.py (M = [2000, 2000, 1200] and 9999)
+    facility       a seeded capacitated facility-location model with
+                   x[i, j] <= M * y[i], M = 1e6
+
+Each model is solved as written ("original"), with M from bound propagation
+("bounds"), with M from auxiliary LPs ("lp") and with indicator constraints
+("indicator"). Gurobi's presolve and cuts tighten big-Ms on their own, so
+--raw switches them off to show the formulation itself.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_big_m
+    python -m benchmarks.bench_big_m --raw --facilities 12 --customers 60
+"""
+import argparse
+import time
+
+import gurobipy as gp
+import numpy as np
+from gurobipy import GRB
+
+from utils.big_m import tighten_big_m
+
+VARIANTS = ("original", "bounds", "lp", "indicator")
+
+
+##############################
+# Models
+##############################
+def fixed_charge(env):
+    M = 9999999
+    PRICE, VARCOST, FIXEDCOST = [12, 8, 15], [6, 4, 8], [200, 150, 100]
+    LABOR, CLOTH = [3, 2, 6], [4, 3, 4]
+    m = gp.Model("fixed_charge", env=env)
+    m.modelSense = GRB.MAXIMIZE
+    x = m.addVars(3, vtype=GRB.INTEGER, name="x")
+    y = m.addVars(3, vtype=GRB.BINARY, name="y")
+    m.addConstrs((x[i] <= M * y[i] for i in range(3)), name="link")
+    m.addConstr(gp.quicksum(LABOR[i] * x[i] for i in range(3)) <= 150, name="labor")
+    m.addConstr(gp.quicksum(CLOTH[i] * x[i] for i in range(3)) <= 160, name="cloth")
+    m.setObjective(gp.quicksum((PRICE[i] - VARCOST[i]) * x[i] - FIXEDCOST[i] * y[i] for i in range(3)))
+    return m
+
+
+def either_or(env):
+    M = [2000, 2000, 1200]
+    PROFIT, STEEL, LABOR, MINREQ = [2, 3, 4], [1.5, 3, 5], [30, 25, 40], [1000, 1000, 1000]
+    m = gp.Model("either_or", env=env)
+    m.modelSense = GRB.MAXIMIZE
+    x = m.addVars(3, vtype=GRB.INTEGER, name="x")
+    y = m.addVars(4, vtype=GRB.BINARY, name="y")
+    for i in range(3):
+        m.addConstr(MINREQ[i] - x[i] <= M[i] * y[i], name=f"minreq[{i}]")
+        m.addConstr(x[i] <= M[i] * (1 - y[i]), name=f"zero[{i}]")
+    m.addConstr(gp.quicksum(STEEL[i] * x[i] for i in range(3)) <= 6000, name="steel")
+    m.addConstr(gp.quicksum(LABOR[i] * x[i] for i in range(3)) <= 60000, name="labor")
+    m.addConstr(x[1] <= 9999 * y[3], name="midsize")
+    m.addConstr(1 - x[0] <= 9999 * (1 - y[3]), name="compact")
+    m.setObjective(gp.quicksum(PROFIT[i] * x[i] for i in range(3)))
+    return m
+
+
+def facility(env, n_facilities=10, n_customers=40, seed=0, M=1e6):
+    rng = np.random.default_rng(seed)
+    demand = rng.integers(5, 30, n_customers)
+    capacity = rng.integers(60, 160, n_facilities)
+    fixed = rng.integers(300, 900, n_facilities)
+    pts_f = rng.uniform(0, 100, (n_facilities, 2))
+    pts_c = rng.uniform(0, 100, (n_customers, 2))
+    cost = np.linalg.norm(pts_f[:, None] - pts_c[None], axis=2)
+    m = gp.Model("facility", env=env)
+    x = m.addVars(n_facilities, n_customers, name="x")
+    y = m.addVars(n_facilities, vtype=GRB.BINARY, name="y")
+    m.addConstrs((x.sum("*", j) >= demand[j] for j in range(n_customers)), name="demand")
+    m.addConstrs((x.sum(i, "*") <= capacity[i] for i in range(n_facilities)), name="capacity")
+    m.addConstrs((x[i, j] <= M * y[i] for i in range(n_facilities) for j in range(n_customers)),
+                 name="link")
+    m.setObjective(gp.quicksum(cost[i, j] * x[i, j] for i in range(n_facilities) for j in range(n_customers))
+                   + gp.quicksum(fixed[i] * y[i] for i in range(n_facilities)))
+    return m
+
+
+##############################
+# Runs
+##############################
+def run(build, variant, raw, time_limit):
+    with gp.Env(params={"OutputFlag": 0}) as env:
+        m = build(env)
+        m.update()
+        start = time.perf_counter()
+        changed = 0
+        if variant == "indicator":
+            changed = tighten_big_m(m, indicator=True).indicators
+        elif variant != "original":
+            changed = len(tighten_big_m(m, method=variant).changes)
+        tighten_s = time.perf_counter() - start
+        if raw:
+            m.Params.Presolve = 0
+            m.Params.Cuts = 0
+            m.Params.Heuristics = 0
+        m.Params.Threads = 1
+        m.Params.TimeLimit = time_limit
+        root = None
+        if variant != "indicator":
+            relaxed = m.relax()
+            relaxed.optimize()
+            root = relaxed.ObjVal if relaxed.Status == GRB.OPTIMAL else None
+        m.optimize()
+        return {
+            "model":     m.ModelName,
+            "variant":   variant,
+            "changed":   changed,
+            "root_lp":   root,
+            "objective": m.ObjVal if m.SolCount else None,
+            "nodes":     int(m.NodeCount),
+            "iters":     int(m.IterCount),
+            "solve_s":   m.Runtime,
+            "tighten_s": tighten_s,
+        }
+
+
+def _fmt(v):
+    if v is None:
+        return "-"
+    return f"{v:,.4g}" if isinstance(v, float) else str(v)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Big-M tightening benchmark")
+    parser.add_argument("--raw", action="store_true",
+                        help="switch off presolve, cuts and heuristics")
+    parser.add_argument("--facilities", type=int, default=10)
+    parser.add_argument("--customers", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--time-limit", type=float, default=60.0)
+    args = parser.parse_args(argv)
+
+    models = [
+        fixed_charge,
+        either_or,
+        lambda env: facility(env, args.facilities, args.customers, args.seed),
+    ]
+    rows = [run(build, variant, args.raw, args.time_limit) for build in models for variant in VARIANTS]
+    columns = list(rows[0])
+    widths = [max(len(c), *(len(_fmt(r[c])) for r in rows)) for c in columns]
+    print("  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    for r in rows:
+        print("  ".join(_fmt(r[c]).ljust(w) for c, w in zip(columns, widths)))
+
+
+if __name__ == "__main__":
+    main()
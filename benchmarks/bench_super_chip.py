@@ -0,0 +1,281 @@
+"""
+bench_super_chip.py
+
+Benchmarks model build, solve and extraction time, peak memory and scaling
+exponents for `super_chip_solve` (and any other registered engine) on seeded
+synthetic instances.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_super_chip --preset small
+    python -m benchmarks.bench_super_chip --sizes 5x30x23 20x200x100 --sparsity 0.5 --tightness 1.05
+    python -m benchmarks.bench_super_chip --preset small --compare benchmarks/results/<commit>.json
+
+Every (engine, instance) pair runs in its own spawned process so the peak RSS
+belongs to that run alone. Results are stored in benchmarks/results/<commit>.json
+and can be compared against the file from an earlier commit.
+"""
+import argparse
+import json
+import math
+import platform
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# every preset size fits under the cap of at least one engine (see ENGINES)
+PRESETS = {
+    "smoke":  [(2, 5, 4), (3, 10, 8), (4, 20, 10)],
+    "small":  [(5, 30, 23), (10, 60, 40), (20, 120, 60)],
+    "medium": [(10, 500, 100), (20, 500, 200)],
+    "large":  [(50, 500, 100), (50, 1000, 100)],
+}
+
+PHASE_COLUMNS = ("build_s", "update_s", "presolve_s", "solve_s", "extraction_s")
+
+
+##############################
+# Engines
+##############################
+def run_super_chip_solve(instance, instrumentor, case):
+    from utils.solution_processor import SolutionExtractor
+    from utils.super_chip_model import super_chip_solve
+
+    supply, demand, costs = instance.to_solver_args()
+    m = super_chip_solve(supply, demand, costs, instance.name, case,
+                         instrumentor=instrumentor, output_dir=None)
+    with instrumentor.phase("extraction"):
+        SolutionExtractor(m).to_df()
+    return {
+        "objective": m.ObjVal if m.SolCount > 0 else None,
+        "num_vars":  m.NumVars,
+    }
+
+
+def run_super_chip_network(instance, instrumentor, case):
+    """
+    The "network" engine fed straight from the sparse `instance.arcs()`: one
+    sink per (chip, region) pair with demand, so the dense (F, C, R) tensor and
+    its nested lists are never built.
+    """
+    from utils.super_chip_model import network_sink_solve
+
+    with instrumentor.phase("build"):
+        chip_idx, region_idx, cost = instance.arcs()
+        need = instance.demand[region_idx, chip_idx]
+    solution = network_sink_solve(instance.name, instance.supply, cost, need, case, instrumentor)
+    return {
+        "objective": solution.ObjVal,
+        "num_vars":  instance.n_arcs,
+    }
+
+
+# engine name -> (runner, largest instance it is run on, counted in dense F * C * R
+# variables for the LP and in arcs with demand for the sparse network engine)
+ENGINES = {
+    "super_chip_solve":   (run_super_chip_solve, 2_000_000),
+    "super_chip_network": (run_super_chip_network, 5_000_000),
+}
+SPARSE_ENGINES = {"super_chip_network"}
+
+
+##############################
+# Runner
+##############################
+def _run_one(engine, size, sparsity, tightness, seed, case):
+    from benchmarks.instance_generator import generate_instance
+    from utils.profiler import peak_rss_mb
+    from utils.solver_instrumentation import SolveInstrumentor
+
+    baseline_rss = peak_rss_mb()
+    start = time.perf_counter()
+    instance = generate_instance(*size, sparsity=sparsity, tightness=tightness, seed=seed)
+    generate_s = time.perf_counter() - start
+
+    runner, _ = ENGINES[engine]
+    instrumentor = SolveInstrumentor(instance.name)
+    start = time.perf_counter()
+    result = runner(instance, instrumentor, case)
+    total_s = time.perf_counter() - start
+
+    record = instrumentor.record()
+    record.pop("progress")
+    rss = peak_rss_mb()
+    record.update({
+        "engine":        engine,
+        "instance":      instance.name,
+        "case":          case,
+        "facilities":    size[0],
+        "chips":         size[1],
+        "regions":       size[2],
+        "sparsity":      sparsity,
+        "tightness":     tightness,
+        "seed":          seed,
+        "n_arcs":        instance.n_arcs,
+        "generate_s":    generate_s,
+        "total_s":       total_s,
+        "peak_rss_mb":   rss,
+        "rss_growth_mb": rss - baseline_rss if rss is not None else None,
+        **result,
+    })
+    return record
+
+
+def run_benchmarks(engines, sizes, sparsity=0.0, tightness=1.2, seed=0, case="alternative"):
+    records = []
+    ctx = get_context("spawn")
+    for engine in engines:
+        _, max_vars = ENGINES[engine]
+        for size in sizes:
+            n_vars = math.prod(size)
+            kind = "dense vars"
+            if engine in SPARSE_ENGINES:
+                n_vars, kind = round(n_vars * (1.0 - sparsity)), "arcs"
+            label = f"{engine:20s} {'x'.join(map(str, size)):>16s}"
+            if n_vars > max_vars:
+                print(f"{label}  skipped ({n_vars:,} {kind} > {max_vars:,})")
+                continue
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                rec = pool.submit(_run_one, engine, size, sparsity, tightness, seed, case).result()
+            records.append(rec)
+            print(
+                f"{label}  build {rec['build_s'] + rec['update_s']:8.3f}s  "
+                f"solve {rec['presolve_s'] + rec['solve_s']:8.3f}s  "
+                f"extract {rec['extraction_s']:8.3f}s  "
+                f"rss {rec['peak_rss_mb'] or float('nan'):8.1f}MB"
+            )
+    return records
+
+
+def scaling_exponents(records):
+    """
+    Fit time ~ a * num_vars^b per engine and phase on a log-log scale.
+    b close to 1 is linear scaling; anything well above it is worth a look.
+    """
+    out = []
+    for engine in sorted({r["engine"] for r in records}):
+        runs = [r for r in records if r["engine"] == engine and r.get("num_vars")]
+        if len({r["num_vars"] for r in runs}) < 2:
+            continue
+        x = np.log([r["num_vars"] for r in runs])
+        for col in PHASE_COLUMNS + ("total_s",):
+            y = np.array([r[col] for r in runs], dtype=float)
+            if (y <= 0).any():
+                continue
+            slope, _ = np.polyfit(x, np.log(y), 1)
+            out.append({"engine": engine, "phase": col, "exponent": float(slope)})
+    return out
+
+
+##############################
+# Storage and comparison
+##############################
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def save_results(records, scaling, filename=None):
+    import gurobipy
+
+    commit = _git_commit()
+    path = Path(filename) if filename else RESULTS_DIR / f"{commit}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "meta": {
+            "commit":  commit,
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python":  platform.python_version(),
+            "gurobi":  ".".join(map(str, gurobipy.gurobi.version())),
+            "machine": platform.platform(),
+        },
+        "runs":    records,
+        "scaling": scaling,
+    }
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
+    print(f"Benchmark results written to {path}")
+    return path
+
+
+def compare(records, baseline_file, tolerance=0.10, min_seconds=0.005):
+    """
+    Print per-run time ratios against a stored baseline and return the regressions,
+    i.e. phases that got slower by more than `tolerance` and at least `min_seconds`.
+    """
+    with open(baseline_file) as f:
+        baseline = json.load(f)
+    key = lambda r: (r["engine"], r["instance"], r["case"])
+    base_runs = {key(r): r for r in baseline["runs"]}
+
+    print(f"\nComparison against {baseline['meta']['commit']} ({baseline_file})")
+    print(f"{'Engine':20s} | {'Instance':36s} | {'Phase':12s} | {'Base':>9s} | {'Now':>9s} | {'Ratio':>6s}")
+    print("-" * 106)
+    regressions = []
+    for rec in records:
+        base = base_runs.get(key(rec))
+        if base is None:
+            continue
+        for col in PHASE_COLUMNS + ("total_s",):
+            b, n = base[col], rec[col]
+            ratio = n / b if b > 0 else float("inf")
+            flag = ""
+            if ratio > 1 + tolerance and n - b >= min_seconds:
+                flag = "  REGRESSION"
+                regressions.append((key(rec), col, b, n))
+            print(f"{rec['engine']:20s} | {rec['instance'][:36]:36s} | {col:12s} | "
+                  f"{b:9.4f} | {n:9.4f} | {ratio:6.2f}{flag}")
+    return regressions
+
+
+def _parse_size(text):
+    parts = tuple(int(p) for p in text.lower().split("x"))
+    if len(parts) != 3:
+        raise argparse.ArgumentTypeError("sizes are FxCxR, e.g. 5x30x23")
+    return parts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Super Chip model benchmarks")
+    parser.add_argument("--preset", choices=PRESETS, default="smoke")
+    parser.add_argument("--sizes", nargs="+", type=_parse_size,
+                        help="instance sizes as FxCxR; overrides --preset")
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=list(ENGINES))
+    parser.add_argument("--case", choices=("base", "alternative"), default="alternative")
+    parser.add_argument("--sparsity", type=float, default=0.0)
+    parser.add_argument("--tightness", type=float, default=1.2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes or PRESETS[args.preset]
+    records = run_benchmarks(args.engines, sizes, args.sparsity, args.tightness, args.seed, args.case)
+    if not records:
+        raise SystemExit("every instance was over the size cap of the selected engines; nothing to save")
+    scaling = scaling_exponents(records)
+    for s in scaling:
+        print(f"{s['engine']:20s} {s['phase']:14s} exponent {s['exponent']:5.2f}")
+    save_results(records, scaling, args.output)
+
+    if args.compare:
+        regressions = compare(records, args.compare, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} phase(s) regressed by more than {args.tolerance:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
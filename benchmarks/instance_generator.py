@@ -0,0 +1,122 @@
+import numpy as np
+
+
+class SuperChipInstance:
+    """
+    A synthetic facility x chip x region transportation instance.
+
+    Shipping costs are kept in factored form (facility-region distance times a
+    per-chip shipping rate) so instances up to 500 x 5,000 x 1,000 fit in memory;
+    the dense (F, C, R) tensor is only materialised on request.
+
+    Attributes:
+        supply (np.ndarray):    (F,)   production capacity per facility.
+        demand (np.ndarray):    (R, C) demand per region and chip, zero where sparse.
+        prod_cost (np.ndarray): (F, C) production cost per unit.
+        distance (np.ndarray):  (F, R) facility-region distance.
+        ship_rate (np.ndarray): (C,)   shipping cost per unit of distance for each chip.
+    """
+
+    def __init__(self, name, supply, demand, prod_cost, distance, ship_rate):
+        self.name = name
+        self.supply = supply
+        self.demand = demand
+        self.prod_cost = prod_cost
+        self.distance = distance
+        self.ship_rate = ship_rate
+
+    @property
+    def shape(self):
+        n_regions, n_chips = self.demand.shape
+        return len(self.supply), n_chips, n_regions
+
+    @property
+    def n_vars(self) -> int:
+        n_facilities, n_chips, n_regions = self.shape
+        return n_facilities * n_chips * n_regions
+
+    @property
+    def n_arcs(self) -> int:
+        """Variables needed when only (chip, region) pairs with demand get arcs."""
+        return len(self.supply) * int(np.count_nonzero(self.demand))
+
+    def shipping_cost(self) -> np.ndarray:
+        """Dense shipping_cost[f, c, r]."""
+        return self.distance[:, None, :] * self.ship_rate[None, :, None]
+
+    def arcs(self):
+        """
+        Sparse view over the (chip, region) pairs that carry demand.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]:
+                chip and region index of each demand pair, and the (F, n_pairs)
+                production + shipping cost of serving it from each facility.
+        """
+        region_idx, chip_idx = np.nonzero(self.demand)
+        cost = (
+            self.prod_cost[:, chip_idx]
+            + self.distance[:, region_idx] * self.ship_rate[chip_idx]
+        )
+        return chip_idx, region_idx, cost
+
+    def to_solver_args(self):
+        """(supply, demand, [shipping_cost, prod_cost]) in the nested layout `super_chip_solve` indexes."""
+        return (
+            self.supply.tolist(),
+            self.demand.tolist(),
+            [self.shipping_cost().tolist(), self.prod_cost.tolist()],
+        )
+
+
+def generate_instance(n_facilities, n_chips, n_regions, sparsity=0.0, tightness=1.2, seed=0):
+    """
+    Build a seeded synthetic Super Chip instance.
+
+    Magnitudes follow the SuperChip workbook: production costs of 40-80 per unit,
+    shipping costs of a few dollars and about 1.5 thousand units of demand per
+    (region, chip) pair.
+
+    Args:
+        n_facilities (int): Number of facilities F.
+        n_chips (int): Number of chip types C.
+        n_regions (int): Number of sales regions R.
+        sparsity (float, optional):
+            Fraction of (region, chip) pairs with zero demand. Defaults to 0.
+        tightness (float, optional):
+            Total capacity divided by total demand. Values near 1 make capacity
+            binding, values below 1 make the instance infeasible. Defaults to 1.2.
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        SuperChipInstance
+    """
+    if not 0.0 <= sparsity < 1.0:
+        raise ValueError("sparsity must be in [0, 1)")
+
+    rng = np.random.default_rng(seed)
+
+    demand = rng.lognormal(mean=0.25, sigma=0.5, size=(n_regions, n_chips))
+    if sparsity > 0:
+        demand[rng.random((n_regions, n_chips)) < sparsity] = 0.0
+        if not demand.any():
+            demand[rng.integers(n_regions), rng.integers(n_chips)] = 1.0
+
+    # facilities get uneven shares of the total capacity, like the workbook
+    shares = rng.dirichlet(np.full(n_facilities, 2.0))
+    supply = shares * demand.sum() * tightness
+
+    facility_xy = rng.uniform(0, 1000, size=(n_facilities, 2))
+    region_xy = rng.uniform(0, 1000, size=(n_regions, 2))
+    distance = np.sqrt(((facility_xy[:, None, :] - region_xy[None, :, :]) ** 2).sum(axis=2)) / 1000
+
+    ship_rate = rng.uniform(1.0, 3.0, size=n_chips)
+    facility_factor = rng.uniform(0.9, 1.1, size=(n_facilities, 1))
+    prod_cost = (
+        rng.uniform(40.0, 80.0, size=(1, n_chips))
+        * facility_factor
+        * rng.uniform(0.95, 1.05, size=(n_facilities, n_chips))
+    )
+
+    name = f"F{n_facilities}_C{n_chips}_R{n_regions}_sp{sparsity:g}_t{tightness:g}_s{seed}"
+    return SuperChipInstance(name, supply, demand, prod_cost, distance, ship_rate)
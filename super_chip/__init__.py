@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+super_chip
+
+Project:     Optimizing Production and Distribution at Super Chip Company
+Author:      Jonathan Wilson
+Created:     Apr 2025
+Last Modified: May 2025
+
+Evn & Setup:
+    Ubuntu Linux
+    conda env create -f environment.yml
+
+Dependencies:
+    See conda environment.yml
+
+Usage:
+    python -m super_chip report          # the full analysis, previously `python super_chip.py`
+    python -m super_chip --help
+
+    from super_chip import super_chip_solve, load_data
+
+Importing the package is cheap: the solver, the data wrangling and the analysis
+(and with them gurobipy, polars, pandas and bokeh) are only imported on first use.
+"""
+import importlib
+
+##########################################################################################
+# User defined classes and functions - to keep things clean and tidy
+##########################################################################################
+# super_chip_solve (utils/super_chip_model.py):
+#   Builds and solves the base / alternative production-shipment LP
+# load_data / SuperChipData (super_chip/data.py):
+#   Reads the workbook and pivots it into the nested lookups super_chip_solve indexes
+# SuperChipAnalysis (super_chip/analysis.py):
+#   The four strategic questions, comparison reports, sensitivity CSVs and timings
+# ComparativeReport, SolutionExtractor, SolutionAggregator, BarPlotter,
+# ConstraintSensitivityExtractor, VariableSensitivityExtractor, TimingLog, PipelineProfiler:
+#   see utils/
+
+_LAZY = {
+    "super_chip_solve":  "utils.super_chip_model",
+    "load_data":         "super_chip.data",
+    "SuperChipData":     "super_chip.data",
+    "SuperChipAnalysis": "super_chip.analysis",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
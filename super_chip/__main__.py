@@ -0,0 +1,3 @@
+from super_chip.cli import main
+
+raise SystemExit(main())
@@ -0,0 +1,410 @@
+""" -------------------------------------------------------------------------------------
+                                ___Analysis___
+------------------------------------------------------------------------------------------
+
+##############################
+# Background
+##############################
+Super Chip Inc is a fictitious chip manufacture based in VA.
+They have five manufacturing facilities Alexandria, Richmond, Norfolk, Roanoke, and Charolottesville.
+Super Chip makes 30 different chip products and distributes to 23 different sales regions across the U.S.
+Each facility has different production capacity levels.
+Each facility has different equipment and costs for set-up processes.
+There area also variations in shipping distances and shipping material requirements, different shipping costs
+
+##############################
+# Problem Statement
+##############################
+Super Chip would like a recommendation as to how they should carry out their production and
+distribution operations for the following fiscal year. Included in the recommendation, Super Chip is
+interested in evaluating certain strategic-level questions, one method per question below.
+"""
+import os
+
+from utils.profiler import PipelineProfiler
+from utils.report_generator import ComparativeReport
+from utils.sensitivity_processor import (
+    ConstraintSensitivityExtractor,
+    VariableSensitivityExtractor
+)
+from utils.solution_processor import SolutionExtractor, SolutionAggregator
+from utils.solver_instrumentation import TimingLog
+from utils.demand_simulation import simulate_demand
+from utils.facility_expansion import ExpansionProblem, facility_expansion
+from utils.feasibility import check_super_chip
+from utils.stochastic import StochasticProblem, stochastic_solve
+from utils.super_chip_model import super_chip_solve
+from utils.super_chip_multiperiod import MultiPeriodData, multiperiod_solve
+
+
+def find_min(models):
+    min_model = models[0]
+    for m in models[1:]:
+        if m.ObjVal < min_model.ObjVal:
+            min_model = m
+
+    return min_model
+
+
+class SuperChipAnalysis:
+    """
+    Runs the Super Chip strategic questions against one loaded data set.
+
+    Every solve is instrumented into `timing_log` and every stage is recorded in
+    `profiler`, so `report()` and `timing_log.summary()` cover whatever subset of
+    the analysis was run.
+
+    Args:
+        data (SuperChipData):
+            Wrangled workbook data from `super_chip.data.load_data`.
+        output_dir (str, optional):
+            Root for models_and_solutions/, comparison_reports/ and the sensitivity
+            CSVs. Defaults to the current directory.
+        profiler (PipelineProfiler, optional): Defaults to a fresh profiler.
+        timing_log (TimingLog, optional): Defaults to a fresh log.
+    """
+
+    def __init__(self, data, output_dir: str = ".", profiler=None, timing_log=None):
+        self.data = data
+        self.output_dir = output_dir
+        self.profiler = profiler if profiler is not None else PipelineProfiler()
+        self.timing_log = timing_log if timing_log is not None else TimingLog()
+        self.models_dir = os.path.join(output_dir, "models_and_solutions")
+        self.reports_dir = os.path.join(output_dir, "comparison_reports")
+        os.makedirs(self.models_dir, exist_ok=True)
+        os.makedirs(self.reports_dir, exist_ok=True)
+
+    ##############################
+    # Building blocks
+    ##############################
+    def solve(self, model_name, case="alternative", demand=None, prod_cost=None,
+              extra_capacity=None, scenario=None, engine="gurobi"):
+        instrumentor = self.profiler.instrumentor(scenario or model_name, self.timing_log)
+        costs = [self.data.shipping_cost, prod_cost if prod_cost is not None else self.data.prod_cost]
+        model = super_chip_solve(
+            self.data.prod_cap,
+            demand if demand is not None else self.data.demand,
+            costs,
+            model_name,
+            case,
+            extra_capacity=extra_capacity,
+            instrumentor=instrumentor,
+            output_dir=self.models_dir,
+            engine=engine,
+        )
+        model._instrumentor = instrumentor
+        return model
+
+    def compare(self, model_a, model_b, report_name):
+        with self.profiler.stage("ComparativeReport.generate"):
+            ComparativeReport(model_a, model_b).generate(
+                os.path.join(self.reports_dir, f"Comparison_Report_{report_name}.txt")
+            )
+
+    def facility_totals(self, model):
+        with model._instrumentor.phase("extraction"):
+            df = SolutionExtractor(model).to_df()
+
+        # aggregate by facility (or chip/region) and map zero‐based indices back to facility names
+        by_fac = SolutionAggregator(df).by_group("facility")
+        facilities = [self.data.indx_to_facility[i] for i in by_fac["facility"].to_list()]
+        return facilities, by_fac["total_units"].to_list()
+
+    def sensitivity(self, model, suffix=""):
+        """Constraint and variable sensitivity of `model`, also written out as CSV."""
+        idx_to_facility = self.data.indx_to_facility
+        with self.profiler.stage("ConstraintSensitivityExtractor.to_df"):
+            constraint_df = (
+                ConstraintSensitivityExtractor(model, idx_to_facility)
+                .to_df()
+                .sort("shadow_price", descending=True)
+            )
+        with self.profiler.stage("VariableSensitivityExtractor.to_df"):
+            variable_df = VariableSensitivityExtractor(model, idx_to_facility).to_df()
+        with self.profiler.stage("write_csv"):
+            constraint_df.write_csv(os.path.join(self.output_dir, f"constraint_sensitivity_df{suffix}.csv"))
+            variable_df.write_csv(os.path.join(self.output_dir, f"variable_sensitivity_df{suffix}.csv"))
+        return constraint_df, variable_df
+
+    ##############################
+    # Strategic questions
+    ##############################
+    def policy_comparison(self, plot=False):
+        """
+        ##############################
+        # #1 - Is the current proportional production method good or bad?
+        ##############################
+        Currently, each facility produces each of the 30 types of chips at levels that are proportional to
+        the facility's total portion of production capacity. For example, if facility x has y% of the total
+        production capacity across all facilities, then facility x currently produces y% of every chip's total
+        demand.
+
+        Would you recommend an alternative production policy?
+
+        If so, how would the new policy compare to the current one with respect to costs?
+
+        Analysis approach:
+        - Run two different Transportation Simplex LPs:
+            1. Proportional (Base Case)
+            2. Not constrained to porpotionality of capacity (Alternative Case).
+        - Evaluate the two methods based on their cost where the minimum should be selected.
+
+        Reco:
+        BLUF: Given the alternative model we would save $550,816.38 in combined shipping and production costs.
+
+        In the base case the cost of operations was $49,634,246.78 where as in the alternative case the cost $49,083,430.40.
+        Comparing the distributions for the number of units of chip type c shipped from facility f to region r we see that
+        for the base case numbers for each facility is proportional to their production capacity where as for the alternative
+        case we see a different distribution seen on the grapgh below.
+        """
+        model_base = self.solve("base", "base")
+        model_alternative = self.solve("alternative")
+        self.compare(model_base, model_alternative, "Base_Alt")
+
+        facilities_base, totals_base = self.facility_totals(model_base)
+        facilities_alt, totals_alt = self.facility_totals(model_alternative)
+
+        if plot:
+            # Distribution of units per facility plot; bokeh is only imported here
+            from utils.visualization import BarPlotter
+            BarPlotter.plot(
+                facilities_base,
+                totals_base,
+                output_html="facility_totals_base.html",
+                title="Total Units by Facility (Base Case)",
+                x_label="Facility",
+                y_label="Total Units (thousands)"
+            )
+            BarPlotter.plot(
+                facilities_alt,
+                totals_alt,
+                output_html="facility_totals_alternative.html",
+                title="Total Units by Facility (Alternative Case)",
+                x_label="Facility",
+                y_label="Total Units (thousands)"
+            )
+        return model_base, model_alternative
+
+    def capacity_expansion(self, model_alternative, extra=(0, 61.899, 0, 0, 0), facility="supply_f2"):
+        """
+        ##############################
+        # #2 - Which facility to expand and invest in?
+        ##############################
+        Super Chip has received additional cash flows that are available for capital investment.
+
+        Based on your recommendation to the question above, if Super Chip was to expand the production
+        capacity at a single facility by purchasing additional equipment, which facility should receive the
+        investment of capital?
+
+        How much would a production capacity expansion affect the total costs for production and distribution?
+
+        Analysis approach:
+        - From the alternative case model we extract out various data from the model that will assist in analysis
+        - In particular the shadow prices and sensitivity analysis of RHS contraints of supply will be most beneficial.
+        - Evaluate the shadow prices. The shadow price with zeros are not helpful and ones that are negative will yield
+        costs savings. The RHS ranges should provide the units by which ones can increase the production capacity.
+
+        Reco:
+        BLUF: It's recommended that we increase the production capacity for Richmond by 312.55 units which will yield
+        an additional $23,794.20 assuming we are using the alternative case. No other facility had any benefit to adding
+        additional capacities.
+
+        Analysizing all the other facilities the shadow prices are zero meaning there was no additional savings at these
+        locations. Richmond contained a shadow price of -.70 or $700 which translates into an additional $700 of savings for
+        every additional unit added to capacity up to 312.55 units. If you calculate this you have $700*312.55 or $218,785 in
+        cost savings.
+
+        Sensitivity of the alternative case:
+            Alexandria        - Shadow Price: 0                   - RHS Sensitivity (321.97-inf)
+            Norfolk           - Shadow Price: 0                   - RHS Sensitivity (260.7-inf)
+            Roanoke           - Shadow Price: 0                   - RHS Sensitivity (106.71-inf)
+            Charolottesville  - Shadow Price: 0                   - RHS Sensitivity (37.59-inf)
+            Richmond          - Shadow Price: -0.699999999999996  - RHS Sensitivity (312-312.55)
+        """
+        self.sensitivity(model_alternative)
+
+        extra_model = self.solve("expanding_prod", extra_capacity=list(extra))
+        self.compare(model_alternative, extra_model, "expanding_prod")
+
+        constr_alt = model_alternative.getConstrByName(facility)
+        print(f"Alternative objective value = ${model_alternative.ObjVal*1000:,.2f}")
+        print("Alt RHS is:", constr_alt.RHS)
+        print("Alt Pi  is:", constr_alt.Pi)
+        constr_extra = extra_model.getConstrByName(facility)
+        print(f"Extra objective value = ${extra_model.ObjVal*1000:,.2f}")
+        print("RHS is:", constr_extra.RHS)
+        print("Pi  is:", constr_extra.Pi)
+
+        self.sensitivity(extra_model, suffix="2")
+        print(extra_model.ObjVal)
+        return extra_model
+
+    def demand_increase(self, model_alternative, demand_increase=1.10):
+        """
+        ##############################
+        # #3 - 10% demand increase cand they handle this? Costs?
+        ##############################
+        It is estimated that next year's demand is going to increase by 10% across all of the sales
+        regions.
+
+        Does Super Chip have sufficient capacity to handle the estimated increase in demand?
+
+        If so, what are the associated costs for filling the new demand in comparison to this year's
+        demand?
+
+        Analysis approach:
+        - create a new demand matrix that adds 10% to all demands
+        - resolve the alternative case model with this new demand
+        - evaluate results
+
+        Reco:
+        BLUF: It looks like Super Chip will be able to handle the demand but will sustain and additional cost of
+        $4,940,989.87 to operations. It's recommended that an appropriate price structure be initiated in ordder to
+        cover the costs.
+
+        The solution was able to yield a feasible value hence we are able to satisfy the demand given the resources.
+        However, the cost will be pretty steep.
+        """
+        # demand[0][1] = 2.17 ----> new_demand[0][1] = 2.387
+        new_demand = {
+            outer: {
+                inner: val * demand_increase
+                for inner, val in inner_dict.items()
+            }
+            for outer, inner_dict in self.data.demand.items()
+        }
+        # total capacity against total demand decides feasibility here, no LP needed to say no
+        report = check_super_chip(self.data.prod_cap, new_demand)
+        if not report.feasible:
+            print(f"Demand increase of {demand_increase:g} cannot be met: {report.checks[0].detail}")
+            return None
+        demand_increase_model = self.solve("new_demand", demand=new_demand)
+        self.compare(model_alternative, demand_increase_model, "Alt_new_demand")
+        return demand_increase_model
+
+    def new_tech_sweep(self, model_alternative, decrease_factor=0.85):
+        """
+        ##############################
+        # #4 - New tech and which facility?
+        ##############################
+        Super Chip is evaluating new manufacturing technologies. It is estimated that one of these new
+        technologies could reduce production costs for all of the chips by 15%.
+
+        If Super Chip was to evaluate this new manufacturing technology in one of its facilities, which facility should receive
+        the new technology?
+
+        Analysis approach:
+        - Itereate through the prod_cost for each facility and and reduce the production cost for each chip by 15%. This assumes
+        the new tech would have been applied to this facility.
+        - Rerun the LP solver for each scenario (each facility) and select the facility with the min objective value.
+
+        Reco:
+        BLUF: It's recommended that you place this new technology at the Alexandria facility as it will have an additional
+        cost savings of $2,401,006.97.
+        """
+        models = []
+        for facility in range(self.data.n_facilities):
+            new_prod_cost = {
+                outer: (
+                    {
+                        chip: max(val * decrease_factor, 0) # don't go below 0
+                        for chip, val in inner_dict.items()
+                    }
+                    if outer == facility
+                    else inner_dict.copy()
+                )
+                for outer, inner_dict in self.data.prod_cost.items()
+            }
+
+            new_tech_model = self.solve(f"new_tech_{facility}", prod_cost=new_prod_cost, scenario="new_tech")
+            self.compare(model_alternative, new_tech_model, f"Alt_new_tech_{facility}")
+            models.append(new_tech_model)
+
+        model_tech = find_min(models)
+        print(f"Best objective value = ${model_tech.ObjVal*1000:,.2f}")
+        self.compare(model_alternative, model_tech, "Alt_new_tech")
+        return model_tech
+
+    def multi_period(self, periods=52, demand_increase=1.10, holding_cost=0.0, window=None):
+        """
+        Time-indexed version of #3: the year is split into `periods` periods,
+        demand grows linearly to `demand_increase` times its starting level, and
+        inventory may be built ahead of the peak. `window` solves it with a
+        rolling horizon instead of one LP.
+        """
+        data = MultiPeriodData.from_annual(self.data.prod_cap, self.data.demand, self.data.costs,
+                                           periods=periods, growth=demand_increase,
+                                           holding_cost=holding_cost)
+        with self.profiler.stage("multi_period"):
+            result = multiperiod_solve(data, window=window)
+        print(result)
+        return result
+
+    def expansion_siting(self, module_capacity, module_cost, method="benders", **candidates):
+        """
+        Which facility should receive investment, as one MIP: each facility may
+        buy tiered capacity modules (and `candidates`, see
+        `ExpansionProblem.from_super_chip`, may add new sites) instead of
+        re-solving hand-picked `extra_capacity` vectors.
+        """
+        problem = ExpansionProblem.from_super_chip(
+            self.data.prod_cap, self.data.demand, self.data.costs, module_capacity, module_cost,
+            names=list(self.data.facility_list) + [f"candidate_{g + 1}" for g in
+                                                   range(len(candidates.get("candidate_cost", ())))],
+            **candidates,
+        )
+        with self.profiler.stage("expansion_siting"):
+            result = facility_expansion(problem, method=method)
+        print(result)
+        print(result.to_df())
+        return result
+
+    def stochastic_demand(self, n_scenarios=100, demand_increase=1.10, scale=0.1, method="extensive",
+                          seed=0, **kwargs):
+        """
+        #3 under uncertainty: instead of one +10% demand, plan production against
+        `n_scenarios` sampled demands around it (see `sample_demand`), shipping
+        and shortages decided per scenario. `method="lshaped"` decomposes by
+        scenario for large N; `kwargs` go to the solver (e.g. workers).
+        """
+        problem = StochasticProblem.from_super_chip(
+            self.data.prod_cap, self.data.demand, self.data.costs, n_scenarios=n_scenarios,
+            growth=demand_increase, scale=scale, seed=seed,
+        )
+        with self.profiler.stage("stochastic_demand"):
+            result = stochastic_solve(problem, method=method, **kwargs)
+        print(result)
+        if not result.optimal:
+            print(f"Stopped before optimality (status {result.status}): the plan costs "
+                  f"{result.expected_cost:g}, lower bound {result.bound:g}")
+        print(f"Probability of unmet demand = {result.shortfall_probability():.1%}")
+        return result
+
+    def demand_simulation(self, model_alternative, n_samples=5000, scale=0.1, growth=1.0, workers=1, seed=0):
+        """
+        Distribution of the alternative-case cost under random demand around
+        `demand[r][c]`: cost quantiles and how often each facility's capacity
+        binds. Samples inside the base basis are priced with the demand duals,
+        and only the rest are re-solved.
+        """
+        with self.profiler.stage("demand_simulation"):
+            result = simulate_demand(model_alternative, self.data.demand, n_samples=n_samples, scale=scale,
+                                     growth=growth, seed=seed, workers=workers,
+                                     facilities=list(self.data.facility_list))
+        print(result)
+        for q, cost in zip((0.05, 0.25, 0.5, 0.75, 0.95), result.cost_quantiles()):
+            print(f"P{q * 100:.0f} cost = ${cost * 1000:,.2f}")
+        print(result.to_df())
+        return result
+
+    def run_all(self, plot=False):
+        _, model_alternative = self.policy_comparison(plot=plot)
+        self.capacity_expansion(model_alternative)
+        self.demand_increase(model_alternative)
+        self.new_tech_sweep(model_alternative)
+
+    def write_timings(self):
+        with self.profiler.stage("write_timings"):
+            self.timing_log.write_jsonl(os.path.join(self.models_dir, "solve_timings.jsonl"))
+        print(self.timing_log.summary())
+        print(self.profiler.report(os.path.join(self.models_dir, "pipeline_profile.txt")))
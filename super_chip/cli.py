@@ -0,0 +1,152 @@
+"""
+Command line entry point.
+
+    python -m super_chip solve --case base
+    python -m super_chip solve --extra-capacity 0 61.899 0 0 0 --demand-scale 1.1
+    python -m super_chip solve --engine network
+    python -m super_chip sweep --decrease-factor 0.85
+    python -m super_chip sensitivity
+    python -m super_chip --profile report --plot
+    python -m super_chip serve --port 8765 --workers 2
+
+Heavy modules (gurobipy, polars, pandas, openpyxl, bokeh) are imported inside the
+command that needs them, so `--help` and argument errors return immediately.
+"""
+import argparse
+import os
+
+from super_chip.data import DEFAULT_DATA
+
+
+def _data_path(args):
+    # DataLoader resolves relative paths against utils/, so hand it absolute ones from the command line
+    return args.data if args.data == DEFAULT_DATA else os.path.abspath(args.data)
+
+
+def _analysis(args):
+    from super_chip.analysis import SuperChipAnalysis
+    from super_chip.data import load_data
+    from utils.profiler import PipelineProfiler
+
+    profiler = PipelineProfiler(
+        output_dir=os.path.join(args.output_dir, "profiles"),
+        cprofile=args.cprofile,
+        trace_memory=args.trace_memory,
+    )
+    data = load_data(_data_path(args), profiler=profiler)
+    return SuperChipAnalysis(data, output_dir=args.output_dir, profiler=profiler)
+
+
+def _finish(analysis, args):
+    if args.profile:
+        analysis.write_timings()
+
+
+def cmd_solve(args):
+    analysis = _analysis(args)
+    demand = None
+    if args.demand_scale != 1.0:
+        demand = {
+            r: {c: val * args.demand_scale for c, val in row.items()}
+            for r, row in analysis.data.demand.items()
+        }
+    model = analysis.solve(args.name or args.case, args.case, demand=demand,
+                           extra_capacity=args.extra_capacity, engine=args.engine)
+    if model.SolCount > 0:
+        print(f"{model.ModelName} objective value = ${model.ObjVal*1000:,.2f}")
+    else:
+        print(f"{model.ModelName}: no solution found; status = {model.Status}")
+    _finish(analysis, args)
+    return 0 if model.SolCount > 0 else 1
+
+
+def cmd_sweep(args):
+    analysis = _analysis(args)
+    model_alternative = analysis.solve("alternative")
+    analysis.new_tech_sweep(model_alternative, decrease_factor=args.decrease_factor)
+    _finish(analysis, args)
+    return 0
+
+
+def cmd_sensitivity(args):
+    analysis = _analysis(args)
+    model_alternative = analysis.solve("alternative")
+    if args.extra_capacity:
+        analysis.capacity_expansion(model_alternative, extra=args.extra_capacity)
+    else:
+        analysis.sensitivity(model_alternative)
+    _finish(analysis, args)
+    return 0
+
+
+def cmd_report(args):
+    analysis = _analysis(args)
+    analysis.run_all(plot=args.plot)
+    analysis.write_timings()
+    return 0
+
+
+def cmd_serve(args):
+    from super_chip.data import load_data
+    from super_chip.server import serve
+
+    serve(load_data(_data_path(args)), host=args.host, port=args.port,
+          unix_path=args.unix_socket, workers=args.workers)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="super_chip",
+        description="Super Chip production and distribution LP",
+    )
+    parser.add_argument("--data", default=DEFAULT_DATA,
+                        help="SuperChip workbook (.xlsx or .ods)")
+    parser.add_argument("--output-dir", default=".",
+                        help="where models, reports and CSVs are written")
+    parser.add_argument("--profile", action="store_true",
+                        help="print solve timings and the pipeline profile")
+    parser.add_argument("--cprofile", action="store_true",
+                        help="dump cProfile stats per pipeline stage")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="track Python heap peaks per stage with tracemalloc")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("solve", help="solve one case of the model")
+    p.add_argument("--case", choices=("base", "alternative"), default="alternative")
+    p.add_argument("--name", help="model name (defaults to the case)")
+    p.add_argument("--extra-capacity", nargs="+", type=float,
+                   help="capacity added to each facility")
+    p.add_argument("--demand-scale", type=float, default=1.0,
+                   help="multiply every demand by this factor")
+    p.add_argument("--engine", choices=("gurobi", "network"), default="gurobi",
+                   help="general LP, or the min-cost-flow solver")
+    p.set_defaults(func=cmd_solve)
+
+    p = sub.add_parser("sweep", help="new-technology sweep over the facilities (#4)")
+    p.add_argument("--decrease-factor", type=float, default=0.85,
+                   help="production cost multiplier at the upgraded facility")
+    p.set_defaults(func=cmd_sweep)
+
+    p = sub.add_parser("sensitivity", help="shadow prices and ranging of the alternative case (#2)")
+    p.add_argument("--extra-capacity", nargs="+", type=float,
+                   help="also re-solve with this capacity added per facility")
+    p.set_defaults(func=cmd_sensitivity)
+
+    p = sub.add_parser("report", help="run the full analysis (#1-#4) with comparison reports")
+    p.add_argument("--plot", action="store_true", help="write the facility bar charts")
+    p.set_defaults(func=cmd_report)
+
+    p = sub.add_parser("serve", help="long-running solve service with warm models")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--unix-socket", help="listen on this Unix socket instead of TCP")
+    p.add_argument("--workers", type=int, default=1, help="number of warm models")
+    p.set_defaults(func=cmd_serve)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
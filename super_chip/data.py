@@ -0,0 +1,155 @@
+""" -------------------------------------------------------------------------------------
+                                ___Data Wrangling___
+------------------------------------------------------------------------------------------
+Loads the SuperChip workbook and pivots the long-format sheets into the nested
+lookups `super_chip_solve` indexes:
+
+    prod_cap[f]               -> capacity of facility f
+    demand[r][c]              -> demand in thousands for chip c in region r
+    shipping_cost[f][c][r]    -> shipping cost f_c_r
+    prod_cost[f][c]           -> production cost f_c
+
+polars and the spreadsheet readers are only imported once `load_data` is called.
+"""
+from contextlib import nullcontext
+
+# resolved relative to utils/, like every DataLoader path
+DEFAULT_DATA = "../data/SuperChipData.xlsx"
+
+
+class SuperChipData:
+    def __init__(self, prod_cap, demand, shipping_cost, prod_cost, facility_list):
+        self.prod_cap = prod_cap
+        self.demand = demand
+        self.shipping_cost = shipping_cost
+        self.prod_cost = prod_cost
+        self.facility_list = facility_list
+        self.facility_to_idx = {name: idx for idx, name in enumerate(facility_list)}
+        self.indx_to_facility = {idx: name for idx, name in enumerate(facility_list)}
+
+    @property
+    def costs(self):
+        return [self.shipping_cost, self.prod_cost]
+
+    @property
+    def n_facilities(self):
+        return len(self.prod_cap)
+
+
+def load_data(file_name: str = DEFAULT_DATA, profiler=None) -> SuperChipData:
+    """
+    Read the SuperChip workbook and wrangle it into a `SuperChipData`.
+
+    Args:
+        file_name (str, optional):
+            Workbook path; relative paths are resolved against utils/ as in
+            `DataLoader`. Defaults to "../data/SuperChipData.xlsx".
+        profiler (PipelineProfiler, optional):
+            When given, loading and each pivot are recorded as profiler stages.
+
+    Returns:
+        SuperChipData
+    """
+    import polars as pl
+    from utils.data_loader import DataLoader
+
+    stage = profiler.stage if profiler is not None else (lambda name: nullcontext())
+
+    ##############################
+    # Extract Data
+    ##############################
+    with stage("DataLoader.load"):
+        prod_cap_df, demand_df, shipping_cost_df, prod_cost_df = (
+            DataLoader(file_name)
+            .load()
+        )
+
+    ##############################
+    # Supply
+    ##############################
+    # [f1,f2,...f5]
+    prod_cap = prod_cap_df["Computer Chip Production Capacity (thousands per year)"].to_list()
+
+    # Facility map
+    facility_list = prod_cap_df["Facility"].to_list()
+
+    ##############################
+    # Demand
+    ##############################
+    with stage("pivot_demand"):
+        demand_df_wide = demand_df.pivot(
+            values="Yearly Demand (thousands)",
+            index="Sales Region",
+            on="Computer Chip"
+        )
+
+        # demand[r][c] -> demand in thousands
+        demand = {
+            int(row["Sales Region"]) - 1: {
+                int(chip) - 1: row[chip]
+                for chip in row.keys()
+                if chip != "Sales Region"
+            }
+            for row in demand_df_wide.to_dicts()
+        }
+
+    ##############################
+    # Shipping Cost
+    ##############################
+    # shipping_cost[f][c][r] -> shipping_cost_f_c_r
+    with stage("pivot_shipping_cost"):
+        shipping_cost_df = shipping_cost_df.with_columns(
+            pl.col("Facility")
+              .cast(pl.Categorical)
+              .to_physical()
+              .alias("facility_idx")
+        )
+
+        shipping_cost_df = shipping_cost_df.drop("Facility")
+
+        shipping_wide = shipping_cost_df.pivot(
+            values="Shipping Cost ($ per chip)",
+            index=["facility_idx", "Computer Chip"],
+            on="Sales Region",
+        )
+
+        shipping_cost = {}
+        for row in shipping_wide.to_dicts():
+            f = row.pop("facility_idx")
+            c = int(row.pop("Computer Chip")) - 1
+            reg_map = {
+                int(region) - 1: row[region]
+                for region in row
+            }
+            shipping_cost.setdefault(f, {})[c] = reg_map
+
+    ##############################
+    # Production Cost
+    ##############################
+    # prod_cost[f][c] -> prod_cost
+    with stage("pivot_prod_cost"):
+        prod_cost_df = prod_cost_df.with_columns(
+            pl.col("Facility")
+              .cast(pl.Categorical)
+              .to_physical()
+              .alias("facility_idx")
+        )
+
+        prod_cost_df = prod_cost_df.drop("Facility")
+
+        prod_wide = prod_cost_df.pivot(
+            values="Production Cost ($ per chip)",
+            index="facility_idx",
+            on="Computer Chip",
+        )
+
+        prod_cost = {
+            int(row["facility_idx"]): {
+                int(chip) - 1: row[chip]
+                for chip in row.keys()
+                if chip != "facility_idx"
+            }
+            for row in prod_wide.to_dicts()
+        }
+
+    return SuperChipData(prod_cap, demand, shipping_cost, prod_cost, facility_list)
@@ -0,0 +1,326 @@
+"""
+Long-running solve service.
+
+Keeps the parsed workbook and warm alternative-case models in memory and answers
+scenario requests over HTTP (TCP or a Unix socket), so a planning app pays for
+reading the workbook and building the model once instead of on every request.
+
+    python -m super_chip serve --port 8765 --workers 2
+    curl -s localhost:8765/solve -d '{"demand_scale": 1.1, "extra_capacity": {"Richmond": 60}}'
+
+Request body (every key optional; facilities by name or 1-based index, regions
+and chips 1-based as in the workbook):
+
+    demand_scale          float              multiply every demand
+    region_demand_scale   {region: factor}   multiply the demand of a region
+    chip_demand_scale     {chip: factor}     multiply the demand of a chip type
+    capacity              {facility: units}  replace a facility's capacity
+    extra_capacity        {facility: units}  or a list with one entry per facility
+    prod_cost_factor      float or {facility: factor}
+    shipping_cost_factor  float or {facility: factor}
+    flows                 bool               include non-zero flows (default true)
+
+Response: status, objective (thousands of USD, as ObjVal), objective_usd, solve_ms,
+flows [{facility, chip, region, units}], supply_duals {facility: Pi} and
+demand_duals[r][c].
+
+Each worker owns one warm model and one Gurobi environment that live for the
+whole service. Gurobi environments are not thread-safe, so workers do not share
+one; with the default single worker there is exactly one environment. Requests
+are queued for the next idle worker, which serialises access to each model,
+and solved in a thread so the event loop keeps accepting connections.
+"""
+import asyncio
+import json
+import time
+from collections import deque
+from http import HTTPStatus
+
+import numpy as np
+
+
+# largest request body accepted; scenarios are a few kB of JSON
+MAX_BODY = 1 << 20
+# solve latencies kept for the p50 / p95 printed on shutdown
+LATENCY_WINDOW = 10_000
+
+
+class ScenarioError(ValueError):
+    pass
+
+
+class WarmModel:
+    """
+    The alternative-case model built once, then re-solved for each scenario by
+    overwriting its objective and right-hand sides. Gurobi keeps the previous
+    basis, so every re-solve is a warm start.
+    """
+
+    def __init__(self, data, name="warm_alternative", threads=1):
+        import gurobipy as gp
+        from utils.super_chip_model import super_chip_solve
+
+        self.data = data
+        self.env = gp.Env(empty=True)
+        self.env.setParam("OutputFlag", 0)
+        self.env.setParam("Threads", threads)
+        self.env.start()
+
+        F = data.n_facilities
+        R = len(data.demand)
+        C = len(data.prod_cost[0])
+        self.shape = (F, C, R)
+
+        self.prod_cost = np.array([[data.prod_cost[f][c] for c in range(C)] for f in range(F)])
+        self.shipping_cost = np.array([
+            [[data.shipping_cost[f][c][r] for r in range(R)] for c in range(C)] for f in range(F)
+        ])
+        self.demand = np.array([[data.demand[r][c] for c in range(C)] for r in range(R)])
+        self.capacity = np.array(data.prod_cap, dtype=float)
+
+        self.model = super_chip_solve(
+            data.prod_cap, data.demand, data.costs, name, env=self.env, output_dir=None,
+        )
+        m = self.model
+        # variables were added f -> c -> r, matching the (F, C, R) cost arrays
+        self.vars = m.getVars()
+        self.supply_constrs = [m.getConstrByName(f"supply_f{f+1}") for f in range(F)]
+        self.demand_constrs = [
+            m.getConstrByName(f"demand_r{r+1}_c{c+1}") for r in range(R) for c in range(C)
+        ]
+
+    def _facility(self, key):
+        if isinstance(key, str) and key in self.data.facility_to_idx:
+            return self.data.facility_to_idx[key]
+        try:
+            idx = int(key) - 1
+        except (TypeError, ValueError):
+            raise ScenarioError(f"unknown facility {key!r}")
+        if not 0 <= idx < self.shape[0]:
+            raise ScenarioError(f"facility index {key!r} out of range")
+        return idx
+
+    def _index(self, key, size, what):
+        try:
+            idx = int(key) - 1
+        except (TypeError, ValueError):
+            raise ScenarioError(f"bad {what} {key!r}")
+        if not 0 <= idx < size:
+            raise ScenarioError(f"{what} {key!r} out of range")
+        return idx
+
+    def _per_facility(self, value, default):
+        out = np.full(self.shape[0], default, dtype=float)
+        if value is None:
+            return out
+        if isinstance(value, (int, float)):
+            out[:] = value
+        elif isinstance(value, list):
+            if len(value) != self.shape[0]:
+                raise ScenarioError(f"expected {self.shape[0]} facility values, got {len(value)}")
+            out[:] = value
+        elif isinstance(value, dict):
+            for key, v in value.items():
+                out[self._facility(key)] = v
+        else:
+            raise ScenarioError(f"cannot read facility values from {value!r}")
+        return out
+
+    def apply(self, scenario):
+        F, C, R = self.shape
+        unknown = set(scenario) - {
+            "demand_scale", "region_demand_scale", "chip_demand_scale", "capacity",
+            "extra_capacity", "prod_cost_factor", "shipping_cost_factor", "flows",
+        }
+        if unknown:
+            raise ScenarioError(f"unknown scenario keys: {sorted(unknown)}")
+
+        demand = self.demand * float(scenario.get("demand_scale", 1.0))
+        for key, factor in scenario.get("region_demand_scale", {}).items():
+            demand[self._index(key, R, "region"), :] *= factor
+        for key, factor in scenario.get("chip_demand_scale", {}).items():
+            demand[:, self._index(key, C, "chip")] *= factor
+
+        capacity = self.capacity.copy()
+        for key, value in scenario.get("capacity", {}).items():
+            capacity[self._facility(key)] = value
+        capacity += self._per_facility(scenario.get("extra_capacity"), 0.0)
+
+        prod = self.prod_cost * self._per_facility(scenario.get("prod_cost_factor"), 1.0)[:, None]
+        ship = self.shipping_cost * self._per_facility(scenario.get("shipping_cost_factor"), 1.0)[:, None, None]
+        obj = (prod[:, :, None] + ship).ravel()
+
+        m = self.model
+        m.setAttr("Obj", self.vars, obj.tolist())
+        m.setAttr("RHS", self.supply_constrs, capacity.tolist())
+        m.setAttr("RHS", self.demand_constrs, demand.ravel().tolist())
+
+    def solve(self, scenario):
+        import gurobipy as gp
+
+        start = time.perf_counter()
+        self.apply(scenario)
+        m = self.model
+        m.optimize()
+        result = {
+            "status":   _status_name(m.Status),
+            "solve_ms": (time.perf_counter() - start) * 1000,
+        }
+        if m.Status != gp.GRB.OPTIMAL:
+            return result
+
+        F, C, R = self.shape
+        names = self.data.facility_list
+        result["objective"] = m.ObjVal
+        result["objective_usd"] = m.ObjVal * 1000
+        result["supply_duals"] = {
+            names[f]: pi for f, pi in enumerate(m.getAttr("Pi", self.supply_constrs))
+        }
+        result["demand_duals"] = (
+            np.array(m.getAttr("Pi", self.demand_constrs)).reshape(R, C).tolist()
+        )
+        if scenario.get("flows", True):
+            x = np.array(m.getAttr("X", self.vars)).reshape(F, C, R)
+            result["flows"] = [
+                {"facility": names[f], "chip": int(c) + 1, "region": int(r) + 1, "units": float(x[f, c, r])}
+                for f, c, r in zip(*np.nonzero(x > 1e-9))
+            ]
+        return result
+
+
+def _status_name(status):
+    import gurobipy as gp
+
+    for name in dir(gp.GRB.Status):
+        if not name.startswith("_") and getattr(gp.GRB.Status, name) == status:
+            return name
+    return str(status)
+
+
+class SolveServer:
+    """
+    asyncio HTTP front end over a pool of `WarmModel` workers.
+
+    Routes:
+        GET  /health  -> {"status": "ok", "workers": n}
+        POST /solve   -> solve one scenario (see module docstring)
+    """
+
+    def __init__(self, data, workers=1):
+        self.data = data
+        self.n_workers = workers
+        self.idle = None
+        self.n_solves = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    async def start_workers(self):
+        loop = asyncio.get_running_loop()
+        self.idle = asyncio.Queue()
+        for i in range(self.n_workers):
+            worker = await loop.run_in_executor(None, WarmModel, self.data, f"warm_alternative_{i}")
+            await self.idle.put(worker)
+
+    async def solve(self, scenario):
+        worker = await self.idle.get()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(None, worker.solve, scenario)
+        finally:
+            self.idle.put_nowait(worker)
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode()
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode() + body)
+        await writer.drain()
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode().split()
+                    headers = {}
+                    while True:
+                        line = await reader.readline()
+                        if line in (b"\r\n", b"\n", b""):
+                            break
+                        key, _, value = line.decode().partition(":")
+                        headers[key.strip().lower()] = value.strip()
+                    length = int(headers.get("content-length", 0))
+                    if length < 0:
+                        raise ValueError("negative Content-Length")
+                except ValueError:
+                    # also UnicodeDecodeError and a non-numeric Content-Length
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {"error": "malformed request"}, False)
+                    break
+                if length > MAX_BODY:
+                    await self._respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                        {"error": f"body over {MAX_BODY} bytes"}, False)
+                    break
+                body = await reader.readexactly(length)
+                keep_alive = (
+                    headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                )
+
+                status, payload = await self.route(method, path, body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def route(self, method, path, body):
+        if path == "/health" and method == "GET":
+            return HTTPStatus.OK, {"status": "ok", "workers": self.n_workers}
+        if path != "/solve":
+            return HTTPStatus.NOT_FOUND, {"error": f"no route {path}"}
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "use POST"}
+
+        try:
+            scenario = json.loads(body or b"{}")
+            if not isinstance(scenario, dict):
+                raise ScenarioError("scenario must be a JSON object")
+            start = time.perf_counter()
+            result = await self.solve(scenario)
+            self.latencies.append(time.perf_counter() - start)
+            self.n_solves += 1
+        except (ValueError, TypeError, AttributeError) as e:
+            # ScenarioError, bad JSON and wrongly typed scenario values
+            return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+        except Exception as e:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(e).__name__}: {e}"}
+        return HTTPStatus.OK, result
+
+    async def serve(self, host="127.0.0.1", port=8765, unix_path=None):
+        await self.start_workers()
+        if unix_path:
+            server = await asyncio.start_unix_server(self.handle, path=unix_path)
+            where = unix_path
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+            where = f"http://{host}:{port}"
+        print(f"Super Chip solve service on {where} with {self.n_workers} warm model(s)")
+        async with server:
+            await server.serve_forever()
+
+
+def serve(data, host="127.0.0.1", port=8765, unix_path=None, workers=1):
+    server = SolveServer(data, workers=workers)
+    try:
+        asyncio.run(server.serve(host, port, unix_path))
+    except KeyboardInterrupt:
+        pass
+    if server.latencies:
+        lat = np.array(server.latencies) * 1000
+        print(f"{server.n_solves} solves, last {len(lat)}: p50 {np.percentile(lat, 50):.1f} ms, "
+              f"p95 {np.percentile(lat, 95):.1f} ms")
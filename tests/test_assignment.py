@@ -0,0 +1,64 @@
+import gurobipy as gp
+import numpy as np
+import pytest
+from gurobipy import GRB
+
+from utils.assignment import linear_assignment, linear_assignment_batch
+
+TOL = 1e-6
+
+
+@pytest.fixture
+def env():
+    with gp.Env(params={"OutputFlag": 0}) as e:
+        yield e
+
+
+def _assignment_lp(cost, env, maximize=False):
+    """The assignment LP: every row of the shorter side assigned once, the other side at most once."""
+    n, m = cost.shape
+    model = gp.Model(env=env)
+    model.ModelSense = GRB.MAXIMIZE if maximize else GRB.MINIMIZE
+    x = model.addVars(n, m, obj={(i, j): cost[i, j] for i in range(n) for j in range(m)})
+    for i in range(n):
+        model.addLConstr(x.sum(i, "*"), GRB.EQUAL if n <= m else GRB.LESS_EQUAL, 1.0)
+    for j in range(m):
+        model.addLConstr(x.sum("*", j), GRB.EQUAL if m <= n else GRB.LESS_EQUAL, 1.0)
+    model.optimize()
+    assert model.Status == GRB.OPTIMAL
+    return model.ObjVal
+
+
+@pytest.mark.parametrize("shape,seed", [((8, 8), 0), ((8, 8), 1), ((5, 9), 2), ((9, 5), 3)])
+def test_matches_lp_with_feasible_duals(env, shape, seed):
+    # small integer costs give many ties, the path the tie handling takes
+    cost = np.random.default_rng(seed).integers(0, 6, shape).astype(float)
+    result = linear_assignment(cost)
+    assert result.cost == pytest.approx(_assignment_lp(cost, env))
+    assert len(set(result.row_ind.tolist())) == len(set(result.col_ind.tolist())) == min(shape)
+
+    reduced = cost - result.u[:, None] - result.v[None, :]
+    assert np.all(reduced >= -TOL)
+    assert np.allclose(reduced[result.row_ind, result.col_ind], 0.0)
+    # the side with `<= 1` rows has non-positive duals, and the dual objective closes the gap
+    if shape[0] != shape[1]:
+        assert np.all((result.v if shape[0] < shape[1] else result.u) <= TOL)
+    assert result.u.sum() + result.v.sum() == pytest.approx(result.cost)
+
+
+def test_maximize_and_batch(env):
+    costs = np.random.default_rng(4).uniform(0, 10, (5, 6, 6))
+    totals, assigned = linear_assignment_batch(costs, maximize=True)
+    for k in range(len(costs)):
+        single = linear_assignment(costs[k], maximize=True)
+        assert totals[k] == pytest.approx(single.cost)
+        assert totals[k] == pytest.approx(_assignment_lp(costs[k], env, maximize=True))
+        assert costs[k][np.arange(6), assigned[k]].sum() == pytest.approx(totals[k])
+
+
+def test_infeasible_raises():
+    with pytest.raises(ValueError):
+        linear_assignment([[1.0, np.inf], [2.0, np.inf]])
+    # both rows can only take column 1
+    with pytest.raises(ValueError):
+        linear_assignment([[np.inf, 1.0, np.inf], [np.inf, 2.0, np.inf]])
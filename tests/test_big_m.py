@@ -0,0 +1,65 @@
+import gurobipy as gp
+import numpy as np
+import pytest
+from gurobipy import GRB
+
+from utils.big_m import tighten_big_m
+
+
+def _solve(m):
+    m.optimize()
+    assert m.Status == GRB.OPTIMAL
+    return m.ObjVal
+
+
+def _binding_m(env):
+    # x <= 5 y with x <= 10: the relaxed side x <= 5 still binds at y = 1
+    m = gp.Model(env=env)
+    x = m.addVar(ub=10, name="x")
+    y = m.addVar(vtype=GRB.BINARY, name="y")
+    m.addConstr(x <= 5 * y, name="link")
+    m.setObjective(x - y, GRB.MAXIMIZE)
+    return m
+
+
+def _fixed_charge(env, seed=0, n=6, big_m=1e5):
+    rng = np.random.default_rng(seed)
+    cap = rng.integers(10, 40, n)
+    m = gp.Model(env=env)
+    x = m.addVars(n, vtype=GRB.INTEGER, name="x")
+    y = m.addVars(n, vtype=GRB.BINARY, name="y")
+    m.addConstrs((x[i] <= cap[i] for i in range(n)), name="cap")
+    m.addConstrs((x[i] <= big_m * y[i] for i in range(n)), name="link")
+    m.addConstr(x.sum() >= int(cap.sum() * 0.6), name="demand")
+    m.setObjective(gp.quicksum(rng.uniform(1, 3) * x[i] + rng.uniform(20, 60) * y[i] for i in range(n)))
+    return m, cap
+
+
+@pytest.fixture
+def env():
+    with gp.Env(params={"OutputFlag": 0}) as e:
+        yield e
+
+
+@pytest.mark.parametrize("kwargs", [{"method": "lp"}, {"method": "bounds"}, {"indicator": True}])
+def test_binding_relaxed_side_keeps_optimum(env, kwargs):
+    expected = _solve(_binding_m(env))
+    m = _binding_m(env)
+    tighten_big_m(m, **kwargs)
+    assert _solve(m) == pytest.approx(expected)
+    assert m.getConstrByName("link") is not None
+
+
+@pytest.mark.parametrize("kwargs", [{"method": "lp"}, {"method": "bounds"}, {"indicator": True}])
+def test_fixed_charge_objective_unchanged(env, kwargs):
+    for seed in range(3):
+        expected = _solve(_fixed_charge(env, seed)[0])
+        m, cap = _fixed_charge(env, seed)
+        report = tighten_big_m(m, **kwargs)
+        assert _solve(m) == pytest.approx(expected)
+        if kwargs.get("indicator"):
+            # x <= cap makes every relaxed side redundant, so the big-M rows go
+            assert report.indicators == 6 and m.NumConstrs == 7
+        else:
+            # M = 1e5 comes down to each facility's capacity
+            assert [c.new for c in report.changes] == cap.tolist()
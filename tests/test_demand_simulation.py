@@ -0,0 +1,29 @@
+import numpy as np
+
+from utils.batch_lp import BatchLP
+from utils.demand_simulation import simulate_demand
+from utils.super_chip_model import super_chip_solve
+
+
+def _instance(F=4, C=10, R=10, seed=3):
+    rng = np.random.default_rng(seed)
+    demand = rng.uniform(1, 5, (R, C))
+    supply = [demand.sum() * 0.3] * F
+    costs = [rng.uniform(1, 4, (F, C, R)).tolist(), rng.uniform(5, 10, (F, C)).tolist()]
+    nested = {r: {c: demand[r, c] for c in range(C)} for r in range(R)}
+    return supply, nested, costs
+
+
+def test_in_range_share_and_costs_match_full_resolves():
+    supply, demand, costs = _instance()
+    model = super_chip_solve(supply, demand, costs, "simulation", output_dir=None)
+    result = simulate_demand(model, demand, n_samples=1000, scale=0.01, seed=1, workers=2)
+
+    # at 1% noise most samples keep the base basis and are priced by the duals
+    assert result.in_range.mean() > 0.5
+
+    copy = model.copy()
+    rows = [copy.getConstrByName(f"demand_r{r + 1}_c{c + 1}") for r in range(10) for c in range(10)]
+    full = BatchLP(copy, copy.getVars(), rows).solve(rhs=result.samples.reshape(1000, -1), duals=False)
+    assert np.array_equal(full.optimal, result.feasible)
+    np.testing.assert_allclose(result.costs[result.feasible], full.objective[full.optimal], rtol=1e-9)
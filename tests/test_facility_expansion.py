@@ -0,0 +1,58 @@
+import itertools
+
+import numpy as np
+import pytest
+from gurobipy import GRB
+
+from utils.facility_expansion import ExpansionProblem, expansion_benders, expansion_mip
+from utils.network_flow import InfeasibleError
+
+
+def _problem(seed, F=3, G=2, C=2, R=4, K=2):
+    rng = np.random.default_rng(seed)
+    supply = rng.uniform(8, 12, F).tolist()
+    need = rng.uniform(2, 6, (R, C))
+    demand = {r: {c: float(need[r, c]) for c in range(C)} for r in range(R)}
+    costs = [rng.uniform(1, 5, (F, C, R)).tolist(), rng.uniform(3, 6, (F, C)).tolist()]
+    return ExpansionProblem.from_super_chip(
+        supply, demand, costs, module_capacity=[4.0, 4.0], module_cost=[6.0, 9.0],
+        candidate_cost=rng.uniform(1, 4, (G, C, R)), candidate_capacity=10.0,
+        candidate_open_cost=rng.uniform(20, 80, G),
+    )
+
+
+def _enumerate(problem):
+    """Cheapest siting by trying every open / module combination."""
+    F, K = problem.module_capacity.shape
+    best = np.inf
+    choices = [[(1.0, k) for k in range(K + 1)] + ([] if problem.existing[f] else [(0.0, 0)])
+               for f in range(F)]
+    for plan in itertools.product(*choices):
+        is_open = np.array([o for o, _ in plan])
+        modules = (np.arange(K)[None, :] < np.array([k for _, k in plan])[:, None]).astype(float)
+        try:
+            shipping = problem.transport(problem.capacity(is_open, modules)).cost
+        except InfeasibleError:
+            continue
+        best = min(best, problem.fixed_cost(is_open, modules) + shipping)
+    return best
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_benders_and_mip_match_enumeration(seed):
+    problem = _problem(seed)
+    expected = _enumerate(problem)
+    for result in (expansion_mip(problem, mip_gap=0), expansion_mip(problem, strong_linking=False, mip_gap=0),
+                   expansion_benders(problem, mip_gap=0)):
+        assert result.status == GRB.OPTIMAL
+        assert result.cost == pytest.approx(expected, rel=1e-6)
+        assert np.all(result.x.sum(axis=(1, 2)) <= result.capacity + 1e-6)
+        assert np.allclose(result.x.sum(axis=0), problem.demand.T)
+
+
+def test_not_enough_capacity_is_infeasible():
+    problem = _problem(0)
+    problem.demand *= 10
+    for result in (expansion_mip(problem), expansion_benders(problem)):
+        assert result.status == GRB.INFEASIBLE
+        assert result.cost == np.inf
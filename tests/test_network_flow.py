@@ -0,0 +1,128 @@
+import gurobipy as gp
+import numpy as np
+import pytest
+from gurobipy import GRB
+
+from utils.network_flow import Graph, InfeasibleError, max_flow, min_cost_flow, transportation
+
+TOL = 1e-6
+
+
+@pytest.fixture
+def env():
+    with gp.Env(params={"OutputFlag": 0}) as e:
+        yield e
+
+
+def _random_graph(n, m, seed):
+    rng = np.random.default_rng(seed)
+    # a path 0 -> 1 -> ... -> n-1 keeps every node connected
+    tail = np.concatenate([np.arange(n - 1), rng.integers(0, n, m)])
+    head = np.concatenate([np.arange(1, n), rng.integers(0, n, m)])
+    keep = tail != head
+    tail, head = tail[keep], head[keep]
+    capacity = rng.integers(1, 20, len(tail)).astype(float)
+    cost = rng.integers(0, 10, len(tail)).astype(float)
+    return Graph(n, tail, head, capacity, cost)
+
+
+def _flow_lp(graph, env, supply=None, source=None, sink=None):
+    """Gurobi LP over the arcs of `graph`: min cost flow, or max source-sink flow."""
+    tail, head = graph.arcs()
+    cap = graph.to_input_order(graph.capacity).tolist()
+    cost = graph.to_input_order(graph.cost).tolist()
+    m = gp.Model(env=env)
+    x = m.addVars(graph.n_arcs, ub=cap, obj=cost if supply is not None else 0.0)
+    v = m.addVar() if supply is None else None
+    for i in range(graph.n):
+        flow = (gp.quicksum(x[a] for a in np.flatnonzero(tail == i))
+                - gp.quicksum(x[a] for a in np.flatnonzero(head == i)))
+        if supply is not None:
+            m.addConstr(flow == supply[i])
+        elif i in (source, sink):
+            m.addConstr(flow == (v if i == source else -v))
+        else:
+            m.addConstr(flow == 0)
+    if supply is None:
+        m.setObjective(v, GRB.MAXIMIZE)
+    m.optimize()
+    assert m.Status == GRB.OPTIMAL
+    return m
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_max_flow_matches_lp_and_cut(env, seed):
+    graph = _random_graph(12, 40, seed)
+    result = max_flow(graph, 0, 11)
+    lp = _flow_lp(graph, env, source=0, sink=11)
+    assert result.value == pytest.approx(lp.ObjVal)
+
+    # the cut is a dual optimum: its capacity equals the flow value
+    cap = graph.to_input_order(graph.capacity)
+    assert cap @ result.capacity_duals == pytest.approx(result.value)
+    assert np.all(result.flow <= cap + TOL) and np.all(result.flow >= -TOL)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_min_cost_flow_matches_lp_and_duals(env, seed):
+    graph = _random_graph(10, 30, seed)
+    rng = np.random.default_rng(seed)
+    supply = np.zeros(graph.n)
+    supply[0], supply[-1] = 5.0, -5.0
+    supply[rng.integers(1, 9)] += 3.0
+    supply[-1] -= 3.0
+    result = min_cost_flow(graph, supply)
+    lp = _flow_lp(graph, env, supply=supply)
+    assert result.cost == pytest.approx(lp.ObjVal)
+
+    # complementary slackness of the potentials, per the MinCostFlowResult docstring
+    tail, head = graph.arcs()
+    cap = graph.to_input_order(graph.capacity)
+    reduced = graph.to_input_order(graph.cost) - result.potentials[tail] + result.potentials[head]
+    assert np.all(reduced[result.flow < cap - TOL] >= -TOL)
+    assert np.all(reduced[result.flow > TOL] <= TOL)
+
+
+def _transportation_lp(cost, supply, demand, env, exact_supply):
+    F, S = cost.shape
+    m = gp.Model(env=env)
+    x = m.addVars(F, S, obj={(f, s): cost[f, s] for f in range(F) for s in range(S)})
+    sense = GRB.EQUAL if exact_supply else GRB.LESS_EQUAL
+    for f in range(F):
+        m.addLConstr(x.sum(f, "*"), sense, supply[f])
+    for s in range(S):
+        m.addLConstr(x.sum("*", s), GRB.GREATER_EQUAL, demand[s])
+    m.optimize()
+    return m
+
+
+@pytest.mark.parametrize("seed,exact_supply", [(0, False), (1, False), (2, True)])
+def test_transportation_matches_lp_and_duals(env, seed, exact_supply):
+    rng = np.random.default_rng(seed)
+    F, S = 4, 15
+    cost = rng.uniform(1, 10, (F, S))
+    demand = rng.integers(1, 10, S).astype(float)
+    supply = rng.uniform(0.3, 0.5, F) * demand.sum()
+    if exact_supply:
+        supply *= demand.sum() / supply.sum()
+    result = transportation(cost, supply, demand, exact_supply=exact_supply)
+    lp = _transportation_lp(cost, supply, demand, env, exact_supply)
+    assert result.cost == pytest.approx(lp.ObjVal)
+    assert np.allclose(result.x.sum(axis=0), demand)
+
+    # the duals are feasible and close the gap with the LP optimum
+    u, v = result.supply_duals, result.demand_duals
+    assert np.all(cost - u[:, None] - v[None, :] >= -TOL)
+    assert np.all(v >= -TOL)
+    if not exact_supply:
+        assert np.all(u <= TOL)
+    assert supply @ u + demand @ v == pytest.approx(lp.ObjVal)
+
+
+def test_infeasible_raises():
+    with pytest.raises(InfeasibleError):
+        transportation(np.ones((2, 3)), [1.0, 1.0], [1.0, 1.0, 1.0])
+    # node 2 has demand but no arc reaches it
+    graph = Graph(3, [0], [1], [5.0], [1.0])
+    with pytest.raises(InfeasibleError):
+        min_cost_flow(graph, [2.0, 0.0, -2.0])
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+from gurobipy import GRB
+
+from utils.stochastic import StochasticProblem, stochastic_extensive, stochastic_lshaped
+
+
+def _problem(F=3, C=2, R=3, seed=0):
+    rng = np.random.default_rng(seed)
+    demand = {r: {c: float(rng.uniform(5, 15)) for c in range(C)} for r in range(R)}
+    costs = [rng.uniform(1, 4, (F, C, R)).tolist(), rng.uniform(5, 10, (F, C)).tolist()]
+    return StochasticProblem.from_super_chip([40] * F, demand, costs, n_scenarios=20, seed=1)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_lshaped_matches_extensive(workers):
+    problem = _problem()
+    extensive = stochastic_extensive(problem)
+    lshaped = stochastic_lshaped(problem, workers=workers)
+    assert lshaped.optimal
+    assert lshaped.expected_cost == pytest.approx(extensive.expected_cost, rel=1e-6)
+
+
+def test_lshaped_iteration_limit_is_not_optimal():
+    problem = _problem()
+    result = stochastic_lshaped(problem, max_iter=2)
+    assert result.status == GRB.ITERATION_LIMIT
+    assert not result.optimal
+    assert result.bound < stochastic_extensive(problem).expected_cost < result.expected_cost
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from utils.tsp_solver import SymmetricTSPSolver, TSPSolver, tsp_solve
+
+
+def _points(n, seed=0):
+    xy = np.random.default_rng(seed).uniform(0, 100, (n, 2))
+    return np.linalg.norm(xy[:, None] - xy[None, :], axis=2)
+
+
+@pytest.mark.parametrize("solver_cls", [TSPSolver, SymmetricTSPSolver])
+def test_repeated_solve_reports_its_own_cuts(solver_cls):
+    solver = solver_cls(_points(12), warm_start=False)
+    first = solver.solve()
+    second = solver.solve()
+    assert first.cuts_added > 0
+    assert second.cuts_added == first.cuts_added
+    assert second.length == pytest.approx(first.length)
+    assert sorted(second.tour) == list(range(12))
+
+
+@pytest.mark.parametrize("n", [1, 2])
+def test_tiny_instances(n):
+    result = tsp_solve(_points(n))
+    assert result.tour == list(range(n))
+    assert result.length == pytest.approx(_points(n).sum())
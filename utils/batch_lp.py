@@ -0,0 +1,199 @@
+import time
+
+import numpy as np
+from gurobipy import GRB, LinExpr, Model
+
+SENSES = {"<": GRB.LESS_EQUAL, "<=": GRB.LESS_EQUAL, ">": GRB.GREATER_EQUAL, ">=": GRB.GREATER_EQUAL,
+          "=": GRB.EQUAL, "==": GRB.EQUAL}
+
+
+def add_rows(m, columns, indices, data, sense, rhs, name):
+    """
+    Add one constraint per row of the (rows, k) `indices` / `data` arrays,
+    skipping zero entries: row i is sum_j data[i, j] * columns[indices[i, j]]
+    (sense) rhs[i]. Builds a sparse model from coefficient arrays without
+    scipy (which `addMConstr` needs).
+
+    Returns:
+        List[gurobipy.Constr]
+    """
+    keep = data != 0
+    counts = keep.sum(axis=1).tolist()
+    flat_idx = indices[keep].tolist()
+    flat_val = data[keep].tolist()
+    rows, pos = [], 0
+    for i, k in enumerate(counts):
+        rows.append(m.addLConstr(LinExpr(flat_val[pos:pos + k], [columns[j] for j in flat_idx[pos:pos + k]]),
+                                 sense, float(rhs[i]), name=f"{name}[{i}]"))
+        pos += k
+    return rows
+
+
+class BatchLPResult:
+    """
+    Solutions of K LPs, stacked along the first axis like the batch data.
+
+    Attributes:
+        objective (np.ndarray): (K,) ObjVal, NaN where not optimal.
+        x (np.ndarray): (K, n) variable values.
+        duals (np.ndarray): (K, m) Pi of the rows.
+        reduced_costs (np.ndarray): (K, n) RC of the variables.
+        status (np.ndarray): (K,) Gurobi status codes.
+        iterations (np.ndarray): (K,) simplex iterations per solve.
+    """
+
+    def __init__(self, objective, x, duals, reduced_costs, status, iterations, runtime):
+        self.objective = objective
+        self.x = x
+        self.duals = duals
+        self.reduced_costs = reduced_costs
+        self.status = status
+        self.iterations = iterations
+        self.runtime = runtime
+
+    @property
+    def optimal(self):
+        return self.status == GRB.OPTIMAL
+
+    def __repr__(self):
+        K = len(self.status)
+        rate = K / self.runtime * 60 if self.runtime > 0 else float("inf")
+        return (f"BatchLPResult(solves={K}, optimal={int(self.optimal.sum())}, "
+                f"runtime={self.runtime:.3f}s, rate={rate:,.0f}/min)")
+
+
+class BatchLP:
+    """
+    Many LPs with one structure: the template model is built once and each
+    instance only rewrites the objective, right-hand sides and bounds, then
+    re-optimises in place. Gurobi restarts the simplex from the previous
+    optimal basis, and the Python overhead is a few bulk setAttr / getAttr
+    calls per solve.
+
+    Build it from an existing model (e.g. `ncaa_solver`'s before optimize), or
+    with `from_arrays` / `transportation`.
+
+    Args:
+        model (gurobipy.Model): LP template; it is re-optimised in place.
+        variables (List[gurobipy.Var], optional): Columns of the batch arrays.
+            Defaults to `model.getVars()`.
+        constrs (List[gurobipy.Constr], optional): Rows of the batch arrays.
+            Defaults to `model.getConstrs()`.
+    """
+
+    def __init__(self, model, variables=None, constrs=None):
+        model.update()
+        if model.IsMIP:
+            raise ValueError("BatchLP needs an LP template")
+        self.model = model
+        self.variables = model.getVars() if variables is None else list(variables)
+        self.constrs = model.getConstrs() if constrs is None else list(constrs)
+        # tiny LPs: presolve and parallelism cost more than they save
+        model.Params.OutputFlag = 0
+        model.Params.Threads = 1
+        model.Params.Presolve = 0
+
+    @classmethod
+    def from_arrays(cls, A, sense, rhs=0.0, obj=0.0, lb=0.0, ub=np.inf, maximize=False, env=None,
+                    name="batch_lp"):
+        """
+        Template `min / max obj . x  s.t.  A x (sense) rhs,  lb <= x <= ub` from a
+        dense (m, n) matrix. `sense` is one of "<=", ">=", "==" or an (m,) list of them.
+        """
+        A = np.atleast_2d(np.asarray(A, dtype=float))
+        m_rows, n = A.shape
+        senses = [SENSES[s] for s in (np.broadcast_to(np.asarray(sense), (m_rows,)).tolist())]
+        model = Model(name, env=env)
+        model.ModelSense = GRB.MAXIMIZE if maximize else GRB.MINIMIZE
+        x = model.addVars(n, lb=np.broadcast_to(lb, (n,)).tolist(), ub=np.broadcast_to(ub, (n,)).tolist(),
+                          obj=np.broadcast_to(obj, (n,)).tolist(), name="x")
+        xs = [x[j] for j in range(n)]
+        rhs = np.broadcast_to(np.asarray(rhs, dtype=float), (m_rows,))
+        for i in range(m_rows):
+            cols = np.flatnonzero(A[i]).tolist()
+            model.addLConstr(LinExpr(A[i, cols].tolist(), [xs[j] for j in cols]), senses[i],
+                             float(rhs[i]), name=f"r[{i}]")
+        return cls(model, xs)
+
+    @classmethod
+    def transportation(cls, n_sources, n_sinks, exact=True, env=None):
+        """
+        Template of the transportation LP in practice_code/hw4_test.py: columns
+        x[s, d] in row-major order, rows Supply_s then Demand_d (equalities, or
+        supply <= / demand >= when `exact` is False). Batch data: obj (K, S * D)
+        costs and rhs (K, S + D) as concatenated supply and demand.
+        """
+        S, D = n_sources, n_sinks
+        A = np.zeros((S + D, S * D))
+        for s in range(S):
+            A[s, s * D:(s + 1) * D] = 1.0
+        for d in range(D):
+            A[S + d, d::D] = 1.0
+        sense = ["=="] * (S + D) if exact else ["<="] * S + [">="] * D
+        batch = cls.from_arrays(A, sense, env=env, name="transportation")
+        batch.model.setAttr("VarName", batch.variables, [f"x[{s},{d}]" for s in range(S) for d in range(D)])
+        batch.model.setAttr("ConstrName", batch.constrs,
+                            [f"Supply[{s}]" for s in range(S)] + [f"Demand[{d}]" for d in range(D)])
+        batch.model.update()
+        return batch
+
+    def solve(self, obj=None, rhs=None, lb=None, ub=None, duals=True):
+        """
+        Solve one LP per row of the stacked data.
+
+        Args:
+            obj (array-like, optional): (K, n) objective coefficients, or (n,) for all.
+            rhs (array-like, optional): (K, m) right-hand sides, or (m,).
+            lb, ub (array-like, optional): (K, n) variable bounds, or (n,).
+            duals (bool, optional): Also collect Pi and RC. Defaults to True.
+
+        Returns:
+            BatchLPResult
+        """
+        start = time.perf_counter()
+        n, m_rows = len(self.variables), len(self.constrs)
+        data = {}
+        K = None
+        for attr, values, size, items in (("Obj", obj, n, self.variables), ("RHS", rhs, m_rows, self.constrs),
+                                          ("LB", lb, n, self.variables), ("UB", ub, n, self.variables)):
+            if values is None:
+                continue
+            values = np.asarray(values, dtype=float)
+            if values.ndim == 1:
+                # the same for every instance: set once
+                self.model.setAttr(attr, items, values.tolist())
+                continue
+            if values.shape[1] != size:
+                raise ValueError(f"{attr} data must have {size} columns, got {values.shape[1]}")
+            if K is not None and len(values) != K:
+                raise ValueError("batch arrays must share the leading dimension")
+            K = len(values)
+            data[attr] = (items, values.tolist())
+        K = 1 if K is None else K
+
+        objective = np.full(K, np.nan)
+        x = np.full((K, n), np.nan)
+        pi = np.full((K, m_rows), np.nan) if duals else None
+        rc = np.full((K, n), np.nan) if duals else None
+        status = np.zeros(K, dtype=np.int64)
+        iterations = np.zeros(K, dtype=np.int64)
+        model, variables, constrs = self.model, self.variables, self.constrs
+        for k in range(K):
+            for attr, (items, values) in data.items():
+                model.setAttr(attr, items, values[k])
+            model.optimize()
+            status[k] = model.Status
+            iterations[k] = model.IterCount
+            if status[k] != GRB.OPTIMAL:
+                continue
+            objective[k] = model.ObjVal
+            x[k] = model.getAttr("X", variables)
+            if duals:
+                pi[k] = model.getAttr("Pi", constrs)
+                rc[k] = model.getAttr("RC", variables)
+        return BatchLPResult(objective, x, pi, rc, status, iterations, time.perf_counter() - start)
+
+
+def batch_solve(model, obj=None, rhs=None, lb=None, ub=None, duals=True):
+    """Solve `model` once per row of the stacked data; see `BatchLP.solve`."""
+    return BatchLP(model).solve(obj=obj, rhs=rhs, lb=lb, ub=ub, duals=duals)
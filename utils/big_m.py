@@ -0,0 +1,267 @@
+import math
+
+import numpy as np
+from gurobipy import GRB, LinExpr
+
+
+class BigMChange:
+    def __init__(self, constr, binary, old, new, bound):
+        self.constr = constr
+        self.binary = binary
+        self.old = old
+        self.new = new
+        self.bound = bound
+
+    def __repr__(self):
+        return f"BigMChange({self.constr}: {self.binary} M {self.old:g} -> {self.new:g})"
+
+
+class BigMReport:
+    """What `tighten_big_m` changed: one `BigMChange` per linking row it tightened."""
+
+    def __init__(self, changes, skipped, indicators):
+        self.changes = changes
+        self.skipped = skipped
+        self.indicators = indicators
+
+    def to_df(self):
+        import polars as pl
+
+        return pl.DataFrame({
+            "constraint": [c.constr for c in self.changes],
+            "binary":     [c.binary for c in self.changes],
+            "old_m":      [c.old for c in self.changes],
+            "new_m":      [c.new for c in self.changes],
+            "bound":      [c.bound for c in self.changes],
+        })
+
+    def __repr__(self):
+        return (f"BigMReport(tightened={len(self.changes)}, skipped={len(self.skipped)}, "
+                f"indicators={self.indicators})")
+
+
+class _LinkingRow:
+    """
+    A row with exactly one binary y, normalised to `a . x + g * y <= b`.
+
+    For g < 0 the row binds at y = 0 and is relaxed by y = 1 (x <= M * y); for
+    g > 0 it binds at y = 1 and is relaxed by y = 0 (x <= M * (1 - y)). M is |g|.
+    """
+
+    def __init__(self, constr, sign, x_idx, a, y_idx, g, b, integral):
+        self.constr = constr
+        self.sign = sign            # -1 for ">=" rows, which were negated
+        self.x_idx = x_idx
+        self.a = a
+        self.y_idx = y_idx
+        self.g = g
+        self.b = b
+        self.integral = integral
+
+    @property
+    def relaxing_value(self):
+        return 1.0 if self.g < 0 else 0.0
+
+    @property
+    def relaxed_rhs(self):
+        """Right-hand side of a . x when y is at its relaxing value."""
+        return self.b - self.g if self.g < 0 else self.b
+
+    @property
+    def active_rhs(self):
+        """Right-hand side of a . x when y switches the row on."""
+        return self.b if self.g < 0 else self.b - self.g
+
+    def redundant(self, bound):
+        """Whether the relaxed row can never bind, given `bound` >= a . x whenever y is relaxing."""
+        if self.integral:
+            bound = math.floor(bound + 1e-6)
+        return bound <= self.relaxed_rhs + 1e-9
+
+    def tightened(self, bound):
+        """(g, b) with the smallest valid M, given `bound` >= a . x whenever y is relaxing."""
+        if self.integral:
+            bound = math.floor(bound + 1e-6)
+        if self.g < 0:
+            return -max(0.0, bound - self.b), self.b
+        active = self.b - self.g
+        b = max(bound, active)
+        return b - active, b
+
+
+def linking_rows(model, min_m=0.0):
+    """
+    Rows of `model` that switch on a single binary, e.g. `x[i] <= M * y[i]` in
+    practice_code/fixedCharge.py or `MINREQ[i] - x[i] <= M[i] * y[i]` in
+    practice_code/EitherOr.py. Equality rows and rows with |M| < `min_m` are left out.
+
+    Returns:
+        List[_LinkingRow]
+    """
+    model.update()
+    variables = model.getVars()
+    vtype = model.getAttr("VType", variables)
+    lb = model.getAttr("LB", variables)
+    ub = model.getAttr("UB", variables)
+    binary = [t == GRB.BINARY or (t == GRB.INTEGER and lo >= 0 and hi <= 1)
+              for t, lo, hi in zip(vtype, lb, ub)]
+    integral = [t != GRB.CONTINUOUS for t in vtype]
+    rows = []
+    for c in model.getConstrs():
+        if c.Sense == GRB.EQUAL:
+            continue
+        expr = model.getRow(c)
+        idx = [expr.getVar(k).index for k in range(expr.size())]
+        coef = [expr.getCoeff(k) for k in range(expr.size())]
+        bins = [k for k, j in enumerate(idx) if binary[j]]
+        if len(bins) != 1 or len(idx) == 1:
+            continue
+        k = bins[0]
+        if abs(coef[k]) < min_m:
+            continue
+        sign = 1.0 if c.Sense == GRB.LESS_EQUAL else -1.0
+        x_idx = np.array([j for n, j in enumerate(idx) if n != k], dtype=np.int64)
+        a = sign * np.array([v for n, v in enumerate(coef) if n != k])
+        whole = all(integral[j] for j in x_idx) and np.all(a == np.round(a))
+        rows.append(_LinkingRow(c, sign, x_idx, a, idx[k], sign * coef[k], sign * c.RHS, bool(whole)))
+    return rows
+
+
+def propagate_bounds(model, rounds=20, skip=()):
+    """
+    Variable bounds implied by the rows of `model`, by repeated activity-based
+    propagation: in a . x <= b, a[j] * x[j] <= b - (smallest activity of the other terms).
+    Rows whose index is in `skip` are left out.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: lower and upper bound per variable (in `getVars` order).
+    """
+    model.update()
+    variables = model.getVars()
+    lb = np.array(model.getAttr("LB", variables), dtype=float)
+    ub = np.array(model.getAttr("UB", variables), dtype=float)
+    integral = np.array([t != GRB.CONTINUOUS for t in model.getAttr("VType", variables)])
+    skip = set(skip)
+    rows = []
+    for c in model.getConstrs():
+        if c.index in skip:
+            continue
+        expr = model.getRow(c)
+        idx = np.array([expr.getVar(k).index for k in range(expr.size())], dtype=np.int64)
+        coef = np.array([expr.getCoeff(k) for k in range(expr.size())])
+        if c.Sense in (GRB.LESS_EQUAL, GRB.EQUAL):
+            rows.append((idx, coef, c.RHS))
+        if c.Sense in (GRB.GREATER_EQUAL, GRB.EQUAL):
+            rows.append((idx, -coef, -c.RHS))
+
+    for _ in range(rounds):
+        changed = False
+        for idx, a, b in rows:
+            low = np.where(a > 0, a * lb[idx], a * ub[idx])     # smallest activity of each term
+            n_inf = np.isinf(low).sum()
+            if n_inf > 1:
+                continue
+            total = low[np.isfinite(low)].sum()
+            for n, j in enumerate(idx.tolist()):
+                if np.isinf(low[n]):
+                    rest = total
+                elif n_inf:
+                    continue
+                else:
+                    rest = total - low[n]
+                limit = (b - rest) / a[n]
+                if a[n] > 0 and limit < ub[j] - 1e-9:
+                    ub[j] = math.floor(limit + 1e-9) if integral[j] else limit
+                    changed = True
+                elif a[n] < 0 and limit > lb[j] + 1e-9:
+                    lb[j] = math.ceil(limit - 1e-9) if integral[j] else limit
+                    changed = True
+        if not changed:
+            break
+    return lb, ub
+
+
+def _lp_bounds(model, rows):
+    """max a . x over the LP relaxation, with the row itself dropped and y at its relaxing value."""
+    relaxed = model.relax()
+    relaxed.Params.OutputFlag = 0
+    r_vars = relaxed.getVars()
+    r_constrs = relaxed.getConstrs()
+    bounds = []
+    for row in rows:
+        rc = r_constrs[row.constr.index]
+        y = r_vars[row.y_idx]
+        saved = (rc.RHS, y.LB, y.UB)
+        rc.RHS = GRB.INFINITY if rc.Sense == GRB.LESS_EQUAL else -GRB.INFINITY
+        y.LB = y.UB = row.relaxing_value
+        relaxed.setObjective(LinExpr(row.a.tolist(), [r_vars[j] for j in row.x_idx.tolist()]),
+                             GRB.MAXIMIZE)
+        relaxed.optimize()
+        bounds.append(relaxed.ObjVal if relaxed.Status == GRB.OPTIMAL else np.inf)
+        rc.RHS, y.LB, y.UB = saved
+    return bounds
+
+
+def tighten_big_m(model, method="lp", indicator=False, min_m=0.0):
+    """
+    Replace the big-M of every linking row of `model` by the smallest valid one.
+
+    For a row x <= M * y the tightest M is the largest value x can take in the
+    rest of the model. "bounds" takes it from `propagate_bounds`. "lp" also
+    solves one LP per row over the LP relaxation without that row, with y fixed
+    at the value that switches the row off, and keeps the smaller of the two.
+    M = 9999999 in practice_code/fixedCharge.py becomes 40 for
+    x[0] <= M * y[0], for example. A row is never loosened.
+
+    With `indicator`, each linking row also gets the Gurobi indicator
+    constraint y = value -> a . x <= b, which has no M at all. The big-M row
+    is only removed where the bound shows its relaxed side can never bind;
+    elsewhere it stays, tightened, next to the indicator. The bound then
+    leaves the linking rows out of the propagation, since a row cannot prove
+    itself redundant.
+
+    Args:
+        model (gurobipy.Model): Modified in place.
+        method (str, optional): "lp" or "bounds". Defaults to "lp".
+        indicator (bool, optional): Emit indicator constraints. Defaults to False.
+        min_m (float, optional): Only touch rows whose |M| is at least this.
+
+    Returns:
+        BigMReport
+    """
+    if method not in ("lp", "bounds"):
+        raise ValueError(f"unknown method {method!r}, expected 'lp' or 'bounds'")
+    rows = linking_rows(model, min_m)
+    variables = model.getVars()
+
+    lb, ub = propagate_bounds(model, skip=[row.constr.index for row in rows] if indicator else ())
+    bounds = []
+    for row in rows:
+        hi = np.where(row.a > 0, ub[row.x_idx], lb[row.x_idx])
+        bounds.append(float(np.dot(row.a, hi)) if np.all(np.isfinite(hi)) else np.inf)
+    if method == "lp" and rows:
+        bounds = np.minimum(bounds, _lp_bounds(model, rows)).tolist()
+
+    changes, skipped = [], []
+    indicators = 0
+    for row, bound in zip(rows, bounds):
+        c = row.constr
+        if indicator:
+            lhs = LinExpr((row.sign * row.a).tolist(), [variables[j] for j in row.x_idx.tolist()])
+            model.addGenConstrIndicator(variables[row.y_idx], 1 - int(row.relaxing_value), lhs, c.Sense,
+                                        row.sign * row.active_rhs, name=f"{c.ConstrName}_ind")
+            indicators += 1
+            if row.redundant(bound):
+                model.remove(c)
+                continue
+        if not np.isfinite(bound):
+            skipped.append(c.ConstrName)
+            continue
+        g, b = row.tightened(bound)
+        if abs(g) >= abs(row.g) - 1e-9:
+            continue
+        model.chgCoeff(c, variables[row.y_idx], row.sign * g)
+        c.RHS = row.sign * b
+        changes.append(BigMChange(c.ConstrName, variables[row.y_idx].VarName, abs(row.g), abs(g), bound))
+    model.update()
+    return BigMReport(changes, skipped, indicators)
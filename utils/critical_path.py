@@ -0,0 +1,241 @@
+from collections import deque
+
+import numpy as np
+
+
+class CPMResult:
+    """
+    Schedule of one project network.
+
+    Event times are indexed like `ProjectNetwork.events`, and activity values
+    like `ProjectNetwork.names`. Critical activities (zero total float) are the
+    ones with a non-zero `c[a].Pi` in the LP of practice_code/CPM_example.py.
+    """
+
+    def __init__(self, network, earliest, latest, durations, tol=1e-9):
+        self.network = network
+        self.earliest = earliest
+        self.latest = latest
+        self.durations = durations
+        t, h = network.tail, network.head
+        self.es = earliest[t]
+        self.ef = self.es + durations
+        self.lf = latest[h]
+        self.ls = self.lf - durations
+        self.total_float = self.ls - self.es
+        self.free_float = earliest[h] - self.ef
+        self.critical = self.total_float <= tol
+        self.length = float(earliest.max()) if len(earliest) else 0.0
+        self.tol = tol
+
+    @property
+    def critical_path(self):
+        """One longest path, as activity names from a start event to the end."""
+        net = self.network
+        path = []
+        event = int(np.argmax(self.earliest))
+        while True:
+            incoming = [a for a in net.incoming[event] if abs(self.ef[a] - self.earliest[event]) <= self.tol]
+            if not incoming:
+                break
+            a = incoming[0]
+            path.append(net.names[a])
+            event = net.tail[a]
+        return path[::-1]
+
+    def to_df(self):
+        """One row per activity with ES/EF/LS/LF, total and free float."""
+        import polars as pl
+
+        net = self.network
+        return pl.DataFrame({
+            "activity":    net.names,
+            "from_event":  [net.events[i] for i in net.tail],
+            "to_event":    [net.events[i] for i in net.head],
+            "duration":    self.durations,
+            "es":          self.es,
+            "ef":          self.ef,
+            "ls":          self.ls,
+            "lf":          self.lf,
+            "total_float": self.total_float,
+            "free_float":  self.free_float,
+            "critical":    self.critical,
+        })
+
+    def __repr__(self):
+        return f"CPMResult(length={self.length:g}, critical_path={self.critical_path})"
+
+
+class PERTResult:
+    """
+    Batch of schedules for sampled durations.
+
+    Attributes:
+        length (np.ndarray): (S,) project length per sample.
+        criticality (np.ndarray): (E,) share of samples in which each activity is critical.
+        total_float (np.ndarray): (S, E) total float per sample and activity.
+    """
+
+    def __init__(self, names, length, total_float, tol=1e-9):
+        self.names = names
+        self.length = length
+        self.total_float = total_float
+        self.criticality = (total_float <= tol).mean(axis=0)
+
+    def percentile(self, q):
+        return np.percentile(self.length, q)
+
+    def __repr__(self):
+        return (f"PERTResult(samples={len(self.length)}, mean={self.length.mean():.4g}, "
+                f"p50={self.percentile(50):.4g}, p95={self.percentile(95):.4g})")
+
+
+class ProjectNetwork:
+    """
+    Activity-on-arc project network, scheduled by a forward and a backward pass
+    over a topological order of the events, O(V + E), instead of an LP over the
+    event times.
+
+    Args:
+        activities (Mapping[str, Tuple] or Iterable[Tuple]):
+            name -> (from_event, to_event, duration), or (name, from_event,
+            to_event, duration) tuples. Events can be any hashable labels; dummy
+            activities have duration 0. For practice_code/CPM_example.py:
+            {"A": (1, 3, 6), "B": (1, 2, 9), "dummy": (2, 3, 0), ...}.
+
+    Raises:
+        ValueError: If the activities contain a cycle.
+    """
+
+    def __init__(self, activities):
+        items = (
+            [(name, *spec) for name, spec in activities.items()]
+            if hasattr(activities, "items") else [tuple(a) for a in activities]
+        )
+        self.names = [a[0] for a in items]
+        self.events = []
+        index = {}
+        for _, u, v, _ in items:
+            for e in (u, v):
+                if e not in index:
+                    index[e] = len(self.events)
+                    self.events.append(e)
+        self.event_index = index
+        self.tail = np.array([index[a[1]] for a in items], dtype=np.int64)
+        self.head = np.array([index[a[2]] for a in items], dtype=np.int64)
+        self.durations = np.array([a[3] for a in items], dtype=float)
+
+        n = len(self.events)
+        self.outgoing = [[] for _ in range(n)]
+        self.incoming = [[] for _ in range(n)]
+        for a, (u, v) in enumerate(zip(self.tail.tolist(), self.head.tolist())):
+            self.outgoing[u].append(a)
+            self.incoming[v].append(a)
+        self.order = self._topological_order()
+        # activities sorted by the position of their tail: relaxing them in this
+        # order is a valid forward pass, and in reverse a valid backward pass
+        position = np.empty(n, dtype=np.int64)
+        position[self.order] = np.arange(n)
+        self.arc_order = np.argsort(position[self.tail], kind="stable")
+
+    def _topological_order(self):
+        indegree = [len(arcs) for arcs in self.incoming]
+        queue = deque(e for e, d in enumerate(indegree) if d == 0)
+        order = []
+        while queue:
+            u = queue.popleft()
+            order.append(u)
+            for a in self.outgoing[u]:
+                v = self.head[a]
+                indegree[v] -= 1
+                if indegree[v] == 0:
+                    queue.append(v)
+        if len(order) != len(self.events):
+            raise ValueError("the project network has a cycle")
+        return np.array(order, dtype=np.int64)
+
+    def schedule(self, durations=None, tol=1e-9):
+        """
+        Earliest / latest event times and activity floats for one set of durations.
+
+        Args:
+            durations (array-like, optional): Per activity, in `names` order.
+                Defaults to the durations the network was built with.
+
+        Returns:
+            CPMResult
+        """
+        d = self.durations if durations is None else np.asarray(durations, dtype=float)
+        tail = self.tail.tolist()
+        head = self.head.tolist()
+        dl = d.tolist()
+        arcs = self.arc_order.tolist()
+
+        earliest = [0.0] * len(self.events)
+        for a in arcs:
+            t = earliest[tail[a]] + dl[a]
+            if t > earliest[head[a]]:
+                earliest[head[a]] = t
+        end = max(earliest, default=0.0)
+        latest = [end] * len(self.events)
+        for a in reversed(arcs):
+            t = latest[head[a]] - dl[a]
+            if t < latest[tail[a]]:
+                latest[tail[a]] = t
+        return CPMResult(self, np.array(earliest), np.array(latest), d, tol)
+
+    def simulate(self, durations, tol=1e-9):
+        """
+        Schedule many sampled duration vectors at once (Monte-Carlo PERT).
+
+        The passes walk the activities once, each step updating all samples with
+        one vectorised maximum (forward) or minimum (backward).
+
+        Args:
+            durations (array-like): (S, E) durations, one row per sample, e.g.
+                from `sample_pert`.
+
+        Returns:
+            PERTResult
+        """
+        d = np.atleast_2d(np.asarray(durations, dtype=float))
+        S = d.shape[0]
+        n = len(self.events)
+        earliest = np.zeros((n, S))
+        for a in self.arc_order.tolist():
+            np.maximum(earliest[self.head[a]], earliest[self.tail[a]] + d[:, a],
+                       out=earliest[self.head[a]])
+        length = earliest.max(axis=0)
+        latest = np.tile(length, (n, 1))
+        for a in self.arc_order[::-1].tolist():
+            np.minimum(latest[self.tail[a]], latest[self.head[a]] - d[:, a],
+                       out=latest[self.tail[a]])
+        total_float = (latest[self.head] - earliest[self.tail]).T - d
+        return PERTResult(self.names, length, total_float, tol)
+
+
+def sample_pert(optimistic, most_likely, pessimistic, n_samples, seed=None):
+    """
+    Beta-PERT duration samples, shape (n_samples, E).
+
+    Each activity follows a + (b - a) * Beta(1 + 4 (m - a) / (b - a),
+    1 + 4 (b - m) / (b - a)), with mean (a + 4m + b) / 6. Activities with
+    a == b are fixed.
+    """
+    a = np.asarray(optimistic, dtype=float)
+    m = np.asarray(most_likely, dtype=float)
+    b = np.asarray(pessimistic, dtype=float)
+    if np.any(a > m) or np.any(m > b):
+        raise ValueError("need optimistic <= most_likely <= pessimistic")
+    rng = np.random.default_rng(seed)
+    span = b - a
+    safe = np.where(span > 0, span, 1.0)
+    alpha = 1 + 4 * (m - a) / safe
+    beta = 1 + 4 * (b - m) / safe
+    draws = rng.beta(alpha, beta, size=(n_samples, len(a)))
+    return a + span * draws
+
+
+def critical_path(activities):
+    """Schedule `activities` (see `ProjectNetwork`) and return the `CPMResult`."""
+    return ProjectNetwork(activities).schedule()
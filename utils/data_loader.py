@@ -1,22 +1,54 @@
 from pathlib import Path
-import pandas as pd
+import numpy as np
 import polars as pl
 
+# (path, sheet) -> (mtime_ns, DataFrame); a file is re-read only after it changes on disk
+_CACHE = {}
+
+
+def _resolve(file_name) -> Path:
+    script_dir = Path(__file__).parent.resolve()
+    file_path = (script_dir / file_name).resolve()
+    if not file_path.exists():
+        raise FileNotFoundError(f"File not found: {file_path}")
+    return file_path
+
+
+def _read_table(file_path: Path, sheet=0) -> pl.DataFrame:
+    """One sheet of a workbook, or the whole CSV / Parquet file, through the mtime cache."""
+    key = (str(file_path), sheet)
+    mtime = file_path.stat().st_mtime_ns
+    hit = _CACHE.get(key)
+    if hit is not None and hit[0] == mtime:
+        return hit[1]
+
+    suffix = file_path.suffix.lower()
+    if suffix == ".csv":
+        df = pl.read_csv(file_path)
+    elif suffix == ".parquet":
+        df = pl.read_parquet(file_path)
+    elif suffix in (".xlsx", ".ods"):
+        # pandas (and the openpyxl / odf engines behind it) only when a workbook is actually read
+        import pandas as pd
+
+        engine = "openpyxl" if suffix == ".xlsx" else "odf"
+        df = pl.from_pandas(pd.read_excel(file_path, engine=engine, sheet_name=sheet))
+    else:
+        raise ValueError("Unsupported file format. Use .xlsx, .ods, .csv or .parquet")
+    _CACHE[key] = (mtime, df)
+    return df
+
+
 class DataLoader:
     def __init__(self, file_name: str):
-        script_dir = Path(__file__).parent.resolve()
-        self.file_path = (script_dir / file_name).resolve()
-        if not self.file_path.exists():
-            raise FileNotFoundError(f"File not found: {self.file_path}")
+        self.file_path = _resolve(file_name)
 
     def load(self):
         suffix = self.file_path.suffix.lower()
 
         if suffix == ".xlsx":
             def _sheet(name):
-                return pl.from_pandas(
-                    pd.read_excel(self.file_path, engine="openpyxl", sheet_name=name)
-                )
+                return _read_table(self.file_path, name)
 
             prod_cap_df      = _sheet("Production Capacity")
             demand_df        = _sheet("Sales Region Demand")
@@ -24,10 +56,99 @@ class DataLoader:
             prod_cost_df     = _sheet("Production Costs")
 
         elif suffix == ".ods":
-            pd_df = pd.read_excel(self.file_path, engine="odf")
-            prod_cap_df = demand_df = shipping_cost_df = prod_cost_df = pl.from_pandas(pd_df)
+            prod_cap_df = demand_df = shipping_cost_df = prod_cost_df = _read_table(self.file_path)
 
         else:
             raise ValueError("Unsupported file format. Use .xlsx or .ods")
 
-        return prod_cap_df, demand_df, shipping_cost_df, prod_cost_df
\ No newline at end of file
+        return prod_cap_df, demand_df, shipping_cost_df, prod_cost_df
+
+
+class TransportationData:
+    """
+    A transportation (or assignment) instance pivoted from long format.
+
+    Attributes:
+        sources (list): Source labels in order of first appearance.
+        sinks (list): Sink labels, or positions 0..D-1 when the file has no sink column.
+        supply (np.ndarray): (S,) supply per source (None without a supply column).
+        demand (np.ndarray): (D,) demand per sink (None without a demand column).
+        cost (np.ndarray): (S, D) cost matrix; lanes missing from the file are inf.
+    """
+
+    def __init__(self, sources, sinks, supply, demand, cost):
+        self.sources = sources
+        self.sinks = sinks
+        self.supply = supply
+        self.demand = demand
+        self.cost = cost
+
+    def as_lists(self):
+        """`(supply, demand, trans_cost)` as the practice_code `read_data` functions return them."""
+        return (
+            None if self.supply is None else self.supply.tolist(),
+            None if self.demand is None else self.demand.tolist(),
+            self.cost.tolist(),
+        )
+
+    def __repr__(self):
+        S, D = self.cost.shape
+        return f"TransportationData(sources={S}, sinks={D})"
+
+
+def _codes(series: pl.Series):
+    """Integer codes of `series` in order of first appearance, plus the unique labels."""
+    labels = series.unique(maintain_order=True)
+    lookup = pl.DataFrame({"label": labels, "code": np.arange(len(labels))})
+    codes = (pl.DataFrame({"label": series})
+             .join(lookup, on="label", how="left", maintain_order="left")["code"]
+             .to_numpy())
+    return codes, labels.to_list()
+
+
+def read_transportation(file_name, sheet=0, source="P", sink=None, supply="Supply",
+                        demand="Demand", cost="Shipping_Cost") -> TransportationData:
+    """
+    Read a long-format transportation sheet, one row per (source, sink) lane:
+
+        P | Supply | Demand | Shipping_Cost
+
+    as in practice_code/hw4_test.py and assignment_4_hw_2_code.py. Sources are
+    identified by the `source` column, not by their supply, so two sources with
+    the same supply stay apart. Without a `sink` column the sinks are numbered
+    by their position inside each source's rows. Every column is converted in one
+    pass and scattered straight into the cost matrix; a lane that appears more
+    than once keeps its smallest cost (the `groupby(...).min()` of
+    assignment_4_hw_3_code.py, read with source="P", sink="Job", cost="Time",
+    supply=None, demand=None).
+
+    Args:
+        file_name (str): .csv, .parquet, .xlsx or .ods; relative paths are
+            resolved against utils/ like `DataLoader`. Reads share its cache.
+        sheet (str | int, optional): Workbook sheet. Defaults to the first.
+        source, sink, supply, demand, cost (str, optional): Column names; `sink`,
+            `supply` and `demand` may be None.
+
+    Returns:
+        TransportationData
+    """
+    df = _read_table(_resolve(file_name), sheet)
+    src, sources = _codes(df[source])
+    if sink is None:
+        # position of the row within its source
+        dst = df.select(pl.int_range(pl.len()).over(source).alias("pos"))["pos"].to_numpy()
+        sinks = list(range(int(dst.max()) + 1 if len(dst) else 0))
+    else:
+        dst, sinks = _codes(df[sink])
+
+    matrix = np.full((len(sources), len(sinks)), np.inf)
+    np.minimum.at(matrix, (src, dst), df[cost].cast(pl.Float64).to_numpy())
+
+    supply_vec = demand_vec = None
+    if supply is not None:
+        supply_vec = np.zeros(len(sources))
+        supply_vec[src] = df[supply].cast(pl.Float64).to_numpy()
+    if demand is not None:
+        demand_vec = np.zeros(len(sinks))
+        demand_vec[dst] = df[demand].cast(pl.Float64).to_numpy()
+    return TransportationData(sources, sinks, supply_vec, demand_vec, matrix)
@@ -0,0 +1,222 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import gurobipy as gp
+import numpy as np
+from gurobipy import GRB
+
+from utils.batch_lp import BatchLP
+from utils.stochastic import sample_demand
+
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+class DemandSimulationResult:
+    """
+    Cost distribution of the Super Chip LP under sampled demand.
+
+    Attributes:
+        samples (np.ndarray): (K, R, C) demand samples.
+        costs (np.ndarray): (K,) optimal cost per sample, inf where infeasible.
+        in_range (np.ndarray): (K,) True where the base basis stayed optimal and
+            the cost came from the dual prices.
+        binding (np.ndarray): (K, F) True where facility f ran at capacity.
+        status (np.ndarray): (K,) Gurobi status (OPTIMAL for in-range samples).
+        facilities (List[str]): Facility names for `to_df`.
+    """
+
+    def __init__(self, samples, costs, in_range, binding, status, runtime, facilities):
+        self.samples = samples
+        self.costs = costs
+        self.in_range = in_range
+        self.binding = binding
+        self.status = status
+        self.runtime = runtime
+        self.facilities = facilities
+
+    @property
+    def feasible(self):
+        return self.status == GRB.OPTIMAL
+
+    def cost_quantiles(self, q=QUANTILES):
+        """Quantiles of the cost over the feasible samples."""
+        return np.quantile(self.costs[self.feasible], q)
+
+    def binding_probability(self):
+        """(F,) share of feasible samples in which each facility's capacity binds."""
+        return self.binding[self.feasible].mean(axis=0)
+
+    def infeasible_probability(self):
+        return float(1.0 - self.feasible.mean())
+
+    def to_df(self):
+        import polars as pl
+
+        return pl.DataFrame({
+            "facility":            self.facilities,
+            "binding_probability": self.binding_probability(),
+        })
+
+    def __repr__(self):
+        K = len(self.costs)
+        return (f"DemandSimulationResult(samples={K}, in_range={int(self.in_range.sum())}, "
+                f"resolved={int(K - self.in_range.sum())}, runtime={self.runtime:.3f}s)")
+
+
+def _supply_constrs(model):
+    return [c for c in model.getConstrs() if c.ConstrName.startswith("supply_f")]
+
+
+def _demand_constrs(model, R, C):
+    return [model.getConstrByName(f"demand_r{r + 1}_c{c + 1}") for r in range(R) for c in range(C)]
+
+
+def _constraint_matrix(model, constrs, variables):
+    """Dense (m, n) coefficient matrix of `constrs` over `variables`, read row by row."""
+    A = np.zeros((len(constrs), len(variables)))
+    for i, c in enumerate(constrs):
+        expr = model.getRow(c)
+        idx = [expr.getVar(k).index for k in range(expr.size())]
+        A[i, idx] = [expr.getCoeff(k) for k in range(expr.size())]
+    return A
+
+
+def _basis_values(model, rows, delta, tol):
+    """
+    Primal values of the base optimal basis under every sample, from one
+    factorisation: x_B = B^-1 (b - A_N x_N) with the demand rows of b moved by
+    `delta`. A sample is in range when all basic values keep their bounds
+    (slacks included: >= 0 on <= rows, <= 0 on >= rows, 0 on = rows).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (K,) in-range mask and (K, m) slack per
+        constraint (0 where the slack is nonbasic).
+    """
+    constrs = model.getConstrs()
+    variables = model.getVars()
+    m = len(constrs)
+    K = len(delta)
+    vbasis = np.array(model.getAttr("VBasis", variables))
+    cbasis = np.array(model.getAttr("CBasis", constrs))
+    basic_vars = np.flatnonzero(vbasis == 0)
+    basic_rows = np.flatnonzero(cbasis == 0)
+    if len(basic_vars) + len(basic_rows) != m:
+        # not a simplex basis (e.g. barrier without crossover): re-solve everything
+        return np.zeros(K, dtype=bool), np.zeros((K, m))
+
+    A = _constraint_matrix(model, constrs, variables)
+    x = np.array(model.getAttr("X", variables))
+    nonbasic = np.flatnonzero(vbasis != 0)
+    b = np.tile(np.array(model.getAttr("RHS", constrs)) - A[:, nonbasic] @ x[nonbasic], (K, 1))
+    b[:, [c.index for c in rows]] += delta
+
+    # Gurobi rows read a . x + slack = rhs, so a basic slack is a unit column
+    B = np.hstack([A[:, basic_vars], np.eye(m)[:, basic_rows]])
+    x_B = np.linalg.solve(B, b.T).T
+    x_vals, s_vals = x_B[:, :len(basic_vars)], x_B[:, len(basic_vars):]
+
+    lb = np.array(model.getAttr("LB", variables))[basic_vars]
+    ub = np.array(model.getAttr("UB", variables))[basic_vars]
+    ok = ((x_vals >= lb - tol) & (x_vals <= ub + tol)).all(axis=1)
+    sense = np.array(model.getAttr("Sense", constrs))[basic_rows]
+    ok &= np.where(sense == GRB.LESS_EQUAL, s_vals >= -tol,
+                   np.where(sense == GRB.GREATER_EQUAL, s_vals <= tol, np.abs(s_vals) <= tol)).all(axis=1)
+    slack = np.zeros((K, m))
+    slack[:, basic_rows] = s_vals
+    return ok, slack
+
+
+def _warm_copy(model, names, env):
+    """`BatchLP` over a copy of `model` in `env`, started from the base optimal basis."""
+    copy = model.copy(env=env)
+    variables = copy.getVars()
+    copy.setAttr("VBasis", variables, model.getAttr("VBasis", model.getVars()))
+    copy.setAttr("CBasis", copy.getConstrs(), model.getAttr("CBasis", model.getConstrs()))
+    return BatchLP(copy, variables, [copy.getConstrByName(n) for n in names])
+
+
+def simulate_demand(model, demand, n_samples=5000, scale=0.1, growth=1.0, seed=None, samples=None,
+                    workers=1, tol=1e-6, facilities=None):
+    """
+    Monte-Carlo cost distribution of a solved alternative-case model from
+    `super_chip_solve` under random demand.
+
+    Demand samples are drawn around `demand[r][c]` by `sample_demand`. The
+    optimal basis is factored once and x_B = B^-1 b is computed for all samples
+    in one batched solve. Where every basic value keeps its bounds the basis
+    stays optimal (a change of demand does not touch dual feasibility), so the
+    cost is ObjVal + Pi . (d - d0) and the capacity slacks come straight from
+    x_B. This is the exact, simultaneous form of the `SARHSLow` / `SARHSUp`
+    ranging of the demand rows. Only the other samples are re-solved, in warm
+    copies of the model spread over `workers` threads.
+
+    Args:
+        model (gurobipy.Model): Solved LP with rows supply_f{f} and demand_r{r}_c{c}.
+        demand (Mapping | array-like): Base demand[r][c], the right-hand sides of `model`.
+        n_samples (int, optional): Samples to draw. Defaults to 5000.
+        scale, growth (float, optional): Passed to `sample_demand`.
+        seed (int, optional): Random seed.
+        samples (array-like, optional): (K, R, C) samples to use instead of drawing.
+        workers (int, optional): Threads for the re-solves. Defaults to 1.
+        tol (float, optional): Feasibility tolerance of the basis test, and
+            slack below which a capacity counts as binding.
+        facilities (List[str], optional): Names for `to_df`.
+
+    Returns:
+        DemandSimulationResult
+    """
+    start = time.perf_counter()
+    if isinstance(demand, dict):
+        demand = [[demand[r][c] for c in range(len(demand[r]))] for r in range(len(demand))]
+    base = np.asarray(demand, dtype=float)
+    R, C = base.shape
+    if samples is None:
+        samples = sample_demand(base, n_samples, growth, scale, seed)
+    samples = np.asarray(samples, dtype=float)
+    K = len(samples)
+
+    supply = _supply_constrs(model)
+    rows = _demand_constrs(model, R, C)
+    F = len(supply)
+    rhs0 = np.array(model.getAttr("RHS", rows))
+    pi = np.array(model.getAttr("Pi", rows))
+
+    delta = samples.reshape(K, -1) - rhs0
+    in_range, slack = _basis_values(model, rows, delta, tol)
+
+    costs = np.full(K, np.inf)
+    status = np.full(K, GRB.OPTIMAL, dtype=np.int64)
+    binding = np.zeros((K, F), dtype=bool)
+    costs[in_range] = model.ObjVal + delta[in_range] @ pi
+    supply_idx = [c.index for c in supply]
+    binding[in_range] = slack[np.ix_(in_range, supply_idx)] <= tol
+
+    out = np.flatnonzero(~in_range)
+    if out.size:
+        capacity = np.array(model.getAttr("RHS", supply))
+        names = [c.ConstrName for c in rows]
+        workers = max(1, min(workers, out.size))
+        chunks = np.array_split(out, workers)
+        envs = [gp.Env(params={"OutputFlag": 0}) for _ in range(workers)]
+        templates = []
+        try:
+            # Gurobi models are not thread-safe: copy the shared model here, hand each thread its own
+            templates.extend(_warm_copy(model, names, e) for e in envs)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(lambda k: templates[k].solve(rhs=delta[chunks[k]] + rhs0, duals=False),
+                                        range(workers)))
+        finally:
+            for t in templates:
+                t.model.dispose()
+            for e in envs:
+                e.dispose()
+        for idx, result in zip(chunks, results):
+            status[idx] = result.status
+            ok = result.optimal
+            costs[idx[ok]] = result.objective[ok]
+            # variables are x_f_c_r in f, c, r order
+            shipped = np.nan_to_num(result.x).reshape(len(idx), F, -1).sum(axis=2)
+            binding[idx] = ok[:, None] & (capacity - shipped <= tol)
+    names = list(facilities) if facilities is not None else [f"f{f + 1}" for f in range(F)]
+    return DemandSimulationResult(samples, costs, in_range, binding, status, time.perf_counter() - start,
+                                  names)
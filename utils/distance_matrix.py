@@ -0,0 +1,129 @@
+import numpy as np
+
+EARTH_RADIUS_MI = 3958.8
+EARTH_RADIUS_KM = 6371.0
+
+
+def euclidean(points, other=None, dtype=np.float64):
+    """
+    Pairwise Euclidean distances by broadcasting, instead of the double loop over
+    `loc_x` / `loc_y` in practice_code/IP1_example.py.
+
+    Args:
+        points (array-like): (N, D) coordinates.
+        other (array-like, optional): (M, D) coordinates. Defaults to `points`.
+        dtype (np.dtype, optional): np.float32 halves the memory of the (N, M)
+            result. Defaults to np.float64.
+
+    Returns:
+        np.ndarray: (N, M) distances.
+    """
+    a = np.asarray(points, dtype=dtype)
+    b = a if other is None else np.asarray(other, dtype=dtype)
+    # one coordinate at a time keeps the temporaries at (N, M) instead of (N, M, D)
+    out = np.zeros((len(a), len(b)), dtype=dtype)
+    for k in range(a.shape[1]):
+        diff = a[:, k, None] - b[None, :, k]
+        out += diff * diff
+    return np.sqrt(out, out=out)
+
+
+def haversine(points, other=None, radius=EARTH_RADIUS_MI, dtype=np.float64):
+    """
+    Pairwise great-circle distances between (latitude, longitude) pairs in
+    degrees, e.g. the stadiums of practice_code/TSP_MLB_Stadiums*.py.
+
+    Args:
+        points (array-like): (N, 2) latitude / longitude in degrees.
+        other (array-like, optional): (M, 2) latitude / longitude. Defaults to `points`.
+        radius (float, optional): Earth radius, which sets the unit. Defaults to
+            EARTH_RADIUS_MI (miles); use EARTH_RADIUS_KM for kilometres.
+        dtype (np.dtype, optional): Result dtype. Defaults to np.float64.
+
+    Returns:
+        np.ndarray: (N, M) distances.
+    """
+    a = np.radians(np.asarray(points, dtype=np.float64))
+    b = a if other is None else np.radians(np.asarray(other, dtype=np.float64))
+    lat1, lon1 = a[:, 0, None], a[:, 1, None]
+    lat2, lon2 = b[None, :, 0], b[None, :, 1]
+    h = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return (2 * radius * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))).astype(dtype, copy=False)
+
+
+METRICS = {"euclidean": euclidean, "haversine": haversine}
+
+
+def distance_matrix(points, metric="euclidean", dtype=np.float64, diagonal=None, **kwargs):
+    """
+    Dense (N, N) distance matrix.
+
+    Args:
+        points (array-like): (N, D) coordinates, or (N, 2) latitude / longitude for
+            "haversine".
+        metric (str, optional): "euclidean" or "haversine". Defaults to "euclidean".
+        dtype (np.dtype, optional): Defaults to np.float64.
+        diagonal (float, optional): Value for the diagonal, e.g. the big-M
+            `m = 10000000` the practice TSP scripts put there. Defaults to None,
+            which leaves it at 0.
+        **kwargs: Passed on to the metric (e.g. `radius`).
+
+    Returns:
+        np.ndarray: (N, N) distances.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"unknown metric {metric!r}, expected one of {sorted(METRICS)}")
+    out = METRICS[metric](points, dtype=dtype, **kwargs)
+    if diagonal is not None:
+        np.fill_diagonal(out, diagonal)
+    return out
+
+
+def knn(points, k, metric="euclidean", block_size=2048, dtype=np.float64, **kwargs):
+    """
+    k nearest neighbours of every point without the dense (N, N) matrix.
+
+    Distances are computed `block_size` rows at a time, so peak memory is
+    O(block_size * N) instead of O(N^2); at 10k+ points the dense matrix is the
+    first thing that stops fitting.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (N, k) neighbour indices and their
+        distances, nearest first. A point is never its own neighbour.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"unknown metric {metric!r}, expected one of {sorted(METRICS)}")
+    points = np.asarray(points)
+    n = len(points)
+    k = min(k, n - 1)
+    index = np.empty((n, k), dtype=np.int64)
+    dist = np.empty((n, k), dtype=dtype)
+    for lo in range(0, n, block_size):
+        hi = min(lo + block_size, n)
+        d = METRICS[metric](points[lo:hi], points, dtype=dtype, **kwargs)
+        d[np.arange(hi - lo), np.arange(lo, hi)] = np.inf
+        nearest = np.argpartition(d, k - 1, axis=1)[:, :k]
+        nd = np.take_along_axis(d, nearest, axis=1)
+        order = np.argsort(nd, axis=1)
+        index[lo:hi] = np.take_along_axis(nearest, order, axis=1)
+        dist[lo:hi] = np.take_along_axis(nd, order, axis=1)
+    return index, dist
+
+
+def candidate_edges(points, k=10, metric="euclidean", **kwargs):
+    """
+    Sparse candidate edge set: every edge {i, j} where j is among the k nearest
+    neighbours of i or i among those of j.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: edge endpoints i < j and the
+        edge lengths, sorted by (i, j).
+    """
+    index, dist = knn(points, k, metric=metric, **kwargs)
+    n, k = index.shape
+    i = np.repeat(np.arange(n), k)
+    j = index.ravel()
+    lo, hi = np.minimum(i, j), np.maximum(i, j)
+    keys, first = np.unique(lo * n + hi, return_index=True)
+    return keys // n, keys % n, dist.ravel()[first]
@@ -0,0 +1,302 @@
+import time
+
+import gurobipy as gp
+import numpy as np
+from gurobipy import GRB
+
+from utils.network_flow import transportation
+from utils.super_chip_model import super_chip_arrays
+
+METHODS = ("mip", "benders")
+
+
+class ExpansionProblem:
+    """
+    Facility siting / expansion over the Super Chip network.
+
+    Every site f either exists (always open) or is a candidate that costs
+    `open_cost[f]` to open. An open site has `base_capacity[f]` and can add
+    capacity modules k = 0, 1, ... in order: module k + 1 can only be bought
+    together with module k. Demand for chip c in region r is met from the open
+    sites at `unit_cost[f, c, r]` (production plus shipping).
+
+    Args:
+        unit_cost (array-like): (F, C, R) cost per unit shipped.
+        demand (array-like): (R, C) demand, indexed like `demand[r][c]`.
+        base_capacity (array-like): (F,) capacity of a site once open.
+        open_cost (array-like, optional): (F,) fixed cost of opening a site.
+            Defaults to 0.
+        module_capacity (array-like, optional): (K,) or (F, K) capacity of each
+            expansion module. Defaults to no modules.
+        module_cost (array-like, optional): (K,) or (F, K) fixed cost of each module.
+        existing (array-like, optional): (F,) True for sites that are already
+            open. Defaults to the sites with zero `open_cost`.
+        names (List[str], optional): Site names for `ExpansionResult.to_df`.
+    """
+
+    def __init__(self, unit_cost, demand, base_capacity, open_cost=0.0, module_capacity=None,
+                 module_cost=None, existing=None, names=None):
+        self.unit_cost = np.asarray(unit_cost, dtype=float)
+        F, C, R = self.unit_cost.shape
+        self.demand = np.asarray(demand, dtype=float)
+        if self.demand.shape != (R, C):
+            raise ValueError(f"demand must have shape (R, C) = {(R, C)}")
+        self.base_capacity = np.broadcast_to(np.asarray(base_capacity, dtype=float), (F,)).copy()
+        self.open_cost = np.broadcast_to(np.asarray(open_cost, dtype=float), (F,)).copy()
+        if module_capacity is None:
+            module_capacity, module_cost = np.zeros((F, 0)), np.zeros((F, 0))
+        module_capacity = np.atleast_1d(np.asarray(module_capacity, dtype=float))
+        K = module_capacity.shape[-1]
+        self.module_capacity = np.broadcast_to(module_capacity, (F, K)).copy()
+        self.module_cost = np.broadcast_to(np.asarray(module_cost, dtype=float), (F, K)).copy()
+        self.existing = (self.open_cost == 0) if existing is None else np.asarray(existing, dtype=bool)
+        self.names = list(names) if names is not None else [f"site_{f + 1}" for f in range(F)]
+
+    @classmethod
+    def from_super_chip(cls, supply, demand, costs, module_capacity=None, module_cost=None,
+                        candidate_cost=None, candidate_capacity=None, candidate_open_cost=None,
+                        names=None):
+        """
+        Expansion problem on the `super_chip_solve` data: the existing facilities
+        plus optional candidate sites with their own (G, C, R) unit costs.
+        """
+        ship, prod, need = super_chip_arrays(supply, demand, costs)
+        F = len(ship)
+        unit = prod[:, :, None] + ship
+        base = np.asarray(supply, dtype=float)
+        open_cost = np.zeros(F)
+        existing = np.ones(F, dtype=bool)
+        if candidate_cost is not None:
+            candidate_cost = np.asarray(candidate_cost, dtype=float)
+            G = len(candidate_cost)
+            unit = np.concatenate([unit, candidate_cost])
+            base = np.r_[base, np.broadcast_to(np.asarray(candidate_capacity, dtype=float), (G,))]
+            open_cost = np.r_[open_cost, np.broadcast_to(np.asarray(candidate_open_cost, dtype=float), (G,))]
+            existing = np.r_[existing, np.zeros(G, dtype=bool)]
+        return cls(unit, need, base, open_cost, module_capacity, module_cost, existing, names)
+
+    @property
+    def shape(self):
+        """(F, C, R)."""
+        return self.unit_cost.shape
+
+    @property
+    def max_capacity(self):
+        """(F,) capacity of each site with every module bought."""
+        return self.base_capacity + self.module_capacity.sum(axis=1)
+
+    def lane_big_m(self):
+        """
+        (F, C, R) tight M for x[f, c, r] <= M * open[f]: a lane never carries
+        more than its sink's demand nor more than its site can ever make.
+        """
+        return np.minimum(self.demand.T[None, :, :], self.max_capacity[:, None, None])
+
+    def capacity(self, is_open, modules):
+        """(F,) capacity of a siting decision."""
+        return self.base_capacity * is_open + (self.module_capacity * modules).sum(axis=1)
+
+    def fixed_cost(self, is_open, modules):
+        return float(self.open_cost @ is_open + (self.module_cost * modules).sum())
+
+    def cost_lower_bound(self):
+        """Every sink served at its cheapest lane: a valid bound on the shipping cost."""
+        return float((self.unit_cost.min(axis=0) * self.demand.T).sum())
+
+    def transport(self, capacity):
+        """Shipping LP for fixed capacities, as a transportation problem."""
+        F, C, R = self.shape
+        return transportation(self.unit_cost.reshape(F, C * R), capacity, self.demand.T.ravel())
+
+
+class ExpansionResult:
+    """
+    Optimal siting.
+
+    Attributes:
+        open (np.ndarray): (F,) 1 for open sites.
+        modules (np.ndarray): (F, K) 1 for the modules bought.
+        capacity (np.ndarray): (F,) resulting capacity.
+        x (np.ndarray): (F, C, R) shipments.
+        fixed_cost, shipping_cost (float): The two parts of `cost`.
+    """
+
+    def __init__(self, problem, method, status, is_open, modules, x, shipping_cost, runtime,
+                 gap=None, nodes=0, cuts=0):
+        self.problem = problem
+        self.method = method
+        self.status = status
+        self.open = is_open
+        self.modules = modules
+        self.capacity = problem.capacity(is_open, modules)
+        self.x = x
+        self.fixed_cost = problem.fixed_cost(is_open, modules)
+        self.shipping_cost = shipping_cost
+        self.cost = self.fixed_cost + shipping_cost
+        self.runtime = runtime
+        self.gap = gap
+        self.nodes = nodes
+        self.cuts = cuts
+
+    def to_df(self):
+        """One row per site: open, modules bought, capacity and units shipped."""
+        import polars as pl
+
+        p = self.problem
+        return pl.DataFrame({
+            "site":     p.names,
+            "existing": p.existing,
+            "open":     self.open.astype(bool),
+            "modules":  self.modules.sum(axis=1).astype(int),
+            "capacity": self.capacity,
+            "shipped":  self.x.sum(axis=(1, 2)),
+        })
+
+    def __repr__(self):
+        opened = [n for n, o, e in zip(self.problem.names, self.open, self.problem.existing) if o and not e]
+        return (f"ExpansionResult(cost={self.cost:g}, opened={opened}, "
+                f"modules={int(self.modules.sum())}, method={self.method!r}, runtime={self.runtime:.3f}s)")
+
+
+def _siting_vars(m, problem):
+    """open / module binaries, module ordering and the total-capacity row shared by both methods."""
+    F, K = problem.module_capacity.shape
+    is_open = m.addMVar(F, vtype=GRB.BINARY, obj=problem.open_cost, name="open")
+    is_open.LB = problem.existing.astype(float)
+    modules = m.addMVar((F, K), vtype=GRB.BINARY, obj=problem.module_cost, name="module")
+    opens = is_open.tolist()
+    mods = modules.tolist()
+    for f in range(F):
+        for k in range(K):
+            # a module needs an open site and the module below it
+            m.addLConstr(mods[f][k], GRB.LESS_EQUAL, opens[f] if k == 0 else mods[f][k - 1],
+                         name=f"module_order[{f},{k}]")
+    capacity = [gp.LinExpr([problem.base_capacity[f]] + problem.module_capacity[f].tolist(),
+                           [opens[f]] + mods[f]) for f in range(F)]
+    m.addLConstr(gp.quicksum(capacity), GRB.GREATER_EQUAL, float(problem.demand.sum()),
+                 name="total_capacity")
+    return is_open, modules, capacity
+
+
+def _new_model(name, env, time_limit, mip_gap, output_flag):
+    m = gp.Model(name, env=env)
+    m.ModelSense = GRB.MINIMIZE
+    m.Params.OutputFlag = output_flag
+    if time_limit is not None:
+        m.Params.TimeLimit = time_limit
+    if mip_gap is not None:
+        m.Params.MIPGap = mip_gap
+    return m
+
+
+def expansion_mip(problem, strong_linking=True, env=None, time_limit=None, mip_gap=None,
+                  output_flag=0):
+    """
+    Solve the siting problem as one MIP.
+
+    The capacity rows sum_{c, r} x[f, c, r] <= base[f] * open[f] + sum_k cap[f, k] * module[f, k]
+    already shut closed sites. With `strong_linking` every lane of a candidate
+    site also gets x[f, c, r] <= M[f, c, r] * open[f], with M from
+    `ExpansionProblem.lane_big_m` instead of a blanket constant such as the
+    `M = 9999999` of practice_code/fixedCharge.py. These rows tighten the LP
+    bound a great deal.
+
+    Returns:
+        ExpansionResult
+    """
+    start = time.perf_counter()
+    F, C, R = problem.shape
+    m = _new_model("facility_expansion", env, time_limit, mip_gap, output_flag)
+    is_open, modules, capacity = _siting_vars(m, problem)
+    x = m.addMVar((F, C, R), lb=0.0, obj=problem.unit_cost, name="x")
+    xs = x.tolist()
+    for r in range(R):
+        for c in range(C):
+            if problem.demand[r, c] > 0:
+                m.addLConstr(gp.quicksum(xs[f][c][r] for f in range(F)), GRB.GREATER_EQUAL,
+                             float(problem.demand[r, c]), name=f"demand_r{r+1}_c{c+1}")
+    opens = is_open.tolist()
+    for f in range(F):
+        shipped = gp.quicksum(xs[f][c][r] for c in range(C) for r in range(R))
+        m.addLConstr(shipped - capacity[f], GRB.LESS_EQUAL, 0.0, name=f"supply_f{f+1}")
+    if strong_linking:
+        big_m = problem.lane_big_m()
+        for f in np.flatnonzero(~problem.existing).tolist():
+            for c in range(C):
+                for r in range(R):
+                    if big_m[f, c, r] > 0:
+                        m.addLConstr(xs[f][c][r] - big_m[f, c, r] * opens[f], GRB.LESS_EQUAL, 0.0,
+                                     name=f"link_{f+1}_{c+1}_{r+1}")
+    m.optimize()
+    runtime = time.perf_counter() - start
+    if m.SolCount == 0:
+        K = problem.module_capacity.shape[1]
+        return ExpansionResult(problem, "mip", m.Status, np.zeros(F), np.zeros((F, K)),
+                               np.zeros((F, C, R)), float("inf"), runtime, nodes=int(m.NodeCount))
+    x_val = x.X
+    return ExpansionResult(problem, "mip", m.Status, np.round(is_open.X), np.round(modules.X), x_val,
+                           float((problem.unit_cost * x_val).sum()), runtime, m.MIPGap,
+                           int(m.NodeCount))
+
+
+def expansion_benders(problem, env=None, time_limit=None, mip_gap=None, output_flag=0, tol=1e-6):
+    """
+    Solve the siting problem by Benders decomposition.
+
+    The master keeps only the open / module binaries and eta, the shipping cost.
+    Each integer master solution is checked in a MIPSOL callback by solving the
+    transportation LP for its capacities with `utils.network_flow.transportation`.
+    If eta underestimates the shipping cost Q, the lazy optimality cut
+
+        eta >= Q + sum_f pi[f] * (capacity_f(open, module) - capacity_f)
+
+    is added, with pi the supply duals. The total-capacity row keeps every
+    master solution feasible for the subproblem, so no feasibility cuts are
+    needed.
+
+    Returns:
+        ExpansionResult: `cuts` counts the optimality cuts.
+    """
+    start = time.perf_counter()
+    F, C, R = problem.shape
+    m = _new_model("facility_expansion_benders", env, time_limit, mip_gap, output_flag)
+    m.Params.LazyConstraints = 1
+    is_open, modules, capacity = _siting_vars(m, problem)
+    eta = m.addVar(lb=problem.cost_lower_bound(), obj=1.0, name="eta")
+    opens = is_open.tolist()
+    mods = [v for row in modules.tolist() for v in row]
+    m._cuts = 0
+
+    def callback(model, where):
+        if where != GRB.Callback.MIPSOL:
+            return
+        o = np.round(model.cbGetSolution(opens))
+        z = np.round(model.cbGetSolution(mods)).reshape(problem.module_capacity.shape)
+        cap = problem.capacity(o, z)
+        sub = problem.transport(cap)
+        if model.cbGetSolution(eta) < sub.cost - tol * max(1.0, abs(sub.cost)):
+            pi = sub.supply_duals
+            model.cbLazy(eta >= sub.cost + gp.quicksum(pi[f] * (capacity[f] - cap[f])
+                                                       for f in range(F) if pi[f] != 0))
+            model._cuts += 1
+
+    m.optimize(callback)
+    runtime = time.perf_counter() - start
+    K = problem.module_capacity.shape[1]
+    if m.SolCount == 0:
+        return ExpansionResult(problem, "benders", m.Status, np.zeros(F), np.zeros((F, K)),
+                               np.zeros((F, C, R)), float("inf"), runtime, nodes=int(m.NodeCount),
+                               cuts=m._cuts)
+    o, z = np.round(is_open.X), np.round(modules.X)
+    sub = problem.transport(problem.capacity(o, z))
+    return ExpansionResult(problem, "benders", m.Status, o, z, sub.x.reshape(F, C, R), sub.cost,
+                           time.perf_counter() - start, m.MIPGap, int(m.NodeCount), m._cuts)
+
+
+def facility_expansion(problem, method="mip", **kwargs):
+    """Solve `problem` with "mip" (`expansion_mip`) or "benders" (`expansion_benders`)."""
+    if method == "mip":
+        return expansion_mip(problem, **kwargs)
+    if method == "benders":
+        return expansion_benders(problem, **kwargs)
+    raise ValueError(f"unknown method {method!r}, expected one of {METHODS}")
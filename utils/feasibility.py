@@ -0,0 +1,262 @@
+import numpy as np
+from gurobipy import GRB
+
+from utils.batch_lp import BatchLP
+
+TOL = 1e-9
+
+
+class FeasibilityCheck:
+    def __init__(self, name, passed, detail=""):
+        self.name = name
+        self.passed = bool(passed)
+        self.detail = detail
+
+    def __repr__(self):
+        detail = f", {self.detail}" if self.detail else ""
+        return f"FeasibilityCheck({self.name}: {'ok' if self.passed else 'FAILED'}{detail})"
+
+
+class FeasibilityReport:
+    """
+    Outcome of a pre-solve analysis.
+
+    Attributes:
+        feasible (bool | None): None when the LP stopped without a verdict.
+        checks (List[FeasibilityCheck]): The vectorized tests, in order.
+        dummy (str | None): "source" or "sink" when a dummy node balanced the totals.
+        lp_solved (bool): Whether an LP was attempted at all.
+        objective (float | None): Optimal cost, when the LP was solved to optimality.
+        x (np.ndarray | None): Optimal flows (with the dummy row / column, if any).
+        iis (List[str] | None): Constraints and bounds of the IIS (method "iis").
+        violations (Dict[str, float] | None): Constraint -> amount it had to be
+            relaxed by in the elastic relaxation (method "feasrelax").
+    """
+
+    def __init__(self, checks, feasible=None, dummy=None, lp_solved=False, objective=None, x=None,
+                 iis=None, violations=None):
+        self.checks = checks
+        self.feasible = feasible
+        self.dummy = dummy
+        self.lp_solved = lp_solved
+        self.objective = objective
+        self.x = x
+        self.iis = iis
+        self.violations = violations
+
+    @property
+    def failed(self):
+        return [c for c in self.checks if not c.passed]
+
+    def to_df(self):
+        import polars as pl
+
+        return pl.DataFrame({
+            "check":  [c.name for c in self.checks],
+            "passed": [c.passed for c in self.checks],
+            "detail": [c.detail for c in self.checks],
+        })
+
+    def __repr__(self):
+        parts = [f"feasible={self.feasible}", f"failed={[c.name for c in self.failed]}",
+                 f"lp_solved={self.lp_solved}"]
+        if self.dummy:
+            parts.append(f"dummy={self.dummy}")
+        if self.iis is not None:
+            parts.append(f"iis={self.iis}")
+        if self.violations is not None:
+            parts.append(f"violations={self.violations}")
+        return f"FeasibilityReport({', '.join(parts)})"
+
+
+def _total(demand):
+    """Sum of an array or of a nested `demand[r][c]` mapping."""
+    if isinstance(demand, dict):
+        return float(sum(v for inner in demand.values() for v in inner.values()))
+    return float(np.sum(demand))
+
+
+def check_transportation(supply, demand, cost=None, exact=True):
+    """
+    Necessary conditions for a transportation LP, with no solve:
+
+    - supplies and demands are non-negative;
+    - totals: equal when every row is an equality (practice_code/hw4_test.py),
+      otherwise total supply covers total demand;
+    - with a cost matrix whose missing lanes are inf (or NaN), every sink's demand is
+      at most the supply of the sources that reach it, and with `exact` every
+      source's supply is at most the demand it can reach.
+
+    Returns:
+        List[FeasibilityCheck]
+    """
+    supply = np.asarray(supply, dtype=float)
+    demand = np.asarray(demand, dtype=float)
+    total_s, total_d = supply.sum(), demand.sum()
+    tol = TOL * max(1.0, total_s, total_d)
+    checks = [FeasibilityCheck("nonnegative", (supply >= 0).all() and (demand >= 0).all())]
+    if exact:
+        checks.append(FeasibilityCheck("balanced_totals", abs(total_s - total_d) <= tol,
+                                       f"supply {total_s:g} vs demand {total_d:g}"))
+    else:
+        checks.append(FeasibilityCheck("supply_covers_demand", total_s >= total_d - tol,
+                                       f"supply {total_s:g} vs demand {total_d:g}"))
+    if cost is not None:
+        lanes = np.isfinite(np.asarray(cost, dtype=float))
+        reach = supply @ lanes
+        short = np.flatnonzero(demand > reach + tol)
+        checks.append(FeasibilityCheck("sinks_reachable", short.size == 0,
+                                       f"sinks {short.tolist()}" if short.size else ""))
+        if exact:
+            reach = lanes @ demand
+            stuck = np.flatnonzero(supply > reach + tol)
+            checks.append(FeasibilityCheck("sources_reachable", stuck.size == 0,
+                                           f"sources {stuck.tolist()}" if stuck.size else ""))
+    return checks
+
+
+def balance_transportation(supply, demand, cost, dummy_cost=0.0):
+    """
+    Add a dummy sink (excess supply, kept at the sources) or a dummy source
+    (unmet demand) so the totals match, at `dummy_cost` per unit.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray, str | None]: supply, demand,
+        cost and "sink" / "source" / None for the node added.
+    """
+    supply = np.asarray(supply, dtype=float)
+    demand = np.asarray(demand, dtype=float)
+    cost = np.asarray(cost, dtype=float)
+    gap = supply.sum() - demand.sum()
+    if abs(gap) <= TOL * max(1.0, supply.sum(), demand.sum()):
+        return supply, demand, cost, None
+    if gap > 0:
+        column = np.full((len(supply), 1), dummy_cost)
+        return supply, np.append(demand, gap), np.hstack([cost, column]), "sink"
+    row = np.full((1, len(demand)), dummy_cost)
+    return np.append(supply, -gap), demand, np.vstack([cost, row]), "source"
+
+
+def diagnose_infeasibility(model, method="iis"):
+    """
+    Explain why `model` is infeasible.
+
+    "iis" runs `computeIIS` and lists the constraints and variable bounds of the
+    irreducible infeasible subsystem. "feasrelax" solves the elastic relaxation
+    (`feasRelaxS`, linear penalty on constraint violations) on a copy and reports
+    how far each violated constraint had to move, positive when its left-hand
+    side fell short of the right-hand side.
+
+    Returns:
+        Tuple[List[str] | None, Dict[str, float] | None]: (iis, violations).
+    """
+    if method == "iis":
+        model.computeIIS()
+        names = [c.ConstrName for c in model.getConstrs() if c.IISConstr]
+        for v in model.getVars():
+            if v.IISLB:
+                names.append(f"{v.VarName}.LB")
+            if v.IISUB:
+                names.append(f"{v.VarName}.UB")
+        return names, None
+    if method == "feasrelax":
+        relaxed = model.copy()
+        relaxed.Params.OutputFlag = 0
+        relaxed.feasRelaxS(0, False, False, True)
+        relaxed.optimize()
+        violations = {}
+        if relaxed.Status == GRB.OPTIMAL:
+            for v in relaxed.getVars():
+                name = v.VarName
+                if name.startswith(("ArtP_", "ArtN_")) and v.X > TOL:
+                    constr = name[5:]
+                    violations[constr] = violations.get(constr, 0.0) + (v.X if name[3] == "P" else -v.X)
+        return None, violations
+    raise ValueError(f"unknown method {method!r}, expected 'iis' or 'feasrelax'")
+
+
+def analyze_transportation(supply, demand, cost, exact=True, balance=True, dummy_cost=0.0,
+                           method="iis", env=None):
+    """
+    Pre-solve analysis of the transportation LP of practice_code/hw4_test.py.
+
+    The vectorized checks of `check_transportation` run first. Unbalanced
+    totals are fixed by a dummy node when `balance` is set. If a check still
+    fails the LP is never built. Otherwise the LP is solved (lanes with
+    inf cost get an upper bound of 0), and if it is infeasible all the same,
+    `diagnose_infeasibility` explains why.
+
+    Args:
+        supply (array-like): (S,) supply per source.
+        demand (array-like): (D,) demand per sink.
+        cost (array-like): (S, D) cost matrix, inf for missing lanes.
+        exact (bool, optional): Equality rows (True) or supply <= / demand >=.
+        balance (bool, optional): Add a dummy source or sink. Defaults to True.
+        dummy_cost (float, optional): Unit cost of the dummy lanes. Defaults to 0.
+        method (str, optional): "iis" or "feasrelax". Defaults to "iis".
+        env (gurobipy.Env, optional): Environment to build the LP in.
+
+    Returns:
+        FeasibilityReport
+    """
+    supply = np.asarray(supply, dtype=float)
+    demand = np.asarray(demand, dtype=float)
+    cost = np.asarray(cost, dtype=float)
+    checks = check_transportation(supply, demand, cost, exact)
+    dummy = None
+    totals = "balanced_totals" if exact else "supply_covers_demand"
+    if balance and any(c.name == totals and not c.passed for c in checks):
+        # surplus supply only needs a dummy sink when the rows are equalities
+        if exact or demand.sum() > supply.sum():
+            before = {c.name: c.detail for c in checks}
+            supply, demand, cost, dummy = balance_transportation(supply, demand, cost, dummy_cost)
+            checks = check_transportation(supply, demand, cost, exact)
+            for c in checks:
+                if c.name == totals:
+                    c.detail = f"{before[totals]}, balanced by a dummy {dummy}"
+    if not all(c.passed for c in checks):
+        return FeasibilityReport(checks, feasible=False, dummy=dummy)
+
+    S, D = cost.shape
+    lanes = np.isfinite(cost)
+    batch = BatchLP.transportation(S, D, exact=exact, env=env)
+    result = batch.solve(obj=np.where(lanes, cost, 0.0).ravel(),
+                         ub=np.where(lanes, np.inf, 0.0).ravel(),
+                         rhs=np.concatenate([supply, demand])[None], duals=False)
+    if result.optimal[0]:
+        return FeasibilityReport(checks, feasible=True, dummy=dummy, lp_solved=True,
+                                 objective=float(result.objective[0]), x=result.x[0].reshape(S, D))
+    model = batch.model
+    if model.Status == GRB.INF_OR_UNBD:
+        model.Params.DualReductions = 0
+        model.optimize()
+    if model.Status != GRB.INFEASIBLE:
+        return FeasibilityReport(checks, feasible=None, dummy=dummy, lp_solved=True)
+    iis, violations = diagnose_infeasibility(model, method)
+    return FeasibilityReport(checks, feasible=False, dummy=dummy, lp_solved=True, iis=iis,
+                             violations=violations)
+
+
+def check_super_chip(supply, demand, extra_capacity=None, case="alternative"):
+    """
+    Capacity test for `super_chip_solve`, with no solve. In the "alternative"
+    case any facility may make any chip for any region, so total effective
+    supply covering total demand is also sufficient and the report is final.
+    The "base" case fixes each facility's output to its share of total demand
+    and is feasible whenever the data are non-negative.
+
+    Returns:
+        FeasibilityReport
+    """
+    supply = np.asarray(supply, dtype=float)
+    effective = supply + (0.0 if extra_capacity is None else np.asarray(extra_capacity, dtype=float))
+    total_d = _total(demand)
+    if case == "base":
+        ok = (supply >= 0).all() and supply.sum() > 0
+        checks = [FeasibilityCheck("proportional_split", ok, f"demand {total_d:g}")]
+    else:
+        ok = effective.sum() >= total_d - TOL * max(1.0, total_d)
+        checks = [FeasibilityCheck("supply_covers_demand", ok,
+                                   f"effective supply {effective.sum():g} vs demand {total_d:g}"
+                                   + ("" if ok else f", short {total_d - effective.sum():g}"))]
+    return FeasibilityReport(checks, feasible=bool(ok))
@@ -0,0 +1,217 @@
+import time
+
+import numpy as np
+
+
+class KnapsackResult:
+    def __init__(self, value, selected, method, runtime, nodes=0):
+        self.value = value
+        self.selected = selected
+        self.method = method
+        self.runtime = runtime
+        self.nodes = nodes
+
+    @property
+    def x(self):
+        """0/1 decision per item, as `x[i].x` in practice_code/Knapsack.py."""
+        return self.selected.astype(float)
+
+    def __repr__(self):
+        return (f"KnapsackResult(value={self.value:g}, items={np.flatnonzero(self.selected).tolist()}, "
+                f"method={self.method!r}, runtime={self.runtime:.4f}s)")
+
+
+def _integral(values):
+    values = np.asarray(values, dtype=float)
+    return bool(np.all(values == np.round(values)))
+
+
+def knapsack_dp(sizes, rewards, capacity):
+    """
+    0/1 knapsack by dynamic programming over the capacity, O(n * capacity).
+
+    One rolling 1-D array best[b] (the best reward within size b) is updated per
+    item with a single vectorised maximum. A bit per item and capacity is kept
+    to recover the chosen items.
+
+    Args:
+        sizes (array-like): Integer item sizes.
+        rewards (array-like): Item rewards.
+        capacity (int): Integer capacity `B`.
+
+    Returns:
+        KnapsackResult
+    """
+    start = time.perf_counter()
+    sizes = np.asarray(sizes)
+    rewards = np.asarray(rewards, dtype=float)
+    if not (_integral(sizes) and _integral(capacity)):
+        raise ValueError("knapsack_dp needs integer sizes and capacity; use knapsack_bb")
+    sizes = sizes.astype(np.int64)
+    B = int(capacity)
+    n = len(sizes)
+
+    best = np.zeros(B + 1)
+    take = np.zeros((n, B + 1), dtype=bool)
+    for i in range(n):
+        s = sizes[i]
+        if s > B or rewards[i] <= 0:
+            continue
+        cand = best[:B + 1 - s] + rewards[i]
+        take[i, s:] = cand > best[s:]
+        np.maximum(best[s:], cand, out=best[s:])
+
+    selected = np.zeros(n, dtype=bool)
+    b = B
+    for i in range(n - 1, -1, -1):
+        if take[i, b]:
+            selected[i] = True
+            b -= sizes[i]
+    return KnapsackResult(float(best[B]), selected, "dp", time.perf_counter() - start)
+
+
+def knapsack_bb(sizes, rewards, capacity, max_nodes=None):
+    """
+    0/1 knapsack by depth-first branch and bound.
+
+    Items are visited in decreasing `rewards[i] / sizes[i]` order (the ratios
+    practice_code/Knapsack.py prints), and a subtree is pruned when its
+    fractional (LP) bound cannot beat the incumbent: fill the remaining capacity
+    greedily by ratio, taking a fraction of the first item that does not fit.
+    Works for non-integer sizes.
+
+    Args:
+        sizes (array-like): Item sizes.
+        rewards (array-like): Item rewards.
+        capacity (float): Capacity `B`.
+        max_nodes (int, optional): Stop after this many nodes and return the
+            incumbent. Defaults to None (no limit).
+
+    Returns:
+        KnapsackResult: `nodes` counts the explored nodes.
+    """
+    start = time.perf_counter()
+    sizes = np.asarray(sizes, dtype=float)
+    rewards = np.asarray(rewards, dtype=float)
+    n = len(sizes)
+    # items that can never help are dropped up front
+    useful = np.flatnonzero((rewards > 0) & (sizes <= capacity))
+    free = useful[sizes[useful] <= 0]
+    useful = useful[sizes[useful] > 0]
+    order = useful[np.argsort(-rewards[useful] / sizes[useful], kind="stable")]
+    w = sizes[order].tolist()
+    v = rewards[order].tolist()
+    m = len(order)
+
+    def bound(k, room, value):
+        while k < m and w[k] <= room:
+            room -= w[k]
+            value += v[k]
+            k += 1
+        if k < m:
+            value += v[k] * room / w[k]
+        return value
+
+    best_value = 0.0
+    best_take = []
+    nodes = 0
+    # stack of (next item, remaining capacity, value, items taken)
+    stack = [(0, float(capacity), 0.0, [])]
+    while stack:
+        k, room, value, taken = stack.pop()
+        nodes += 1
+        if value > best_value:
+            best_value, best_take = value, taken
+        if k == m or bound(k, room, value) <= best_value + 1e-12:
+            continue
+        if max_nodes is not None and nodes >= max_nodes:
+            break
+        # push "skip" first so "take" (the greedy branch) is explored first
+        stack.append((k + 1, room, value, taken))
+        if w[k] <= room:
+            stack.append((k + 1, room - w[k], value + v[k], taken + [k]))
+
+    selected = np.zeros(n, dtype=bool)
+    selected[order[best_take]] = True
+    selected[free] = True
+    value = best_value + rewards[free].sum()
+    return KnapsackResult(float(value), selected, "bb", time.perf_counter() - start, nodes)
+
+
+def knapsack(sizes, rewards, capacity, method="auto", max_dp_cells=50_000_000):
+    """
+    Solve a 0/1 knapsack (or a capital-budgeting selection) without Gurobi.
+
+    Args:
+        sizes, rewards (array-like): Item sizes and rewards.
+        capacity (float): Capacity `B`.
+        method (str, optional): "dp", "bb" or "auto". "auto" uses the DP when the
+            sizes and capacity are integers and n * capacity is at most
+            `max_dp_cells`, and branch and bound otherwise.
+
+    Returns:
+        KnapsackResult
+    """
+    if method == "auto":
+        small = len(sizes) * (float(capacity) + 1) <= max_dp_cells
+        method = "dp" if small and _integral(sizes) and _integral(capacity) else "bb"
+    if method == "dp":
+        return knapsack_dp(sizes, rewards, capacity)
+    if method == "bb":
+        return knapsack_bb(sizes, rewards, capacity)
+    raise ValueError(f"unknown method {method!r}")
+
+
+def knapsack_batch(sizes, rewards, capacity, return_items=True):
+    """
+    Solve K knapsacks with the same capacity at once, e.g. thousands of candidate
+    capital-budgeting portfolios in a planning cycle.
+
+    The DP table has shape (K, capacity + 1), and each item updates all
+    portfolios with one gather and one maximum. Portfolios with fewer items are
+    padded with zero sizes and rewards.
+
+    Args:
+        sizes (array-like): (K, n) integer item sizes.
+        rewards (array-like): (K, n) item rewards.
+        capacity (int): Common integer capacity `B`.
+        return_items (bool, optional): Also recover the selected items, which
+            keeps K * n * (capacity + 1) bits. Defaults to True.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (K,) optimal values and (K, n) boolean
+        selections (None when `return_items` is False).
+    """
+    sizes = np.atleast_2d(np.asarray(sizes))
+    rewards = np.atleast_2d(np.asarray(rewards, dtype=float))
+    if sizes.shape != rewards.shape:
+        raise ValueError("sizes and rewards must have the same (K, n) shape")
+    if not (_integral(sizes) and _integral(capacity)):
+        raise ValueError("knapsack_batch needs integer sizes and capacity")
+    sizes = sizes.astype(np.int64)
+    K, n = sizes.shape
+    B = int(capacity)
+    rows = np.arange(K)[:, None]
+    cols = np.arange(B + 1)[None, :]
+
+    best = np.zeros((K, B + 1))
+    take = np.zeros((n, K, B + 1), dtype=bool) if return_items else None
+    for i in range(n):
+        s = sizes[:, i:i + 1]
+        src = cols - s
+        cand = np.where(src >= 0, best[rows, np.maximum(src, 0)] + rewards[:, i:i + 1], -np.inf)
+        better = cand > best
+        if return_items:
+            take[i] = better
+        best = np.where(better, cand, best)
+
+    values = best[:, B]
+    if not return_items:
+        return values, None
+    selected = np.zeros((K, n), dtype=bool)
+    b = np.full(K, B)
+    for i in range(n - 1, -1, -1):
+        chosen = take[i, np.arange(K), b]
+        selected[:, i] = chosen
+        b = b - np.where(chosen, sizes[:, i], 0)
+    return values, selected
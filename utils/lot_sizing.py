@@ -0,0 +1,267 @@
+import time
+
+import numpy as np
+from gurobipy import GRB, LinExpr, Model
+
+
+class LotSizingProblem:
+    """
+    Multi-period production / outsourcing / inventory plan, the model of
+    practice_code/apple_computer.py for T periods and V vendors.
+
+    Every cost and capacity is broadcast: a scalar applies to all periods,
+    a (T,) array is per period and, for the vendor arrays, a (V,) array is per
+    vendor and a (V, T) array per vendor and period.
+
+    Args:
+        demand (array-like): (T,) demand per period.
+        reg_cost (array-like): Regular production cost, `RegCost`.
+        out_cost (array-like): Outsourcing cost per vendor, `OutCost`.
+        hold_cost (array-like): Holding cost on the inventory carried out of a
+            period, `HoldCost`. The final inventory is not charged.
+        salvage (float, optional): Value of the final inventory, `SalvageVal`.
+        initial_inventory (float, optional): `InitialInv`.
+        reg_cap (array-like, optional): Regular capacity, `RegCap`. Defaults to
+            unlimited.
+        out_cap (array-like, optional): Vendor capacity, `OutCap`. Defaults to
+            unlimited.
+        n_vendors (int, optional): V, when no vendor array gives it. Defaults to 1.
+    """
+
+    def __init__(self, demand, reg_cost, out_cost, hold_cost, salvage=0.0, initial_inventory=0.0,
+                 reg_cap=np.inf, out_cap=np.inf, n_vendors=None):
+        self.demand = np.asarray(demand, dtype=float)
+        T = len(self.demand)
+        if n_vendors is None:
+            shapes = [np.shape(a) for a in (out_cost, out_cap) if np.ndim(a)]
+            n_vendors = shapes[0][0] if shapes else 1
+        self.reg_cost = np.broadcast_to(np.asarray(reg_cost, dtype=float), (T,)).copy()
+        self.reg_cap = np.broadcast_to(np.asarray(reg_cap, dtype=float), (T,)).copy()
+        self.hold_cost = np.broadcast_to(np.asarray(hold_cost, dtype=float), (T,)).copy()
+        self.out_cost = self._per_vendor(out_cost, n_vendors, T)
+        self.out_cap = self._per_vendor(out_cap, n_vendors, T)
+        self.salvage = float(salvage)
+        self.initial_inventory = float(initial_inventory)
+
+    @staticmethod
+    def _per_vendor(values, V, T):
+        a = np.asarray(values, dtype=float)
+        if a.ndim == 1:
+            a = a[:, None]
+        return np.broadcast_to(a, (V, T)).copy()
+
+    @classmethod
+    def apple(cls):
+        """The data of practice_code/apple_computer.py."""
+        return cls(demand=[35, 50, 30, 60], reg_cost=200, out_cost=230, hold_cost=50, salvage=150,
+                   initial_inventory=10, reg_cap=30, out_cap=20, n_vendors=2)
+
+    @property
+    def n_periods(self):
+        return len(self.demand)
+
+    @property
+    def n_vendors(self):
+        return self.out_cost.shape[0]
+
+    def inventory_cost(self):
+        """(T + 1,) objective coefficients of I[0..T]: holding on I[1..T-1], minus salvage on I[T]."""
+        c = np.zeros(self.n_periods + 1)
+        c[1:-1] = self.hold_cost[:-1]
+        c[-1] -= self.salvage
+        return c
+
+    def cost(self, x, y, inventory):
+        """Objective value of a plan, e.g. one stitched together by `rolling_horizon`."""
+        return float(self.reg_cost @ x + (self.out_cost * y).sum() + self.inventory_cost() @ inventory)
+
+
+def balance_matrix(n_periods, n_vendors):
+    """
+    The inventory-balance rows I[t+1] - I[t] - x[t] - sum_v y[v, t] = -demand[t]
+    as a banded CSR matrix over the columns [x (T), y (V * T, vendor-major), I (T + 1)].
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: indptr, indices and data.
+    """
+    T, V = n_periods, n_vendors
+    t = np.arange(T)
+    inv = T + V * T
+    indices = np.column_stack([inv + t + 1, inv + t, t, T + np.arange(V)[None, :] * T + t[:, None]])
+    data = np.tile(np.r_[1.0, -np.ones(V + 2)], T)
+    indptr = np.arange(T + 1) * (V + 3)
+    return indptr, indices.ravel(), data
+
+
+class LotSizingModel:
+    """
+    Gurobi model of a `LotSizingProblem`: x, y and I are MVars with the costs as
+    their objective coefficients and the capacities as bounds, and the balance
+    rows come from `balance_matrix`.
+    """
+
+    def __init__(self, problem, env=None, name="lot_sizing"):
+        T, V = problem.n_periods, problem.n_vendors
+        m = Model(name, env=env)
+        m.modelSense = GRB.MINIMIZE
+        m.setParam("outputFlag", 0)
+        self.x = m.addMVar(T, lb=0.0, name="x")
+        self.y = m.addMVar((V, T), lb=0.0, name="y")
+        self.I = m.addMVar(T + 1, lb=0.0, name="I")
+        columns = self.x.tolist() + [v for row in self.y.tolist() for v in row] + self.I.tolist()
+        indptr, indices, data = balance_matrix(T, V)
+        indptr, indices, data = indptr.tolist(), indices.tolist(), data.tolist()
+        self.balance = [
+            m.addLConstr(LinExpr(data[indptr[t]:indptr[t + 1]],
+                                 [columns[j] for j in indices[indptr[t]:indptr[t + 1]]]),
+                         GRB.EQUAL, 0.0, name=f"balance[{t}]")
+            for t in range(T)
+        ]
+        self.model = m
+        self.n_periods, self.n_vendors = T, V
+        self.set_data(problem)
+
+    def set_data(self, problem, initial_inventory=None, inventory_cost=None):
+        """Load costs, capacities and demand in place, keeping the model (and its basis)."""
+        self.x.Obj = problem.reg_cost
+        self.x.UB = problem.reg_cap
+        self.y.Obj = problem.out_cost
+        self.y.UB = problem.out_cap
+        self.I.Obj = problem.inventory_cost() if inventory_cost is None else inventory_cost
+        i0 = problem.initial_inventory if initial_inventory is None else initial_inventory
+        self.I.LB = np.r_[i0, np.zeros(self.n_periods)]
+        self.I.UB = np.r_[i0, np.full(self.n_periods, np.inf)]
+        self.model.setAttr("RHS", self.balance, (-problem.demand).tolist())
+
+    def optimize(self):
+        self.model.optimize()
+        return self.model.Status
+
+
+class LotSizingResult:
+    """
+    Production plan over all periods.
+
+    Attributes:
+        x (np.ndarray): (T,) regular production.
+        y (np.ndarray): (V, T) outsourcing per vendor.
+        inventory (np.ndarray): (T + 1,) inventory, I[0] the initial one.
+        duals (np.ndarray): (T,) marginal cost of one more unit of demand in
+            each period, minus the Pi of the balance rows (whose right-hand side
+            is -demand). None for a rolling plan.
+    """
+
+    def __init__(self, problem, x, y, inventory, status, runtime, duals=None, windows=1,
+                 iterations=0):
+        self.problem = problem
+        self.x = x
+        self.y = y
+        self.inventory = inventory
+        self.status = status
+        self.runtime = runtime
+        self.duals = duals
+        self.windows = windows
+        self.iterations = iterations
+        self.cost = problem.cost(x, y, inventory) if status == GRB.OPTIMAL else float("inf")
+
+    def to_df(self):
+        """One row per period: demand, production, outsourcing, closing inventory (and dual)."""
+        import polars as pl
+
+        columns = {
+            "period":     np.arange(1, self.problem.n_periods + 1),
+            "demand":     self.problem.demand,
+            "production": self.x,
+            "outsourced": self.y.sum(axis=0),
+            "inventory":  self.inventory[1:],
+        }
+        if self.duals is not None:
+            columns["dual"] = self.duals
+        return pl.DataFrame(columns)
+
+    def __repr__(self):
+        return (f"LotSizingResult(cost={self.cost:g}, periods={self.problem.n_periods}, "
+                f"windows={self.windows}, runtime={self.runtime:.3f}s)")
+
+
+def solve_lot_sizing(problem, env=None):
+    """
+    Solve the whole horizon as one LP.
+
+    Returns:
+        LotSizingResult
+    """
+    start = time.perf_counter()
+    lsm = LotSizingModel(problem, env=env)
+    status = lsm.optimize()
+    if status != GRB.OPTIMAL:
+        T, V = problem.n_periods, problem.n_vendors
+        return LotSizingResult(problem, np.zeros(T), np.zeros((V, T)), np.zeros(T + 1), status,
+                               time.perf_counter() - start)
+    return LotSizingResult(problem, lsm.x.X, lsm.y.X, lsm.I.X, status, time.perf_counter() - start,
+                           duals=-np.array(lsm.model.getAttr("Pi", lsm.balance)),
+                           iterations=int(lsm.model.IterCount))
+
+
+def rolling_horizon(problem, window=13, step=1, terminal_value=0.0, env=None):
+    """
+    Plan by re-optimising a sliding window of `window` periods and committing
+    the first `step` of them, the way a weekly plan is actually run.
+
+    One window-sized model is built once. Each re-optimisation loads the next
+    window's data in place, so Gurobi warm-starts from the previous optimal
+    basis. The last windows are padded with idle periods (no demand, no
+    capacity, no cost).
+
+    Args:
+        problem (LotSizingProblem): The full horizon.
+        window (int, optional): Periods per window. Defaults to 13 (a quarter of weeks).
+        step (int, optional): Periods committed per window. Defaults to 1.
+        terminal_value (float, optional): Value per unit of inventory left at the
+            end of a window that stops before the horizon does. Defaults to 0.
+        env (gurobipy.Env, optional): Environment to build the model in.
+
+    Returns:
+        LotSizingResult: Status is that of the first window that failed, if any.
+    """
+    start = time.perf_counter()
+    T, V = problem.n_periods, problem.n_vendors
+    W = min(window, T)
+    x = np.zeros(T)
+    y = np.zeros((V, T))
+    inventory = np.zeros(T + 1)
+    inventory[0] = problem.initial_inventory
+
+    def padded(a, t0, fill):
+        out = np.full(a.shape[:-1] + (W,), fill, dtype=float)
+        part = a[..., t0:t0 + W]
+        out[..., :part.shape[-1]] = part
+        return out
+
+    lsm = None
+    windows = iterations = 0
+    status = GRB.OPTIMAL
+    for t0 in range(0, T, step):
+        last = min(t0 + W, T) - t0     # real periods in this window
+        chunk = LotSizingProblem(
+            padded(problem.demand, t0, 0.0), padded(problem.reg_cost, t0, 0.0),
+            padded(problem.out_cost, t0, 0.0), padded(problem.hold_cost, t0, 0.0),
+            reg_cap=padded(problem.reg_cap, t0, 0.0), out_cap=padded(problem.out_cap, t0, 0.0),
+        )
+        inv_cost = np.zeros(W + 1)
+        inv_cost[1:last] = problem.hold_cost[t0:t0 + last - 1]
+        inv_cost[last] = -(problem.salvage if t0 + last == T else terminal_value)
+        if lsm is None:
+            lsm = LotSizingModel(chunk, env=env, name="lot_sizing_window")
+        lsm.set_data(chunk, initial_inventory=inventory[t0], inventory_cost=inv_cost)
+        status = lsm.optimize()
+        windows += 1
+        iterations += int(lsm.model.IterCount)
+        if status != GRB.OPTIMAL:
+            break
+        k = min(step, T - t0)
+        x[t0:t0 + k] = lsm.x.X[:k]
+        y[:, t0:t0 + k] = lsm.y.X[:, :k]
+        inventory[t0 + 1:t0 + k + 1] = lsm.I.X[1:k + 1]
+    return LotSizingResult(problem, x, y, inventory, status, time.perf_counter() - start,
+                           windows=windows, iterations=iterations)
@@ -0,0 +1,594 @@
+import heapq
+from collections import deque
+
+import numpy as np
+
+EPS = 1e-9
+
+
+class InfeasibleError(ValueError):
+    """The supplies cannot meet the demands."""
+
+
+class Graph:
+    """
+    Directed graph in compressed sparse row (CSR) form.
+
+    Arcs are stored sorted by tail, so the arcs leaving node u are
+    `indptr[u]:indptr[u+1]`. Arc values passed in (capacity, cost) and results
+    handed back (flows, duals) are always in the order the arcs were given, which
+    `order` maps to CSR positions.
+
+    Args:
+        n (int): Number of nodes.
+        tail, head (array-like): Endpoints of each arc.
+        capacity (array-like, optional): Arc capacities. Defaults to unbounded.
+        cost (array-like, optional): Arc costs or lengths. Defaults to 0.
+    """
+
+    def __init__(self, n, tail, head, capacity=None, cost=None):
+        tail = np.asarray(tail, dtype=np.int64)
+        head = np.asarray(head, dtype=np.int64)
+        if tail.shape != head.shape:
+            raise ValueError("tail and head must have the same length")
+        if len(tail) and (min(tail.min(), head.min()) < 0 or max(tail.max(), head.max()) >= n):
+            raise ValueError(f"arc endpoints must be in [0, {n})")
+        m = len(tail)
+        capacity = np.full(m, np.inf) if capacity is None else np.asarray(capacity, dtype=float)
+        cost = np.zeros(m) if cost is None else np.asarray(cost, dtype=float)
+
+        self.n = n
+        self.order = np.argsort(tail, kind="stable")
+        self.tail = tail[self.order]
+        self.head = head[self.order]
+        self.capacity = capacity[self.order]
+        self.cost = cost[self.order]
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(tail, minlength=n), out=self.indptr[1:])
+
+    @classmethod
+    def from_arcs(cls, arcs, n=None, capacity=None, cost=None):
+        """Graph over a list of (i, j) arcs, e.g. the keys of the practice scripts' `x` dicts."""
+        arcs = list(arcs)
+        tail = [i for i, _ in arcs]
+        head = [j for _, j in arcs]
+        if n is None:
+            n = max(tail + head) + 1 if arcs else 0
+        return cls(n, tail, head, capacity, cost)
+
+    @classmethod
+    def from_matrix(cls, matrix, missing=-1, values="capacity"):
+        """
+        Graph from a dense matrix with a sentinel for missing arcs, like `cap` in
+        practice_code/maxFlow_example.py or `d` in SP_example.py (`e = -1`). Rows
+        may be shorter than the number of columns (the sink has no row there).
+
+        Args:
+            matrix (List[List[float]]): matrix[i][j] is the value of arc (i, j).
+            missing (float, optional): Entry marking "no arc". Defaults to -1.
+            values (str, optional): Whether the entries are "capacity" or "cost".
+        """
+        n = max(len(matrix), max((len(row) for row in matrix), default=0))
+        arcs, vals = [], []
+        for i, row in enumerate(matrix):
+            for j, v in enumerate(row):
+                if v != missing:
+                    arcs.append((i, j))
+                    vals.append(v)
+        if values == "capacity":
+            return cls.from_arcs(arcs, n, capacity=vals)
+        if values == "cost":
+            return cls.from_arcs(arcs, n, cost=vals)
+        raise ValueError(f"values must be 'capacity' or 'cost', not {values!r}")
+
+    @property
+    def n_arcs(self):
+        return len(self.tail)
+
+    def arcs(self):
+        """(tail, head) arrays in input order."""
+        tail = np.empty_like(self.tail)
+        head = np.empty_like(self.head)
+        tail[self.order] = self.tail
+        head[self.order] = self.head
+        return tail, head
+
+    def to_input_order(self, values):
+        out = np.empty(len(values), dtype=np.asarray(values).dtype)
+        out[self.order] = values
+        return out
+
+    def arc_dict(self, values):
+        """{(i, j): value} in input order, keyed like the `x` dicts of the LP scripts."""
+        tail, head = self.arcs()
+        return {(int(i), int(j)): float(v) for i, j, v in zip(tail, head, values)}
+
+
+class _Residual:
+    """
+    Residual graph as plain lists: edge 2a is CSR arc a, edge 2a+1 its reverse.
+    The flow on arc a is the residual capacity of edge 2a+1.
+    """
+
+    def __init__(self, graph):
+        m = graph.n_arcs
+        self.n = graph.n
+        self.head = np.empty(2 * m, dtype=np.int64)
+        self.head[0::2] = graph.head
+        self.head[1::2] = graph.tail
+        cap = np.zeros(2 * m)
+        cap[0::2] = graph.capacity
+        cost = np.empty(2 * m)
+        cost[0::2] = graph.cost
+        cost[1::2] = -graph.cost
+        tail = self.head.reshape(-1, 2)[:, ::-1].ravel()
+        edges = np.argsort(tail, kind="stable")
+        indptr = np.zeros(self.n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(tail, minlength=self.n), out=indptr[1:])
+
+        self.head = self.head.tolist()
+        self.cap = cap.tolist()
+        self.cost = cost.tolist()
+        self.edges = edges.tolist()
+        self.indptr = indptr.tolist()
+
+    def flow(self, graph):
+        return graph.to_input_order(np.array(self.cap[1::2]))
+
+    def reachable(self, source):
+        seen = [False] * self.n
+        seen[source] = True
+        queue = deque([source])
+        while queue:
+            u = queue.popleft()
+            for k in range(self.indptr[u], self.indptr[u + 1]):
+                e = self.edges[k]
+                v = self.head[e]
+                if self.cap[e] > EPS and not seen[v]:
+                    seen[v] = True
+                    queue.append(v)
+        return np.array(seen)
+
+
+class MaxFlowResult:
+    """
+    Maximum flow with its minimum cut.
+
+    `flow` is per arc in input order. `potentials` is 1 on the source side of the
+    cut and 0 on the sink side, and `capacity_duals` is 1 on the arcs crossing
+    it: a dual optimum of the max-flow LP, i.e. the Pi of the `x <= cap` rows in
+    practice_code/maxFlow_example.py when that dual is unique.
+    """
+
+    def __init__(self, value, flow, source_side, graph):
+        self.value = value
+        self.flow = flow
+        self.source_side = source_side
+        self.potentials = source_side.astype(float)
+        tail, head = graph.arcs()
+        self.capacity_duals = (source_side[tail] & ~source_side[head]).astype(float)
+
+    @property
+    def cut_arcs(self):
+        return np.flatnonzero(self.capacity_duals)
+
+    def __repr__(self):
+        return f"MaxFlowResult(value={self.value:g}, cut_arcs={len(self.cut_arcs)})"
+
+
+def max_flow(graph, source, sink):
+    """
+    Maximum source-sink flow with Dinic's algorithm: BFS level graphs and
+    blocking flows found by DFS with current-arc pointers, O(V^2 E) worst case.
+
+    Raises:
+        ValueError: If a source-sink path has unbounded capacity.
+    """
+    if source == sink:
+        raise ValueError("source and sink must differ")
+    res = _Residual(graph)
+    n, head, cap, edges, indptr = res.n, res.head, res.cap, res.edges, res.indptr
+    total = 0.0
+    while True:
+        level = [-1] * n
+        level[source] = 0
+        queue = deque([source])
+        while queue:
+            u = queue.popleft()
+            for k in range(indptr[u], indptr[u + 1]):
+                e = edges[k]
+                v = head[e]
+                if cap[e] > EPS and level[v] < 0:
+                    level[v] = level[u] + 1
+                    queue.append(v)
+        if level[sink] < 0:
+            break
+
+        it = indptr[:-1]
+        while True:
+            path = []
+            u = source
+            while u != sink:
+                while it[u] < indptr[u + 1]:
+                    e = edges[it[u]]
+                    v = head[e]
+                    if cap[e] > EPS and level[v] == level[u] + 1:
+                        break
+                    it[u] += 1
+                else:
+                    if u == source:
+                        break
+                    level[u] = -1  # dead end for the rest of this phase
+                    e = path.pop()
+                    u = head[e ^ 1]
+                    it[u] += 1
+                    continue
+                path.append(e)
+                u = v
+            if u != sink:
+                break
+            pushed = min(cap[e] for e in path)
+            if pushed == np.inf:
+                raise ValueError("unbounded flow: a source-sink path has infinite capacity")
+            for e in path:
+                cap[e] -= pushed
+                cap[e ^ 1] += pushed
+            total += pushed
+
+    return MaxFlowResult(total, res.flow(graph), res.reachable(source), graph)
+
+
+class ShortestPathResult:
+    """
+    Shortest-path tree from `source`.
+
+    `distance` doubles as the node potentials: the duals of the flow-conservation
+    rows of the shortest-path LP (practice_code/SP_example.py), up to a constant.
+    """
+
+    def __init__(self, source, distance, pred_arc, graph):
+        self.source = source
+        self.distance = distance
+        self.potentials = distance
+        self.pred_arc = pred_arc  # CSR position of the tree arc into each node, -1 if none
+        self.graph = graph
+
+    def path(self, target):
+        """Nodes from `source` to `target`, or [] if `target` is unreachable."""
+        if not np.isfinite(self.distance[target]):
+            return []
+        nodes = [target]
+        while nodes[-1] != self.source:
+            nodes.append(int(self.graph.tail[self.pred_arc[nodes[-1]]]))
+        return nodes[::-1]
+
+    def flow(self, target):
+        """Unit flow along the path to `target`, per arc in input order (the LP's `x`)."""
+        x = np.zeros(self.graph.n_arcs)
+        node = target
+        if np.isfinite(self.distance[target]):
+            while node != self.source:
+                a = self.pred_arc[node]
+                x[a] = 1.0
+                node = int(self.graph.tail[a])
+        return self.graph.to_input_order(x)
+
+    def __repr__(self):
+        reached = int(np.isfinite(self.distance).sum())
+        return f"ShortestPathResult(source={self.source}, reached={reached}/{len(self.distance)})"
+
+
+def shortest_path(graph, source, target=None):
+    """
+    Dijkstra with a binary heap, O(E log V), using `graph.cost` as arc lengths.
+    Stops early once `target` is settled, if given.
+
+    Raises:
+        ValueError: If any arc length is negative.
+    """
+    if graph.n_arcs and graph.cost.min() < 0:
+        raise ValueError("Dijkstra needs non-negative arc lengths")
+    indptr = graph.indptr.tolist()
+    head = graph.head.tolist()
+    cost = graph.cost.tolist()
+    n = graph.n
+
+    dist = [np.inf] * n
+    pred = [-1] * n
+    done = [False] * n
+    dist[source] = 0.0
+    heap = [(0.0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if done[u]:
+            continue
+        done[u] = True
+        if u == target:
+            break
+        for a in range(indptr[u], indptr[u + 1]):
+            v = head[a]
+            nd = d + cost[a]
+            if nd < dist[v]:
+                dist[v] = nd
+                pred[v] = a
+                heapq.heappush(heap, (nd, v))
+    # tentative labels beyond an early-stopped target are not shortest distances
+    dist = np.where(done, dist, np.inf)
+    return ShortestPathResult(source, dist, np.array(pred), graph)
+
+
+class MinCostFlowResult:
+    """
+    Optimal min-cost flow.
+
+    `flow` is per arc in input order. `potentials` are the duals of the
+    conservation rows written "outflow - inflow == supply": every arc with spare
+    capacity has cost - potentials[tail] + potentials[head] >= 0, and every arc
+    carrying flow has it <= 0.
+    """
+
+    def __init__(self, cost, flow, potentials, augmentations):
+        self.cost = cost
+        self.flow = flow
+        self.potentials = potentials
+        self.augmentations = augmentations
+
+    def __repr__(self):
+        return f"MinCostFlowResult(cost={self.cost:g}, augmentations={self.augmentations})"
+
+
+def min_cost_flow(graph, supply):
+    """
+    Min-cost flow by successive shortest paths with Dijkstra on reduced costs.
+
+    Each augmentation sends as much as the path, its source's excess and its
+    sink's deficit allow, so integer supplies and capacities give an integer
+    flow.
+
+    Args:
+        graph (Graph): Capacities and (non-negative) costs on the arcs.
+        supply (array-like): Net supply per node, negative for demand. Must sum
+            to zero; route any surplus to a dummy node with zero-cost arcs.
+
+    Returns:
+        MinCostFlowResult
+
+    Raises:
+        ValueError: If the supplies are unbalanced or a cost is negative.
+        InfeasibleError: If the demand cannot be met.
+    """
+    supply = np.asarray(supply, dtype=float)
+    if supply.shape != (graph.n,):
+        raise ValueError(f"supply must have one entry per node ({graph.n})")
+    if abs(supply.sum()) > EPS * max(1.0, np.abs(supply).sum()):
+        raise ValueError("supply must sum to zero; add a dummy node for the surplus")
+    if graph.n_arcs and graph.cost.min() < 0:
+        raise ValueError("min_cost_flow needs non-negative arc costs")
+
+    res = _Residual(graph)
+    n, head, cap, rcost, edges, indptr = res.n, res.head, res.cap, res.cost, res.edges, res.indptr
+    excess = supply.tolist()
+    # the potential of v is pi[v] + offset, so raising every potential is O(1)
+    pi = [0.0] * n
+    offset = 0.0
+    augmentations = 0
+    next_source = 0
+    while True:
+        while next_source < n and excess[next_source] <= EPS:
+            next_source += 1
+        if next_source == n:
+            break
+        s = next_source
+
+        # Dijkstra from s on reduced costs, stopping at the first node with a
+        # deficit; per-search state lives in dicts so a search costs what it explores
+        dist = {s: 0.0}
+        pred = {}
+        settled = {}
+        heap = [(0.0, s)]
+        t = -1
+        while heap:
+            d, u = heapq.heappop(heap)
+            if u in settled:
+                continue
+            settled[u] = d
+            if excess[u] < -EPS:
+                t = u
+                break
+            pu = pi[u]
+            for k in range(indptr[u], indptr[u + 1]):
+                e = edges[k]
+                if cap[e] <= EPS:
+                    continue
+                v = head[e]
+                if v in settled:
+                    continue
+                nd = d + rcost[e] + pu - pi[v]
+                if nd < dist.get(v, np.inf):
+                    dist[v] = nd
+                    pred[v] = e
+                    heapq.heappush(heap, (nd, v))
+        if t < 0:
+            raise InfeasibleError(f"the supply at node {s} cannot reach any demand")
+
+        # pi += min(dist, dist[t]) keeps every residual reduced cost non-negative
+        T = settled[t]
+        offset += T
+        for v, d in settled.items():
+            pi[v] += d - T
+
+        pushed = min(excess[s], -excess[t])
+        v = t
+        while v != s:
+            e = pred[v]
+            pushed = min(pushed, cap[e])
+            v = head[e ^ 1]
+        v = t
+        while v != s:
+            e = pred[v]
+            cap[e] -= pushed
+            cap[e ^ 1] += pushed
+            v = head[e ^ 1]
+        excess[s] -= pushed
+        excess[t] += pushed
+        augmentations += 1
+
+    flow = res.flow(graph)
+    cost = float(graph.to_input_order(graph.cost) @ flow)
+    potentials = -(np.array(pi) + offset)
+    potentials -= potentials.min() if n else 0.0
+    return MinCostFlowResult(cost, flow, potentials, augmentations)
+
+
+class TransportationResult:
+    """
+    Optimal transportation plan.
+
+    Attributes:
+        cost (float): Total cost.
+        x (np.ndarray): (F, S) shipments from each source to each sink.
+        supply_duals (np.ndarray): (F,) duals of the supply rows (<= 0 for
+            "sum_s x[f, s] <= supply[f]").
+        demand_duals (np.ndarray): (S,) duals of the demand rows (>= 0 for
+            "sum_f x[f, s] >= demand[s]").
+        augmentations (int): Number of shortest-path augmentations.
+    """
+
+    def __init__(self, cost, x, supply_duals, demand_duals, augmentations):
+        self.cost = cost
+        self.x = x
+        self.supply_duals = supply_duals
+        self.demand_duals = demand_duals
+        self.augmentations = augmentations
+
+    def __repr__(self):
+        return f"TransportationResult(cost={self.cost:g}, augmentations={self.augmentations})"
+
+
+def transportation(cost, supply, demand, exact_supply=False):
+    """
+    Transportation problem with few sources and many sinks, by successive
+    shortest paths on a graph compressed to the sources.
+
+    Every residual path into a sink has the form "source f0 takes the sink, f0
+    hands one of its sinks s0 over to f1, f1 hands s1 over to f2, ... until a
+    source with spare supply". Handing sink s from f to g costs
+    cost[g, s] - cost[f, s]. So the residual network shrinks to F nodes with arc
+    weights W[f, g] = min over the sinks s that f serves of that difference. A
+    shortest path is then a Bellman-Ford over an (F, F) matrix, and only the rows
+    of W that lost their cheapest hand-over are recomputed after an augmentation. Sinks are
+    filled one at a time and each augmentation moves the bottleneck amount, so
+    integer data gives integer shipments.
+
+    Args:
+        cost (array-like): (F, S) unit cost from each source to each sink.
+        supply (array-like): (F,) capacity of each source.
+        demand (array-like): (S,) requirement of each sink.
+        exact_supply (bool, optional): Every source ships exactly its supply
+            (needs sum(supply) == sum(demand)). Defaults to False (at most its supply).
+
+    Returns:
+        TransportationResult
+
+    Raises:
+        InfeasibleError: If the demand cannot be met (or, with `exact_supply`,
+            some supply is left over).
+    """
+    cost = np.asarray(cost, dtype=float)
+    spare = np.array(supply, dtype=float)
+    demand = np.asarray(demand, dtype=float)
+    F, S = cost.shape
+    if spare.sum() < demand.sum() - EPS * max(1.0, demand.sum()):
+        raise InfeasibleError("total supply is below total demand")
+    x = np.zeros((F, S))
+    W = np.full((F, F), np.inf)     # W[f, g]: cheapest hand-over of a sink from f to g
+    handover = np.zeros((F, F), dtype=np.int64)
+    everyone = np.arange(F)
+
+    def refresh(f):
+        served = np.flatnonzero(x[f] > EPS)
+        if len(served) == 0:
+            W[f] = np.inf
+            return
+        diff = cost[:, served] - cost[f, served]
+        k = diff.argmin(axis=1)
+        W[f] = diff[everyone, k]
+        W[f, f] = np.inf
+        handover[f] = served[k]
+
+    def serve(f, s):
+        # f starts (or keeps) serving s, which can only make its hand-overs cheaper
+        diff = cost[:, s] - cost[f, s]
+        better = diff < W[f]
+        better[f] = False
+        W[f, better] = diff[better]
+        handover[f, better] = s
+
+    augmentations = 0
+    for j in np.flatnonzero(demand > EPS):
+        need = demand[j]
+        while need > EPS:
+            # Bellman-Ford from sink j over the sources
+            dist = cost[:, j].copy()
+            pred = np.full(F, -1)
+            for _ in range(F):
+                cand = dist[:, None] + W
+                best = cand.min(axis=0)
+                better = best < dist - EPS
+                if not better.any():
+                    break
+                pred[better] = cand.argmin(axis=0)[better]
+                dist[better] = best[better]
+            open_ = spare > EPS
+            if not open_.any():
+                raise InfeasibleError(f"no supply left for sink {j}")
+            end = int(np.flatnonzero(open_)[dist[open_].argmin()])
+
+            # bottleneck along end <- ... <- f0 <- j
+            pushed = min(need, spare[end])
+            steps = []
+            first = end
+            while pred[first] >= 0:
+                f = int(pred[first])
+                s = int(handover[f, first])
+                steps.append((f, first, s))
+                pushed = min(pushed, x[f, s])
+                first = f
+            stale = set()
+            for f, g, s in steps:
+                x[f, s] -= pushed
+                x[g, s] += pushed
+                serve(g, s)
+                if x[f, s] <= EPS and (handover[f] == s).any():
+                    stale.add(f)
+            x[first, j] += pushed
+            serve(first, j)
+            spare[end] -= pushed
+            need -= pushed
+            augmentations += 1
+            for f in stale:
+                refresh(f)
+
+    if exact_supply and (spare > EPS * max(1.0, demand.sum())).any():
+        raise InfeasibleError("exact_supply needs total supply equal to total demand")
+
+    # Duals: D[f] is the cheapest way to free one unit at f (0 where supply is
+    # spare); supply duals are -D and demand duals min_f cost[f, s] + D[f].
+    for f in range(F):
+        refresh(f)
+    targets = spare > EPS
+    D = np.where(targets, 0.0, np.inf) if targets.any() and not exact_supply else np.zeros(F)
+    for _ in range(F):
+        new = np.minimum(D, (W + D[None, :]).min(axis=1))
+        if not (new < D - EPS).any():
+            break
+        D = new
+    if not (targets.any() and not exact_supply):
+        D -= D.min()
+    demand_duals = np.where(demand > EPS, (cost + D[:, None]).min(axis=0), 0.0)
+    # sources with no supply serve nothing and cannot reach spare supply; give
+    # them the smallest dual that keeps their reduced costs non-negative
+    idle = ~np.isfinite(D)
+    D[idle] = np.maximum(0.0, (demand_duals[None, :] - cost[idle]).max(axis=1, initial=0.0))
+    supply_duals = -D
+    return TransportationResult(float((cost * x).sum()), x, supply_duals, demand_duals, augmentations)
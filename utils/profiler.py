@@ -0,0 +1,204 @@
+import cProfile
+import re
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+import polars as pl
+
+from utils.solver_instrumentation import SolveInstrumentor
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+class PipelineProfiler:
+    """
+    Times each stage of an analysis pipeline.
+
+    Every stage records wall time, CPU time and the process peak RSS once it
+    finishes. Stages can be nested, in which case the inner name is prefixed with
+    the outer one ("solve_base/build"). Repeated stages with the same name are
+    summed in the summary.
+
+    Args:
+        output_dir (str, optional):
+            Where cProfile (.prof) and tracemalloc (.snap) dumps are written.
+            Defaults to "profiles".
+        cprofile (bool, optional):
+            Run cProfile over each top-level stage and dump the stats. Defaults to False.
+        trace_memory (bool, optional):
+            Track the Python heap peak per stage with tracemalloc and dump a snapshot
+            at the end of each top-level stage. Slows the pipeline down noticeably.
+            Defaults to False.
+    """
+
+    def __init__(self, output_dir: str = "profiles", cprofile: bool = False, trace_memory: bool = False):
+        self.output_dir = Path(output_dir)
+        self.cprofile = cprofile
+        self.trace_memory = trace_memory
+        self.records = []
+        self._stack = []
+
+        if cprofile or trace_memory:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _dump_name(self, name, suffix):
+        safe = re.sub(r"[^\w.-]+", "_", name)
+        return self.output_dir / f"{len(self.records):03d}_{safe}{suffix}"
+
+    def start(self, name: str):
+        if self._stack:
+            name = f"{self._stack[-1]['name']}/{name}"
+        entry = {
+            "name":     name,
+            "wall":     time.perf_counter(),
+            "cpu":      time.process_time(),
+            "rss":      peak_rss_mb(),
+            "py_peak":  0.0,
+            "profile":  None,
+        }
+
+        if self.trace_memory:
+            if self._stack:
+                parent = self._stack[-1]
+                parent["py_peak"] = max(parent["py_peak"], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+
+        # only one cProfile can be active at a time, so nested stages are covered by their parent
+        if self.cprofile and not self._stack:
+            entry["profile"] = cProfile.Profile()
+            entry["profile"].enable()
+
+        self._stack.append(entry)
+
+    def stop(self):
+        entry = self._stack.pop()
+
+        wall = time.perf_counter() - entry["wall"]
+        cpu = time.process_time() - entry["cpu"]
+        rss = peak_rss_mb()
+
+        if entry["profile"] is not None:
+            entry["profile"].disable()
+            entry["profile"].dump_stats(self._dump_name(entry["name"], ".prof"))
+
+        py_peak = None
+        if self.trace_memory:
+            peak = max(entry["py_peak"], tracemalloc.get_traced_memory()[1])
+            if self._stack:
+                self._stack[-1]["py_peak"] = max(self._stack[-1]["py_peak"], peak)
+            else:
+                tracemalloc.take_snapshot().dump(self._dump_name(entry["name"], ".snap"))
+            py_peak = peak / 2**20
+
+        self.records.append({
+            "stage":         entry["name"],
+            "depth":         len(self._stack),
+            "wall_s":        wall,
+            "cpu_s":         cpu,
+            "peak_rss_mb":   rss,
+            "rss_growth_mb": rss - entry["rss"] if rss is not None else None,
+            "py_peak_mb":    py_peak,
+        })
+
+    @contextmanager
+    def stage(self, name: str):
+        self.start(name)
+        try:
+            yield self
+        finally:
+            self.stop()
+
+    def instrumentor(self, scenario: str, timing_log=None, **kwargs):
+        """
+        A `SolveInstrumentor` whose build/update/solve/write phases also show up as
+        profiler stages, so `super_chip_solve` sub-phases land in the same summary.
+        If `timing_log` is given the instrumentor is registered there as well.
+        """
+        instrumentor = ProfiledInstrumentor(self, scenario, **kwargs)
+        if timing_log is not None:
+            timing_log.records.append(instrumentor)
+        return instrumentor
+
+    def summary(self) -> pl.DataFrame:
+        schema = {
+            "stage":         pl.Utf8,
+            "depth":         pl.Int64,
+            "wall_s":        pl.Float64,
+            "cpu_s":         pl.Float64,
+            "peak_rss_mb":   pl.Float64,
+            "rss_growth_mb": pl.Float64,
+            "py_peak_mb":    pl.Float64,
+        }
+        df = pl.DataFrame(self.records, schema=schema)
+        total = df.filter(pl.col("depth") == 0)["wall_s"].sum() or 1.0
+        return (
+            df.group_by("stage", maintain_order=True)
+            .agg(
+                pl.len().alias("calls"),
+                pl.col("depth").first(),
+                pl.col("wall_s").sum(),
+                pl.col("cpu_s").sum(),
+                pl.col("peak_rss_mb").max(),
+                pl.col("rss_growth_mb").sum(),
+                pl.col("py_peak_mb").max(),
+            )
+            .with_columns((pl.col("wall_s") / total * 100).alias("pct_of_total"))
+            .sort("wall_s", descending=True)
+        )
+
+    def report(self, filename: str = None) -> str:
+        """Ranked text table of the stages, slowest first; optionally written to `filename`."""
+        df = self.summary()
+        lines = [
+            "Pipeline Profile\n",
+            "=" * 96 + "\n",
+            f"{'Stage':44s} | {'Calls':>5s} | {'Wall (s)':>9s} | {'CPU (s)':>9s} | "
+            f"{'% Total':>7s} | {'Peak RSS MB':>11s}\n",
+            "-" * 96 + "\n",
+        ]
+        for row in df.iter_rows(named=True):
+            rss = f"{row['peak_rss_mb']:>11,.1f}" if row["peak_rss_mb"] is not None else f"{'n/a':>11s}"
+            lines.append(
+                f"{row['stage'][:44]:44s} | {row['calls']:>5d} | {row['wall_s']:>9.3f} | "
+                f"{row['cpu_s']:>9.3f} | {row['pct_of_total']:>7.1f} | {rss}\n"
+            )
+        lines.append("=" * 96 + "\n")
+        text = "".join(lines)
+
+        if filename is not None:
+            with open(filename, "w") as f:
+                f.write(text)
+            print(f"Pipeline profile written to {filename}")
+        return text
+
+
+class ProfiledInstrumentor(SolveInstrumentor):
+    """`SolveInstrumentor` that mirrors its phases into a `PipelineProfiler`."""
+
+    def __init__(self, profiler: PipelineProfiler, scenario: str, **kwargs):
+        super().__init__(scenario, **kwargs)
+        self.profiler = profiler
+
+    def start(self, name: str):
+        super().start(name)
+        self.profiler.start(f"super_chip_solve.{name}")
+
+    def stop(self, name: str):
+        self.profiler.stop()
+        super().stop(name)
@@ -0,0 +1,313 @@
+import heapq
+import time
+
+import numpy as np
+
+from utils.distance_matrix import METRICS
+
+
+class CoverageMatrix:
+    """
+    Boolean coverage matrix in compressed sparse row (CSR) form: row i (a
+    demand point) lists the candidate sites j within `max_dist` of it.
+
+    The transpose (the rows each site covers) is kept too, since the greedy
+    heuristic walks it. Build one with `from_distances` or `from_points`
+    instead of the `DISTANCES[i][j] <= MAX_DIST` comprehension of
+    practice_code/setCovering.py.
+
+    Args:
+        n_rows, n_sites (int): Matrix shape.
+        indptr (np.ndarray): (n_rows + 1,) row offsets into `indices`.
+        indices (np.ndarray): Site index of every covered (row, site) pair.
+    """
+
+    def __init__(self, n_rows, n_sites, indptr, indices):
+        self.n_rows = n_rows
+        self.n_sites = n_sites
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        rows = np.repeat(np.arange(n_rows), np.diff(self.indptr))
+        order = np.argsort(self.indices, kind="stable")
+        self.site_indptr = np.zeros(n_sites + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=n_sites), out=self.site_indptr[1:])
+        self.site_rows = rows[order]
+
+    @classmethod
+    def from_distances(cls, distances, max_dist, block_size=4096):
+        """Threshold a dense (rows, sites) distance matrix, `block_size` rows at a time."""
+        distances = np.asarray(distances)
+        n_rows, n_sites = distances.shape
+        counts, indices = [], []
+        for lo in range(0, n_rows, block_size):
+            mask = distances[lo:lo + block_size] <= max_dist
+            counts.append(mask.sum(axis=1))
+            indices.append(np.nonzero(mask)[1])
+        return cls._from_blocks(n_rows, n_sites, counts, indices)
+
+    @classmethod
+    def from_points(cls, points, max_dist, sites=None, metric="euclidean", block_size=512, **kwargs):
+        """
+        Coverage from coordinates without the dense distance matrix: distances
+        are computed and thresholded `block_size` demand points at a time.
+
+        For "euclidean", points and sites are sorted by their first coordinate,
+        and each block is only compared with the sites whose first coordinate is
+        within `max_dist` of the block's range. That turns the all-pairs sweep
+        into a narrow strip per block.
+
+        Args:
+            points (array-like): (N, D) demand point coordinates (latitude /
+                longitude for "haversine").
+            max_dist (float): Coverage radius, `MAX_DIST`.
+            sites (array-like, optional): (M, D) candidate site coordinates.
+                Defaults to `points`, as in setCovering.py.
+            metric (str, optional): "euclidean" or "haversine".
+            block_size (int, optional): Demand points per block. Defaults to 512.
+            **kwargs: Passed on to the metric (e.g. `radius`, `dtype`).
+        """
+        points = np.asarray(points)
+        sites = points if sites is None else np.asarray(sites)
+        dist = METRICS[metric]
+        n_rows = len(points)
+        if metric == "euclidean":
+            row_order = np.argsort(points[:, 0], kind="stable")
+            site_order = np.argsort(sites[:, 0], kind="stable")
+        else:
+            row_order = np.arange(n_rows)
+            site_order = np.arange(len(sites))
+        sorted_sites = sites[site_order]
+        site_x = sorted_sites[:, 0]
+
+        counts, indices = [], []
+        for lo in range(0, n_rows, block_size):
+            block = points[row_order[lo:lo + block_size]]
+            if metric == "euclidean":
+                a = np.searchsorted(site_x, block[:, 0].min() - max_dist, side="left")
+                b = np.searchsorted(site_x, block[:, 0].max() + max_dist, side="right")
+            else:
+                a, b = 0, len(sites)
+            mask = dist(block, sorted_sites[a:b], **kwargs) <= max_dist
+            counts.append(mask.sum(axis=1))
+            indices.append(site_order[a + np.nonzero(mask)[1]])
+        counts = np.concatenate(counts) if counts else np.zeros(0, dtype=np.int64)
+        indices = np.concatenate(indices) if indices else np.zeros(0, dtype=np.int64)
+
+        # rows were processed in `row_order`; put their segments back in input order
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.int64)
+        inverse = np.empty(n_rows, dtype=np.int64)
+        inverse[row_order] = np.arange(n_rows)
+        row_counts = counts[inverse]
+        indptr = np.zeros(n_rows + 1, dtype=np.int64)
+        np.cumsum(row_counts, out=indptr[1:])
+        gather = np.repeat(starts[inverse] - indptr[:-1], row_counts) + np.arange(indptr[-1])
+        return cls(n_rows, len(sites), indptr, indices[gather])
+
+    @classmethod
+    def _from_blocks(cls, n_rows, n_sites, counts, indices):
+        indptr = np.zeros(n_rows + 1, dtype=np.int64)
+        if counts:
+            np.cumsum(np.concatenate(counts), out=indptr[1:])
+        indices = np.concatenate(indices) if indices else np.zeros(0, dtype=np.int64)
+        return cls(n_rows, n_sites, indptr, indices)
+
+    @property
+    def nnz(self):
+        return len(self.indices)
+
+    def row(self, i):
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def rows_of(self, j):
+        return self.site_rows[self.site_indptr[j]:self.site_indptr[j + 1]]
+
+    def uncoverable(self):
+        """Rows that no site covers; any cover is infeasible while these exist."""
+        return np.flatnonzero(np.diff(self.indptr) == 0)
+
+    def covered(self, selected):
+        """Boolean per row: is it covered by a selected site?"""
+        chosen = np.zeros(self.n_sites, dtype=bool)
+        chosen[np.asarray(selected, dtype=np.int64)] = True
+        rows = np.repeat(np.arange(self.n_rows), np.diff(self.indptr))
+        return np.bincount(rows, weights=chosen[self.indices], minlength=self.n_rows) > 0
+
+
+class SetCoverResult:
+    def __init__(self, sites, cost, method, runtime, status=None, bound=None, gap=None):
+        self.sites = sites
+        self.cost = cost
+        self.method = method
+        self.runtime = runtime
+        self.status = status
+        self.bound = bound
+        self.gap = gap
+
+    def __repr__(self):
+        gap = "" if self.gap is None else f", gap={self.gap:.4%}"
+        return (f"SetCoverResult(cost={self.cost:g}, sites={len(self.sites)}, "
+                f"method={self.method!r}{gap}, runtime={self.runtime:.3f}s)")
+
+
+def _drop_redundant(coverage, costs, chosen):
+    """Drop sites whose rows are all covered by other chosen sites, most expensive first."""
+    counts = np.zeros(coverage.n_rows, dtype=np.int64)
+    for j in chosen:
+        counts[coverage.rows_of(j)] += 1
+    keep = []
+    for j in sorted(chosen, key=lambda j: -costs[j]):
+        rows = coverage.rows_of(j)
+        if len(rows) and counts[rows].min() > 1:
+            counts[rows] -= 1
+        elif len(rows):
+            keep.append(j)
+    keep.sort()
+    return keep
+
+
+def greedy_cover(coverage, costs=None):
+    """
+    Greedy set cover with lazy priority-queue updates.
+
+    Sites are ranked by newly covered rows per unit cost. A site's score can
+    only fall as rows get covered, so a popped site is re-scored and taken if
+    it still beats the next entry, and pushed back otherwise. Most sites are
+    never re-scored. Sites made redundant by later picks are then dropped,
+    most expensive first.
+
+    Args:
+        coverage (CoverageMatrix): Rows to cover and the sites covering them.
+        costs (array-like, optional): Cost per site. Defaults to 1 (minimise
+            the number of sites).
+
+    Returns:
+        SetCoverResult
+
+    Raises:
+        ValueError: If some row is covered by no site.
+    """
+    start = time.perf_counter()
+    if len(coverage.uncoverable()):
+        raise ValueError(f"{len(coverage.uncoverable())} rows are not covered by any site")
+    costs = np.ones(coverage.n_sites) if costs is None else np.asarray(costs, dtype=float)
+    covered = np.zeros(coverage.n_rows, dtype=bool)
+    n_left = coverage.n_rows
+    size = np.diff(coverage.site_indptr)
+    heap = [(-size[j] / costs[j], j) for j in np.flatnonzero(size > 0).tolist()]
+    heapq.heapify(heap)
+    chosen = []
+    while n_left and heap:
+        _, j = heapq.heappop(heap)
+        rows = coverage.rows_of(j)
+        gain = int(np.count_nonzero(~covered[rows]))
+        if gain == 0:
+            continue
+        score = -gain / costs[j]
+        if heap and score > heap[0][0]:
+            heapq.heappush(heap, (score, j))
+            continue
+        covered[rows] = True
+        n_left -= gain
+        chosen.append(j)
+
+    keep = _drop_redundant(coverage, costs, chosen)
+    return SetCoverResult(np.array(keep, dtype=np.int64), float(costs[keep].sum()), "greedy",
+                          time.perf_counter() - start)
+
+
+def _cover_model(coverage, costs, env, vtype, time_limit, output_flag):
+    """The covering model, one `>= 1` row per demand point built straight from the CSR rows."""
+    import gurobipy as gp
+    from gurobipy import GRB
+
+    m = gp.Model("set_covering", env=env)
+    m.ModelSense = GRB.MINIMIZE
+    m.Params.OutputFlag = output_flag
+    if time_limit is not None:
+        m.Params.TimeLimit = time_limit
+    x = m.addVars(coverage.n_sites, obj=costs.tolist(), ub=1.0, vtype=vtype, name="x")
+    xs = [x[j] for j in range(coverage.n_sites)]
+    indptr = coverage.indptr.tolist()
+    indices = coverage.indices.tolist()
+    for i in range(coverage.n_rows):
+        cols = indices[indptr[i]:indptr[i + 1]]
+        m.addLConstr(gp.LinExpr([1.0] * len(cols), [xs[j] for j in cols]), GRB.GREATER_EQUAL, 1.0,
+                     name=f"cover[{i}]")
+    return m, xs
+
+
+def set_cover_mip(coverage, costs=None, start=None, env=None, time_limit=None, mip_gap=None,
+                  output_flag=0):
+    """
+    Solve the set-covering IP of practice_code/setCovering.py with Gurobi,
+    warm-started from a heuristic cover.
+
+    Args:
+        coverage (CoverageMatrix): Rows to cover and the sites covering them.
+        costs (array-like, optional): Cost per site. Defaults to 1.
+        start (array-like or SetCoverResult, optional): Incumbent sites given to
+            Gurobi through the `Start` attribute. Defaults to `greedy_cover`.
+            Pass False to start without one.
+        env (gurobipy.Env, optional): Environment to build the model in.
+        time_limit, mip_gap (float, optional): Gurobi TimeLimit and MIPGap.
+        output_flag (int, optional): Gurobi OutputFlag. Defaults to 0.
+
+    Returns:
+        SetCoverResult
+    """
+    from gurobipy import GRB
+
+    t0 = time.perf_counter()
+    if len(coverage.uncoverable()):
+        raise ValueError(f"{len(coverage.uncoverable())} rows are not covered by any site")
+    costs = np.ones(coverage.n_sites) if costs is None else np.asarray(costs, dtype=float)
+    if start is None:
+        start = greedy_cover(coverage, costs)
+    if isinstance(start, SetCoverResult):
+        start = start.sites
+
+    m, xs = _cover_model(coverage, costs, env, GRB.BINARY, time_limit, output_flag)
+    if mip_gap is not None:
+        m.Params.MIPGap = mip_gap
+    if start is not False:
+        values = np.zeros(coverage.n_sites)
+        values[np.asarray(start, dtype=np.int64)] = 1.0
+        m.setAttr("Start", xs, values.tolist())
+    m.optimize()
+
+    if m.SolCount == 0:
+        return SetCoverResult(np.zeros(0, dtype=np.int64), float("inf"), "mip",
+                              time.perf_counter() - t0, m.Status, m.ObjBound, float("inf"))
+    sites = np.flatnonzero(np.array(m.getAttr("X", xs)) > 0.5)
+    return SetCoverResult(sites, m.ObjVal, "mip", time.perf_counter() - t0,
+                          m.Status, m.ObjBound, m.MIPGap)
+
+
+def lp_rounding_cover(coverage, costs=None, env=None, output_flag=0):
+    """
+    Set cover by rounding the LP relaxation.
+
+    A row covered by at most f sites has some LP value of at least 1 / f on
+    one of them, so taking every site with x_j >= 1 / f (f the largest row
+    count) is a cover within a factor f of the LP bound. Redundant sites are
+    then dropped as in `greedy_cover`.
+
+    Returns:
+        SetCoverResult: `bound` is the LP objective.
+    """
+    from gurobipy import GRB
+
+    t0 = time.perf_counter()
+    if len(coverage.uncoverable()):
+        raise ValueError(f"{len(coverage.uncoverable())} rows are not covered by any site")
+    costs = np.ones(coverage.n_sites) if costs is None else np.asarray(costs, dtype=float)
+    m, xs = _cover_model(coverage, costs, env, GRB.CONTINUOUS, None, output_flag)
+    m.optimize()
+    values = np.array(m.getAttr("X", xs))
+    f = int(np.diff(coverage.indptr).max()) if coverage.n_rows else 1
+    chosen = np.flatnonzero(values >= 1.0 / f - 1e-9).tolist()
+    keep = _drop_redundant(coverage, costs, chosen)
+    cost = float(costs[keep].sum())
+    return SetCoverResult(np.array(keep, dtype=np.int64), cost, "lp_rounding",
+                          time.perf_counter() - t0, m.Status, m.ObjVal,
+                          (cost - m.ObjVal) / cost if cost else 0.0)
@@ -0,0 +1,242 @@
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+from gurobipy import GRB
+
+PHASES = ("build", "update", "presolve", "solve", "extraction", "write")
+
+
+class SolveInstrumentor:
+    """
+    Records where the time goes in a single Gurobi solve.
+
+    Attach one instrumentor per solve. Wrap the model-building steps in
+    `phase(...)` blocks and call `optimize(model)` instead of `model.optimize()`
+    so the progress callback is installed. `record()` then returns a flat dict
+    holding the phase timings, presolve reductions, iteration counts and the
+    sampled primal/dual objective trace.
+
+    Args:
+        scenario (str):
+            Label the solve is aggregated under (e.g. "base", "new_tech_3").
+        sample_every (float, optional):
+            Minimum seconds of solver runtime between two progress samples.
+            Simplex calls back once per iteration, so 0 keeps everything.
+            Defaults to 0.01.
+    """
+
+    def __init__(self, scenario: str, sample_every: float = 0.01):
+        self.scenario = scenario
+        self.sample_every = sample_every
+        self.phases = {name: 0.0 for name in PHASES}
+        self.presolve = {
+            "cols_removed":   0,
+            "rows_removed":   0,
+            "senses_changed": 0,
+            "bounds_changed": 0,
+            "coefs_changed":  0,
+        }
+        self.progress = []
+        self.model_stats = {}
+        self._presolve_end = None
+        self._last_sample = None
+        self._started = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        self.start(name)
+        try:
+            yield self
+        finally:
+            self.stop(name)
+
+    def start(self, name: str):
+        self._started[name] = time.perf_counter()
+
+    def stop(self, name: str):
+        elapsed = time.perf_counter() - self._started.pop(name)
+        self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def _sample(self, runtime, kind, itr, primal, dual, primal_inf=None, dual_inf=None):
+        if (self._last_sample is not None
+                and runtime - self._last_sample < self.sample_every):
+            return
+        self._last_sample = runtime
+        self.progress.append({
+            "runtime":    runtime,
+            "kind":       kind,
+            "iterations": itr,
+            "primal_obj": primal,
+            "dual_obj":   dual,
+            "primal_inf": primal_inf,
+            "dual_inf":   dual_inf,
+        })
+
+    def callback(self, model, where):
+        if where == GRB.Callback.PRESOLVE:
+            self.presolve["cols_removed"]   = model.cbGet(GRB.Callback.PRE_COLDEL)
+            self.presolve["rows_removed"]   = model.cbGet(GRB.Callback.PRE_ROWDEL)
+            self.presolve["senses_changed"] = model.cbGet(GRB.Callback.PRE_SENCHG)
+            self.presolve["bounds_changed"] = model.cbGet(GRB.Callback.PRE_BNDCHG)
+            self.presolve["coefs_changed"]  = model.cbGet(GRB.Callback.PRE_COECHG)
+            return
+
+        if where not in (GRB.Callback.SIMPLEX, GRB.Callback.BARRIER, GRB.Callback.MIP):
+            return
+
+        runtime = model.cbGet(GRB.Callback.RUNTIME)
+        if self._presolve_end is None:
+            # first callback past presolve marks the start of the actual solve
+            self._presolve_end = runtime
+
+        if where == GRB.Callback.SIMPLEX:
+            # the simplex objective is primal or dual depending on which side is still infeasible
+            obj = model.cbGet(GRB.Callback.SPX_OBJVAL)
+            self._sample(
+                runtime, "simplex",
+                model.cbGet(GRB.Callback.SPX_ITRCNT),
+                obj, obj,
+                model.cbGet(GRB.Callback.SPX_PRIMINF),
+                model.cbGet(GRB.Callback.SPX_DUALINF),
+            )
+        elif where == GRB.Callback.BARRIER:
+            self._sample(
+                runtime, "barrier",
+                model.cbGet(GRB.Callback.BARRIER_ITRCNT),
+                model.cbGet(GRB.Callback.BARRIER_PRIMOBJ),
+                model.cbGet(GRB.Callback.BARRIER_DUALOBJ),
+                model.cbGet(GRB.Callback.BARRIER_PRIMINF),
+                model.cbGet(GRB.Callback.BARRIER_DUALINF),
+            )
+        else:
+            self._sample(
+                runtime, "mip",
+                model.cbGet(GRB.Callback.MIP_ITRCNT),
+                model.cbGet(GRB.Callback.MIP_OBJBST),
+                model.cbGet(GRB.Callback.MIP_OBJBND),
+            )
+
+    def optimize(self, model):
+        """Optimize `model` with the progress callback, splitting presolve from solve time."""
+        with self.phase("solve"):
+            model.optimize(self.callback)
+
+        presolve = self._presolve_end if self._presolve_end is not None else 0.0
+        presolve = min(presolve, self.phases["solve"])
+        self.phases["presolve"] += presolve
+        self.phases["solve"] -= presolve
+
+        if model.SolCount > 0:
+            self._last_sample = None
+            self._sample(
+                model.Runtime, "final", model.IterCount, model.ObjVal,
+                model.ObjBound if model.IsMIP else model.ObjVal,
+            )
+
+        self.describe(model)
+        return model
+
+    def describe(self, model):
+        """Record the status, objective and size of a solved `model` (or `NetworkSolution`)."""
+        self.model_stats = {
+            "model":         model.ModelName,
+            "status":        model.Status,
+            "objective":     model.ObjVal if model.SolCount > 0 else None,
+            "runtime":       model.Runtime,
+            "simplex_iters": model.IterCount,
+            "barrier_iters": model.BarIterCount,
+            "nodes":         model.NodeCount if model.IsMIP else 0,
+            "num_vars":      model.NumVars,
+            "num_constrs":   model.NumConstrs,
+        }
+
+    def record(self) -> dict:
+        rec = {"scenario": self.scenario, **self.model_stats}
+        rec.update({f"{name}_s": secs for name, secs in self.phases.items()})
+        rec.update({f"presolve_{k}": v for k, v in self.presolve.items()})
+        rec["progress"] = list(self.progress)
+        return rec
+
+
+class NullInstrumentor:
+    """Stand-in used when a solve is not instrumented; every hook is a no-op."""
+
+    def phase(self, name: str):
+        return nullcontext(self)
+
+    def start(self, name: str):
+        pass
+
+    def stop(self, name: str):
+        pass
+
+    def optimize(self, model):
+        model.optimize()
+        return model
+
+    def describe(self, model):
+        pass
+
+
+class TimingLog:
+    """
+    Collects `SolveInstrumentor` records across many solves and writes them
+    out as JSON lines or Parquet, with a per-scenario summary.
+    """
+
+    def __init__(self):
+        self.records = []
+
+    def new(self, scenario: str, **kwargs) -> SolveInstrumentor:
+        instrumentor = SolveInstrumentor(scenario, **kwargs)
+        self.records.append(instrumentor)
+        return instrumentor
+
+    def to_dicts(self, with_progress: bool = True) -> list:
+        rows = []
+        for instrumentor in self.records:
+            rec = instrumentor.record()
+            if not with_progress:
+                rec.pop("progress")
+            rows.append(rec)
+        return rows
+
+    def write_jsonl(self, filename: str, append: bool = True):
+        path = Path(filename)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a" if append else "w") as f:
+            for rec in self.to_dicts():
+                f.write(json.dumps(rec) + "\n")
+        print(f"Solve timings written to {path}")
+
+    def write_parquet(self, filename: str, with_progress: bool = False):
+        import polars as pl
+
+        path = Path(filename)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pl.DataFrame(self.to_dicts(with_progress=with_progress)).write_parquet(path)
+        print(f"Solve timings written to {path}")
+
+    def summary(self) -> "pl.DataFrame":
+        """Phase timings, iterations and presolve reductions summed per scenario."""
+        import polars as pl
+
+        df = pl.DataFrame(self.to_dicts(with_progress=False))
+        if df.is_empty():
+            return df
+        timed = [f"{name}_s" for name in PHASES]
+        counted = ["simplex_iters", "barrier_iters", "nodes"] + [
+            c for c in df.columns if c.startswith("presolve_") and c not in timed
+        ]
+        return (
+            df.group_by("scenario", maintain_order=True)
+            .agg(
+                pl.len().alias("solves"),
+                *(pl.col(c).sum() for c in timed + counted),
+                pl.col("runtime").sum().alias("gurobi_runtime_s"),
+            )
+            .with_columns(pl.sum_horizontal(timed).alias("total_s"))
+            .sort("total_s", descending=True)
+        )
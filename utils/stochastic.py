@@ -0,0 +1,315 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import gurobipy as gp
+import numpy as np
+from gurobipy import GRB, LinExpr, Model
+
+from utils.batch_lp import BatchLP, add_rows
+from utils.super_chip_model import super_chip_arrays
+
+METHODS = ("extensive", "lshaped")
+
+
+def sample_demand(demand, n_scenarios, growth=1.0, scale=0.1, seed=None):
+    """
+    (N, R, C) demand scenarios around `growth * demand`: each entry is scaled by
+    an independent lognormal factor with mean 1 and log-standard deviation `scale`.
+    growth=1.10, scale=0 is the deterministic +10% of question #3.
+    """
+    demand = np.asarray(demand, dtype=float)
+    rng = np.random.default_rng(seed)
+    noise = np.exp(scale * rng.standard_normal((n_scenarios,) + demand.shape) - scale ** 2 / 2)
+    return growth * demand * noise
+
+
+class StochasticProblem:
+    """
+    Two-stage Super Chip plan under N demand scenarios.
+
+    First stage, shared by all scenarios: production p[f, c] at `prod_cost`,
+    within each facility's capacity. Second stage, per scenario n: shipments
+    s[n, f, c, r] out of what was produced, at `shipping_cost`, and unmet
+    demand u[n, r, c] at `shortage_cost` (the recourse). Minimises production
+    cost plus expected recourse cost.
+
+    Args:
+        supply (array-like): (F,) production capacity.
+        prod_cost (array-like): (F, C).
+        shipping_cost (array-like): (F, C, R).
+        scenarios (array-like): (N, R, C) demand, indexed like `demand[r][c]`.
+        probabilities (array-like, optional): (N,) scenario weights. Defaults to uniform.
+        shortage_cost (float | array-like, optional): Per unit of unmet demand,
+            scalar or (R, C). Defaults to 10 times the dearest delivered unit.
+    """
+
+    def __init__(self, supply, prod_cost, shipping_cost, scenarios, probabilities=None,
+                 shortage_cost=None):
+        self.shipping_cost = np.asarray(shipping_cost, dtype=float)
+        F, C, R = self.shipping_cost.shape
+        self.supply = np.broadcast_to(np.asarray(supply, dtype=float), (F,)).copy()
+        self.prod_cost = np.asarray(prod_cost, dtype=float).reshape(F, C)
+        self.scenarios = np.asarray(scenarios, dtype=float)
+        if self.scenarios.shape[1:] != (R, C):
+            raise ValueError(f"scenarios must have shape (N, R, C) = (N, {R}, {C})")
+        N = len(self.scenarios)
+        self.probabilities = (np.full(N, 1.0 / N) if probabilities is None
+                              else np.asarray(probabilities, dtype=float) / np.sum(probabilities))
+        if shortage_cost is None:
+            shortage_cost = 10.0 * (self.prod_cost[:, :, None] + self.shipping_cost).max()
+        self.shortage_cost = np.broadcast_to(np.asarray(shortage_cost, dtype=float), (R, C)).copy()
+
+    @classmethod
+    def from_super_chip(cls, supply, demand, costs, scenarios=None, n_scenarios=100, growth=1.0,
+                        scale=0.1, seed=None, shortage_cost=None):
+        """
+        Problem on the `super_chip_solve` data, with `scenarios` given or drawn
+        by `sample_demand` around `demand[r][c]`.
+        """
+        ship, prod, need = super_chip_arrays(supply, demand, costs)
+        if scenarios is None:
+            scenarios = sample_demand(need, n_scenarios, growth, scale, seed)
+        return cls(supply, prod, ship, scenarios, shortage_cost=shortage_cost)
+
+    @property
+    def shape(self):
+        """(N, F, C, R)."""
+        return (len(self.scenarios),) + self.shipping_cost.shape
+
+    def recourse_costs(self, shipments, shortage):
+        """(N,) second-stage cost of (N, F, C, R) shipments and (N, R, C) shortages."""
+        return (np.einsum("nfcr,fcr->n", shipments, self.shipping_cost)
+                + np.einsum("nrc,rc->n", shortage, self.shortage_cost))
+
+
+class StochasticResult:
+    """
+    First-stage plan and its recourse.
+
+    Attributes:
+        production (np.ndarray): (F, C) production, shared by every scenario.
+        recourse (np.ndarray): (N,) second-stage cost per scenario.
+        shortage (np.ndarray): (N, R, C) unmet demand per scenario.
+        expected_cost (float): Production cost plus expected recourse cost.
+        bound (float): Lower bound on the optimum (equal to `expected_cost` for
+            the extensive form; the last master objective for L-shaped).
+        status (int): Gurobi status; ITERATION_LIMIT when L-shaped stopped at
+            `max_iter` before the gap closed, in which case `expected_cost` is
+            the cost of the best plan found and not a proven optimum.
+        iterations (int): Simplex iterations (extensive) or master rounds (L-shaped).
+    """
+
+    def __init__(self, problem, method, status, production, recourse, shortage, runtime, iterations,
+                 bound=None, cuts=0):
+        self.method = method
+        self.status = status
+        self.production = production
+        self.recourse = recourse
+        self.shortage = shortage
+        self.runtime = runtime
+        self.iterations = iterations
+        self.cuts = cuts
+        self.probabilities = problem.probabilities
+        self.first_stage_cost = float((problem.prod_cost * production).sum())
+        self.expected_cost = (self.first_stage_cost + float(problem.probabilities @ recourse)
+                              if status in (GRB.OPTIMAL, GRB.ITERATION_LIMIT) else float("inf"))
+        self.bound = self.expected_cost if bound is None else bound
+
+    @property
+    def optimal(self):
+        return self.status == GRB.OPTIMAL
+
+    @property
+    def gap(self):
+        """Relative gap between `expected_cost` and `bound`."""
+        if not np.isfinite(self.expected_cost):
+            return float("inf")
+        return (self.expected_cost - self.bound) / max(1.0, abs(self.expected_cost))
+
+    def facility_totals(self):
+        """(F,) units produced per facility."""
+        return self.production.sum(axis=1)
+
+    def shortfall_probability(self):
+        """Probability that some demand goes unmet."""
+        return float(self.probabilities @ (self.shortage.reshape(len(self.shortage), -1).max(axis=1) > 1e-6))
+
+    def __repr__(self):
+        status = "" if self.optimal else f", status={self.status}, gap={self.gap:.2%}"
+        return (f"StochasticResult(method={self.method}, expected_cost={self.expected_cost:g}{status}, "
+                f"scenarios={len(self.recourse)}, runtime={self.runtime:.3f}s)")
+
+
+def _extensive_form(problem, env=None, output_flag=0):
+    """
+    All scenarios in one sparse LP: columns p, then s for every scenario, then
+    u; rows capacity[f], link[n, f, c] (shipped <= produced) and demand[n, r, c].
+    """
+    N, F, C, R = problem.shape
+    m = Model("super_chip_stochastic", env=env)
+    m.modelSense = GRB.MINIMIZE
+    m.setParam("outputFlag", output_flag)
+    p = m.addMVar((F, C), lb=0.0, name="p")
+    s = m.addMVar((N, F, C, R), lb=0.0, name="s")
+    u = m.addMVar((N, R, C), lb=0.0, name="u")
+    p.Obj = problem.prod_cost
+    s.Obj = problem.probabilities[:, None, None, None] * problem.shipping_cost
+    u.Obj = problem.probabilities[:, None, None] * problem.shortage_cost
+    columns = p.reshape(-1).tolist() + s.reshape(-1).tolist() + u.reshape(-1).tolist()
+    n_fc = F * C
+    s0, u0 = n_fc, n_fc + N * n_fc * R
+
+    cap_idx = np.arange(F)[:, None] * C + np.arange(C)
+    add_rows(m, columns, cap_idx, np.ones(cap_idx.shape), GRB.LESS_EQUAL, problem.supply, "capacity")
+
+    nfc = np.arange(N * n_fc)
+    link_idx = np.column_stack([s0 + nfc[:, None] * R + np.arange(R), nfc % n_fc])
+    link_val = np.column_stack([np.ones((N * n_fc, R)), -np.ones(N * n_fc)])
+    add_rows(m, columns, link_idx, link_val, GRB.LESS_EQUAL, np.zeros(N * n_fc), "link")
+
+    n, r, c = np.unravel_index(np.arange(N * R * C), (N, R, C))
+    dem_idx = np.column_stack([s0 + (((n[:, None] * F + np.arange(F)) * C + c[:, None]) * R + r[:, None]),
+                               u0 + np.arange(N * R * C)])
+    add_rows(m, columns, dem_idx, np.ones(dem_idx.shape), GRB.GREATER_EQUAL,
+             problem.scenarios.ravel(), "demand")
+    return m, p, s, u
+
+
+def _recourse_template(problem, env=None):
+    """
+    One scenario's second stage as a `BatchLP`: rhs data is the produced amounts
+    p[f, c] (link rows) followed by the demand d[r, c].
+    """
+    _, F, C, R = problem.shape
+    m = Model("super_chip_recourse", env=env)
+    m.modelSense = GRB.MINIMIZE
+    s = m.addMVar((F, C, R), lb=0.0, name="s")
+    u = m.addMVar((R, C), lb=0.0, name="u")
+    s.Obj = problem.shipping_cost
+    u.Obj = problem.shortage_cost
+    columns = s.reshape(-1).tolist() + u.reshape(-1).tolist()
+    n_fc = F * C
+    link_idx = np.arange(n_fc)[:, None] * R + np.arange(R)
+    link = add_rows(m, columns, link_idx, np.ones(link_idx.shape), GRB.LESS_EQUAL, np.zeros(n_fc), "link")
+    r, c = np.unravel_index(np.arange(R * C), (R, C))
+    dem_idx = np.column_stack([((np.arange(F) * C + c[:, None]) * R + r[:, None]), n_fc * R + np.arange(R * C)])
+    demand = add_rows(m, columns, dem_idx, np.ones(dem_idx.shape), GRB.GREATER_EQUAL, np.zeros(R * C), "demand")
+    return BatchLP(m, columns, link + demand)
+
+
+def stochastic_extensive(problem, env=None, output_flag=0):
+    """Solve the two-stage problem as one extensive-form LP."""
+    start = time.perf_counter()
+    N, F, C, R = problem.shape
+    m, p, s, u = _extensive_form(problem, env, output_flag)
+    m.optimize()
+    if m.Status != GRB.OPTIMAL:
+        return StochasticResult(problem, "extensive", m.Status, np.zeros((F, C)), np.zeros(N),
+                                np.zeros((N, R, C)), time.perf_counter() - start, int(m.IterCount))
+    shortage = u.X
+    recourse = problem.recourse_costs(s.X, shortage)
+    return StochasticResult(problem, "extensive", m.Status, p.X, recourse, shortage,
+                            time.perf_counter() - start, int(m.IterCount))
+
+
+def stochastic_lshaped(problem, workers=1, tol=1e-6, max_iter=200, env=None, output_flag=0):
+    """
+    Solve the two-stage problem by the multi-cut L-shaped method.
+
+    The master LP holds production and one recourse estimate theta[n] per
+    scenario. Each round, every scenario's recourse LP is re-solved at the
+    master's production plan through a warm `BatchLP`, spread over `workers`
+    threads, each with its own Gurobi environment. The Pi of the link and
+    demand rows gives the cut theta[n] >= Pi_d . d[n] + Pi_link . p for every
+    scenario whose estimate is too low. Unmet demand is always allowed, so the
+    recourse is feasible for any plan and no feasibility cuts are needed.
+    Recourse costs are assumed non-negative (theta >= 0). If the gap is still
+    open after `max_iter` rounds, the best plan so far is returned with status
+    ITERATION_LIMIT.
+
+    Args:
+        problem (StochasticProblem)
+        workers (int, optional): Threads solving scenario LPs. Defaults to 1.
+        tol (float, optional): Relative gap to stop at. Defaults to 1e-6.
+        max_iter (int, optional): Master rounds. Defaults to 200.
+        env (gurobipy.Env, optional): Environment for the master (and the
+            scenario LPs when `workers` is 1).
+
+    Returns:
+        StochasticResult
+    """
+    start = time.perf_counter()
+    N, F, C, R = problem.shape
+    master = Model("super_chip_lshaped", env=env)
+    master.modelSense = GRB.MINIMIZE
+    master.setParam("outputFlag", output_flag)
+    p = master.addMVar((F, C), lb=0.0, name="p")
+    theta = master.addMVar(N, lb=0.0, name="theta")
+    p.Obj = problem.prod_cost
+    theta.Obj = problem.probabilities
+    p_vars = p.reshape(-1).tolist()
+    theta_vars = theta.tolist()
+    for f in range(F):
+        master.addLConstr(LinExpr([1.0] * C, p_vars[f * C:(f + 1) * C]), GRB.LESS_EQUAL,
+                          float(problem.supply[f]), name=f"capacity[{f}]")
+
+    workers = max(1, min(workers, N))
+    envs = [env] if workers == 1 else [gp.Env(params={"OutputFlag": 0}) for _ in range(workers)]
+    templates = [_recourse_template(problem, e) for e in envs]
+    chunks = np.array_split(np.arange(N), workers)
+    demand_rhs = problem.scenarios.reshape(N, -1)
+    n_fc = F * C
+
+    best = None
+    cuts = rounds = 0
+    status = GRB.OPTIMAL
+    converged = False
+    bound = -np.inf
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while rounds < max_iter:
+                rounds += 1
+                master.optimize()
+                if master.Status != GRB.OPTIMAL:
+                    status = master.Status
+                    break
+                bound = master.ObjVal
+                plan = p.X
+                estimate = theta.X
+                rhs = np.hstack([np.tile(plan.ravel(), (N, 1)), demand_rhs])
+                parts = list(pool.map(lambda k: templates[k].solve(rhs=rhs[chunks[k]]), range(workers)))
+                Q = np.concatenate([r.objective for r in parts])
+                pi = np.vstack([r.duals for r in parts])
+                x = np.vstack([r.x for r in parts])
+                upper = float((problem.prod_cost * plan).sum() + problem.probabilities @ Q)
+                if best is None or upper < best[0]:
+                    best = (upper, plan, Q, x[:, n_fc * R:].reshape(N, R, C))
+                if best[0] - bound <= tol * max(1.0, abs(best[0])):
+                    converged = True
+                    break
+                for n in np.flatnonzero(estimate < Q - tol * np.maximum(1.0, np.abs(Q))).tolist():
+                    coef = (-pi[n, :n_fc]).tolist()
+                    master.addLConstr(LinExpr([1.0] + coef, [theta_vars[n]] + p_vars), GRB.GREATER_EQUAL,
+                                      float(pi[n, n_fc:] @ demand_rhs[n]), name=f"cut[{cuts}]")
+                    cuts += 1
+    finally:
+        if workers > 1:
+            for e in envs:
+                e.dispose()
+    if status == GRB.OPTIMAL and not converged:
+        status = GRB.ITERATION_LIMIT
+    if best is None:
+        return StochasticResult(problem, "lshaped", status, np.zeros((F, C)), np.zeros(N),
+                                np.zeros((N, R, C)), time.perf_counter() - start, rounds, cuts=cuts)
+    _, plan, Q, shortage = best
+    return StochasticResult(problem, "lshaped", status, plan, Q, shortage, time.perf_counter() - start,
+                            rounds, bound=bound, cuts=cuts)
+
+
+def stochastic_solve(problem, method="extensive", **kwargs):
+    """Dispatch to `stochastic_extensive` or `stochastic_lshaped` (see METHODS)."""
+    if method == "extensive":
+        return stochastic_extensive(problem, **kwargs)
+    if method == "lshaped":
+        return stochastic_lshaped(problem, **kwargs)
+    raise ValueError(f"unknown method {method!r}, expected one of {METHODS}")
@@ -0,0 +1,147 @@
+import numpy as np
+
+
+def cycles_from_successors(succ):
+    """
+    Split a successor array into its cycles in O(N).
+
+    Args:
+        succ (np.ndarray): succ[i] is the stop visited after i, or -1 if i has no
+            selected outgoing arc (fractional or partial solutions).
+
+    Returns:
+        List[List[int]]: the cycles (or open paths, when succ has gaps), shortest first.
+    """
+    succ = np.asarray(succ)
+    n = len(succ)
+    visited = np.zeros(n, dtype=bool)
+    cycles = []
+    for start in range(n):
+        if visited[start]:
+            continue
+        cycle = []
+        node = start
+        while node >= 0 and not visited[node]:
+            visited[node] = True
+            cycle.append(int(node))
+            node = succ[node]
+        cycles.append(cycle)
+    cycles.sort(key=len)
+    return cycles
+
+
+def cycles_from_neighbours(nbr):
+    """
+    Split the (N, 2) neighbour array of an undirected 2-regular edge set into its
+    cycles in O(N). Missing neighbours are -1, in which case open paths are
+    returned as well.
+    """
+    nbr = np.asarray(nbr)
+    n = len(nbr)
+    visited = np.zeros(n, dtype=bool)
+    cycles = []
+    for start in range(n):
+        if visited[start]:
+            continue
+        cycle = []
+        prev, node = -1, start
+        while node >= 0 and not visited[node]:
+            visited[node] = True
+            cycle.append(int(node))
+            a, b = nbr[node]
+            prev, node = node, (b if a == prev else a)
+        cycles.append(cycle)
+    cycles.sort(key=len)
+    return cycles
+
+
+class SubtourFinder:
+    """
+    Finds subtours of a TSP arc solution without per-variable attribute calls.
+
+    The arc variables are kept as one flat list with parallel head/tail index
+    arrays, so a solution is read with a single `getAttr("X", ...)` (iterative
+    re-solve loops) or `cbGetSolution(...)` (lazy-constraint callbacks) into a
+    NumPy array. The successor array is then built with one vectorised
+    assignment and split into cycles in O(N). That replaces the
+    `remaining.pop(0)` / `remaining.remove(dest)` scan of `findLoops`, which reads
+    one `x[city, dest].x` at a time.
+
+    With `directed=False` the variables are undirected edges {i, j} of the
+    symmetric formulation, and cycles are walked over an (N, 2) neighbour array
+    instead.
+
+    Args:
+        n (int): Number of stops.
+        arc_i, arc_j (array-like): Tail and head stop of each arc variable.
+        variables (List[gurobipy.Var]): The arc variables, in the same order.
+        threshold (float, optional): Value above which an arc counts as selected.
+            Defaults to 0.5.
+        directed (bool, optional): Whether the variables are arcs (i -> j) or
+            edges {i, j}. Defaults to True.
+    """
+
+    def __init__(self, n, arc_i, arc_j, variables, threshold=0.5, directed=True):
+        self.n = n
+        self.arc_i = np.asarray(arc_i, dtype=np.int64)
+        self.arc_j = np.asarray(arc_j, dtype=np.int64)
+        self.variables = list(variables)
+        self.threshold = threshold
+        self.directed = directed
+
+    @classmethod
+    def from_vars(cls, x, n, threshold=0.5, directed=True):
+        """
+        Wrap an `x[i, j]` dict / tupledict of arc variables, as built by `TSPSolve`
+        in practice_code/TSP.py (diagonal entries, if present, are skipped).
+        """
+        keys = [(i, j) for (i, j) in x.keys() if i != j]
+        arc_i = [i for i, _ in keys]
+        arc_j = [j for _, j in keys]
+        return cls(n, arc_i, arc_j, [x[k] for k in keys], threshold, directed)
+
+    def successors(self, values):
+        values = np.asarray(values, dtype=float)
+        selected = values > self.threshold
+        succ = np.full(self.n, -1, dtype=np.int64)
+        succ[self.arc_i[selected]] = self.arc_j[selected]
+        return succ
+
+    def neighbours(self, values):
+        """(N, 2) neighbour array of the selected edges; -1 where a stop has fewer than two."""
+        values = np.asarray(values, dtype=float)
+        selected = values > self.threshold
+        ends = np.concatenate([self.arc_i[selected], self.arc_j[selected]])
+        other = np.concatenate([self.arc_j[selected], self.arc_i[selected]])
+        order = np.argsort(ends, kind="stable")
+        ends, other = ends[order], other[order]
+        # position of each entry within its stop's run of the sorted array
+        slot = np.arange(len(ends)) - np.searchsorted(ends, ends, side="left")
+        keep = slot < 2
+        nbr = np.full((self.n, 2), -1, dtype=np.int64)
+        nbr[ends[keep], slot[keep]] = other[keep]
+        return nbr
+
+    def tour_values(self, tour):
+        """0/1 vector aligned with `variables` that selects the arcs (or edges) of `tour`."""
+        tour = np.asarray(tour, dtype=np.int64)
+        succ = np.full(self.n, -1, dtype=np.int64)
+        succ[tour] = np.roll(tour, -1)
+        selected = succ[self.arc_i] == self.arc_j
+        if not self.directed:
+            selected |= succ[self.arc_j] == self.arc_i
+        return selected.astype(float)
+
+    def from_values(self, values):
+        """Cycles for a solution vector aligned with `variables`."""
+        if self.directed:
+            return cycles_from_successors(self.successors(values))
+        return cycles_from_neighbours(self.neighbours(values))
+
+    def from_model(self, model):
+        """Cycles of the current solution of `model`, for iterative re-solve loops."""
+        return self.from_values(model.getAttr("X", self.variables))
+
+    def from_callback(self, model):
+        """Cycles of the incumbent candidate inside a MIPSOL callback."""
+        return self.from_values(model.cbGetSolution(self.variables))
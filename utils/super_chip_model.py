@@ -0,0 +1,390 @@
+import time
+
+import numpy as np
+from gurobipy import GRB, Model, quicksum
+
+from utils.network_flow import InfeasibleError, transportation
+from utils.solver_instrumentation import NullInstrumentor
+
+ENGINES = ("gurobi", "network")
+
+
+def super_chip_arrays(supply, demand, costs):
+    """
+    The nested `super_chip_solve` inputs as dense arrays.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: shipping_cost (F, C, R),
+        prod_cost (F, C) and demand (R, C).
+    """
+    shipping_cost, prod_cost = costs
+    F, C, R = len(supply), len(prod_cost[0]), len(demand)
+    ship = np.array([[[shipping_cost[f][c][r] for r in range(R)] for c in range(C)] for f in range(F)],
+                    dtype=float)
+    prod = np.array([[prod_cost[f][c] for c in range(C)] for f in range(F)], dtype=float)
+    need = np.array([[demand[r][c] for c in range(C)] for r in range(R)], dtype=float)
+    return ship, prod, need
+
+
+def super_chip_solve(supply, demand, costs, model_name, case="alternative", extra_capacity=None,
+                     instrumentor=None, output_dir="models_and_solutions", env=None,
+                     engine="gurobi"):
+    """
+    Build and solve the Super Chip production-shipment optimization model.
+
+    This function constructs a Gurobi model that minimizes the combined
+    production and shipping costs of delivering multiple chip types from
+    a set of facilities in Virginia to various sales regions across the U.S. 
+    Two constraint schemes are explored:
+      - "base": enforces production proportional to each facility's capacity. The original scheme. 
+      - "alternative": allows flexible production up to each facility's capacity. My reco.
+
+    Optionally, extra capacity can be added to each facility before solving to explore various scenarios.
+
+    The resulting model and solution files (.lp and .sol) are written to
+    'models_and_solutions/' unless `output_dir` is None. The number of facilities,
+    chips and regions is taken from the shape of the data.
+
+    Args:
+        supply (List[float]):
+            Available production capacity for each facility.
+        demand (Mapping[int, Mapping[int, float]]):
+            Nested mapping of demand[r][c] giving the required units of
+            chip type 'c' in region 'r'.
+        costs (List):
+            Two-element List '(shipping_cost, prod_cost)' where:
+              - shipping_cost[f][c][r]: cost to ship one unit of chip 'c' from
+                facility 'f' to region 'r'.
+              - prod_cost[f][c]: cost to produce one unit of chip 'c' at
+                facility 'f'.
+        model_name (str):
+            Identifier used as the Gurobi model name and to name output files.
+        case (str, optional):
+            Constraint scheme, either "base" or "alternative".
+            Defaults to "alternative".
+        extra_capacity (List[float], optional):
+            Additional capacity to add to each facility prior to optimization.
+            If None, no extra capacity is applied. Defaults to None.
+        instrumentor (SolveInstrumentor, optional):
+            When given, the build/update/presolve/solve/write phases are timed and
+            solver progress is recorded through a Gurobi callback. Defaults to None.
+        output_dir (str, optional):
+            Directory the .lp and .sol files are written to, or None to skip writing.
+            Defaults to "models_and_solutions".
+        env (gurobipy.Env, optional):
+            Environment to build the model in, so long-running callers can reuse one.
+            Defaults to None (the default environment).
+        engine (str, optional):
+            "gurobi" builds and solves the LP. "network" solves the same problem as
+            a min-cost flow, see `super_chip_network_solve`. Defaults to "gurobi".
+
+    Returns:
+        gurobipy.Model:
+            The solved Gurobi model instance (a `NetworkSolution` for the
+            "network" engine)
+
+    Raises:
+        ValueError:
+            If an unrecognized `case` or `engine` is provided.
+    """
+    if instrumentor is None:
+        instrumentor = NullInstrumentor()
+    if engine == "network":
+        return super_chip_network_solve(supply, demand, costs, model_name, case, extra_capacity,
+                                        instrumentor, output_dir)
+    if engine != "gurobi":
+        raise ValueError(f"unknown engine {engine!r}, expected one of {ENGINES}")
+
+    instrumentor.start("build")
+    m = Model(model_name, env=env)
+    m.modelSense = GRB.MINIMIZE
+    m.setParam('outputFlag', 0)
+
+    shipping_cost, prod_cost = costs
+    n_suppliers = len(supply)
+    n_chips = len(prod_cost[0])
+    n_regions = len(demand)
+
+    # For calculating adding extra capacity per facility 
+    if extra_capacity is None:
+        extra_capacity = [0] * n_suppliers
+
+    effective_supply = [
+        supply[f] + extra_capacity[f]
+        for f in range(n_suppliers)
+    ]
+
+    x = {}
+    """ 
+    ___Decision variables___
+    x_f_c_r - number of units of chip type c produced and shipped from facility f to region r
+
+    Where
+        f is the facility 
+        c is the chip type
+        r is the region
+    """
+    for f in range(n_suppliers):
+        for c in range(n_chips):
+            for r in range(n_regions):
+                x[f, c, r] = m.addVar(lb=0, vtype=GRB.CONTINUOUS, name=f"x_{f+1}_{c+1}_{r+1}")
+    
+    """ 
+    ___Objective Function___ 
+    Minimize the total cost of operations for Super Chip company by minimizing 
+    production and shipping costs of 30 different chip products to 23 different regions from 
+    5 different facilities. 
+
+    Where 
+        shipping_cost[f][c][r] is the shipping cost f_c_r -> shipping_cost_f_c_r
+        prod_cost[f][c] is the Production cost f_c -> shipping_cost_f_c
+
+    Example
+        For prod_cost[0][0] + shipping_cost[0][0][0] = 59.79 + 1.76 = 61.55
+        We have (61.55 * x_1_1_1) then we sum for all 
+    """
+    m.setObjective(
+        quicksum(
+            (prod_cost[f][c] + shipping_cost[f][c][r]) 
+            * x[f, c, r]
+            for f in range(n_suppliers)
+            for c in range(n_chips)
+            for r in range(n_regions)
+        )
+    )
+
+    """ 
+    ___Base Case Constraints___ 
+    The base case repersents each facility producing each of the 30 types of chips at levels that are proportional to 
+    the facility's total portion of production capacity. See the Suppply constraint.
+    """
+    if case == "base":
+        #################################################################
+        # Setup for base case - supply constraint proportionality
+        #################################################################
+        total_supply = sum(supply)
+        facility_capacity_proportions = [cap_f / total_supply for cap_f in supply]
+
+        # Total demand per chip across all regions
+        total_demand_by_chip = {
+            c: sum(demand[r][c] for r in range(n_regions))
+            for c in range(n_chips)
+        }
+        total_demand_for_chips = sum(total_demand_by_chip.values())
+        print(total_demand_for_chips)
+        
+        """ 
+        ___Supply Constraint___ 
+        Binding constraint is added here to ensure that production levels are proportional to the facility's total proportion of 
+        production capacity. Here total_demand_for_chips is the sum of all demand for all chips for each region. 
+
+        Example
+            For facility_capacity_proportions[0] * total_demand_for_chips
+            .2533 * 1038.97 == 263.15 
+        """
+        for f in range(n_suppliers):
+            m.addConstr(
+                quicksum(
+                    x[f, c, r]
+                    for c in range(n_chips)
+                    for r in range(n_regions)
+                )
+                == facility_capacity_proportions[f] * total_demand_for_chips,
+                name=f"supply_f{f+1}"
+            )
+        """ 
+        ___Demand Constraint___ 
+        The available supply must meet the following demands based on region and chip type. 
+        EX: for r,c,r --> demand_rx_cx: sum(x_f_c_r) >= demand_for_r_c
+        demand_r1_c2: x_1_2_1 + x_2_2_1 + x_3_2_1 + x_4_2_1 + x_5_2_1 >= 2.387
+        """
+        for c in range(n_chips):
+            for r in range(n_regions):
+                m.addConstr(
+                    quicksum(x[f, c, r] for f in range(n_suppliers))
+                    >= demand[r][c],
+                    name=f"demand_r{r+1}_c{c+1}"
+                )
+        """ 
+        ___Alternative Case Constraints___ 
+        The alternative case foregoes the proportional production capacities and instead allows the solver to decide 
+        which facility should produce how much while ensuring the following constraints are met.
+        """
+    elif case == "alternative":
+        """ 
+        ___Supply Constraint___ 
+        For each facility f and chip type c the total units shipped to each region shall not exceed the capacity of 
+        what the facility can produce. Supply[f] is the supply available for facility f. 
+        """
+        for f in range(n_suppliers):
+            m.addConstr(
+                quicksum(
+                    x[f, c, r]
+                    for c in range(n_chips)
+                    for r in range(n_regions)
+                )
+                <= effective_supply[f],
+                name=f"supply_f{f+1}"
+            )
+        
+        """ 
+        ___Demand Constraint___ 
+        The available supply must meet the following demands based on region and chip type. 
+        EX: for r,c,r --> demand_rx_cx: sum(x_f_c_r) >= demand_for_r_c
+        demand_r1_c2: x_1_2_1 + x_2_2_1 + x_3_2_1 + x_4_2_1 + x_5_2_1 >= 2.387
+        """
+        for c in range(n_chips):
+            for r in range(n_regions):
+                m.addConstr(
+                    quicksum(x[f,c,r] for f in range(n_suppliers))
+                    >= demand[r][c],
+                    name=f"demand_r{r+1}_c{c+1}"
+                )
+    else:
+        # for testing
+        print("Testing....")
+    instrumentor.stop("build")
+
+    with instrumentor.phase("update"):
+        m.update()
+    instrumentor.optimize(m)
+    if output_dir is not None:
+        with instrumentor.phase("write"):
+            m.write(f"{output_dir}/super_chip_{model_name}.lp")
+            m.write(f"{output_dir}/super_chip_{model_name}.sol")
+
+    return(m)
+
+
+class NetworkSolution:
+    """
+    Result of the "network" engine, with the Model attributes the callers of
+    `super_chip_solve` and `SolveInstrumentor.describe` read. IterCount counts
+    shortest-path augmentations, and NumVars / NumConstrs are the shipping lanes
+    and supply / demand rows of the network.
+
+    Attributes:
+        x (np.ndarray): (F, C, R) units of chip c shipped from facility f to region r.
+        supply_duals (np.ndarray): (F,) Pi of the supply_f constraints.
+        demand_duals (np.ndarray): (R, C) Pi of the demand_r_c constraints.
+    """
+
+    IsMIP = 0
+    BarIterCount = 0
+    NodeCount = 0
+
+    def __init__(self, model_name, status, objective=None, x=None, supply_duals=None,
+                 demand_duals=None, runtime=0.0, iterations=0, num_vars=0, num_constrs=0):
+        self.ModelName = model_name
+        self.Status = status
+        self.SolCount = int(status == GRB.OPTIMAL)
+        self.ObjVal = objective
+        self.Runtime = runtime
+        self.IterCount = iterations
+        self.NumVars = num_vars
+        self.NumConstrs = num_constrs
+        self.x = x
+        self.supply_duals = supply_duals
+        self.demand_duals = demand_duals
+
+    def write(self, filename):
+        """Write the flows in Gurobi's .sol format, with the LP's variable names."""
+        with open(filename, "w") as fh:
+            fh.write(f"# Objective value = {self.ObjVal}\n")
+            for (f, c, r), units in np.ndenumerate(self.x):
+                fh.write(f"x_{f+1}_{c+1}_{r+1} {units}\n")
+
+
+def network_sink_solve(model_name, capacity, cost, need, case="alternative", instrumentor=None):
+    """
+    The "network" engine on sparse arrays: facility f supplies `capacity[f]`
+    and sink s (a (chip, region) pair) needs `need[s]` at unit cost
+    `cost[f, s]`. In the base case each facility ships exactly its
+    proportional share of the total demand.
+
+    Args:
+        model_name (str): Name reported by the solution.
+        capacity (array-like): (F,) facility capacity.
+        cost (array-like): (F, S) production + shipping cost per sink.
+        need (array-like): (S,) demand per sink.
+        case (str, optional): "base" or "alternative". Defaults to "alternative".
+        instrumentor (SolveInstrumentor, optional): Times the solve and describes the result.
+
+    Returns:
+        NetworkSolution: x is (F, S) and demand_duals (S,); Status is
+        GRB.INFEASIBLE when demand cannot be met.
+    """
+    if instrumentor is None:
+        instrumentor = NullInstrumentor()
+    if case not in ("base", "alternative"):
+        raise ValueError(f"unknown case {case!r}")
+    cost = np.asarray(cost, dtype=float)
+    need = np.asarray(need, dtype=float)
+    capacity = np.asarray(capacity, dtype=float)
+    if case == "base":
+        capacity = capacity / capacity.sum() * need.sum()
+
+    start = time.perf_counter()
+    with instrumentor.phase("solve"):
+        try:
+            plan = transportation(cost, capacity, need, exact_supply=case == "base")
+        except InfeasibleError:
+            plan = None
+    runtime = time.perf_counter() - start
+
+    F = len(cost)
+    sinks = int((need > 0).sum())
+    size = {"runtime": runtime, "num_vars": F * sinks, "num_constrs": F + sinks}
+    if plan is None:
+        solution = NetworkSolution(model_name, GRB.INFEASIBLE, **size)
+    else:
+        solution = NetworkSolution(model_name, GRB.OPTIMAL, plan.cost, plan.x, plan.supply_duals,
+                                   plan.demand_duals, iterations=plan.augmentations, **size)
+    instrumentor.describe(solution)
+    return solution
+
+
+def super_chip_network_solve(supply, demand, costs, model_name, case="alternative",
+                             extra_capacity=None, instrumentor=None,
+                             output_dir="models_and_solutions"):
+    """
+    Solve the Super Chip model as a network flow instead of a general LP.
+
+    Chip types only interact through the facility capacities, so the whole model
+    is one transportation problem. Facility f supplies its capacity, each
+    (chip, region) pair with positive demand is a sink, and shipping to it costs
+    prod_cost[f][c] + shipping_cost[f][c][r]. In the base case each facility
+    ships exactly its proportional share of the total demand. The problem is
+    solved by `network_sink_solve` with `utils.network_flow.transportation`, a
+    successive-shortest-path method over the few facilities. It keeps the
+    shipments integral for integer data and yields the LP's supply and demand duals.
+
+    Arguments as for `super_chip_solve`.
+
+    Returns:
+        NetworkSolution: Status is GRB.INFEASIBLE when demand cannot be met.
+    """
+    if instrumentor is None:
+        instrumentor = NullInstrumentor()
+    if case not in ("base", "alternative"):
+        raise ValueError(f"unknown case {case!r}")
+
+    instrumentor.start("build")
+    ship, prod, need = super_chip_arrays(supply, demand, costs)
+    F, C, R = ship.shape
+    unit_cost = prod[:, :, None] + ship
+    capacity = np.asarray(supply, dtype=float)
+    if case == "alternative" and extra_capacity is not None:
+        capacity = capacity + np.asarray(extra_capacity, dtype=float)
+    instrumentor.stop("build")
+
+    solution = network_sink_solve(model_name, capacity, unit_cost.reshape(F, C * R), need.T.ravel(), case,
+                                  instrumentor)
+    if solution.SolCount > 0:
+        solution.x = solution.x.reshape(F, C, R)
+        solution.demand_duals = solution.demand_duals.reshape(C, R).T
+
+    if output_dir is not None and solution.SolCount > 0:
+        with instrumentor.phase("write"):
+            solution.write(f"{output_dir}/super_chip_{model_name}.sol")
+    return solution
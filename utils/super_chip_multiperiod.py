@@ -0,0 +1,238 @@
+import time
+
+import numpy as np
+from gurobipy import GRB, LinExpr, Model
+
+from utils.batch_lp import add_rows
+from utils.super_chip_model import super_chip_arrays
+
+
+class MultiPeriodData:
+    """
+    Time-indexed Super Chip data as dense arrays over T periods, F facilities,
+    C chips and R regions.
+
+    Costs may be given once for all periods or per period; they are broadcast
+    to the shapes below.
+
+    Args:
+        capacity (array-like): (T, F) production capacity per period, or (F,).
+        demand (array-like): (T, R, C) demand per period, indexed like `demand[r][c]`.
+        shipping_cost (array-like): (F, C, R) or (T, F, C, R).
+        prod_cost (array-like): (F, C) or (T, F, C).
+        holding_cost (array-like, optional): Cost of carrying one unit of chip c
+            at facility f into the next period; scalar, (F, C) or (T, F, C).
+            Defaults to 0.
+        initial_inventory (array-like, optional): (F, C) stock before the first
+            period. Defaults to 0.
+    """
+
+    def __init__(self, capacity, demand, shipping_cost, prod_cost, holding_cost=0.0,
+                 initial_inventory=0.0):
+        self.demand = np.asarray(demand, dtype=float)
+        T, R, C = self.demand.shape
+        prod_cost = np.asarray(prod_cost, dtype=float)
+        F = prod_cost.shape[-2]
+        self.capacity = np.broadcast_to(np.asarray(capacity, dtype=float), (T, F)).copy()
+        self.prod_cost = np.broadcast_to(prod_cost, (T, F, C)).copy()
+        self.shipping_cost = np.broadcast_to(np.asarray(shipping_cost, dtype=float), (T, F, C, R)).copy()
+        self.holding_cost = np.broadcast_to(np.asarray(holding_cost, dtype=float), (T, F, C)).copy()
+        self.initial_inventory = np.broadcast_to(np.asarray(initial_inventory, dtype=float), (F, C)).copy()
+
+    @classmethod
+    def from_annual(cls, supply, demand, costs, periods=52, growth=1.0, holding_cost=0.0):
+        """
+        Spread the one-year data `super_chip_solve` takes over `periods` equal
+        periods. Demand ramps linearly so the last period is `growth` times the
+        first, at the same annual total times (1 + growth) / 2, so growth=1.10
+        is the 10% demand increase reached gradually over the year.
+        """
+        ship, prod, need = super_chip_arrays(supply, demand, costs)
+        ramp = np.linspace(1.0, growth, periods) / periods
+        capacity = np.tile(np.asarray(supply, dtype=float) / periods, (periods, 1))
+        return cls(capacity, ramp[:, None, None] * need, ship, prod, holding_cost)
+
+    @property
+    def shape(self):
+        """(T, F, C, R)."""
+        return self.shipping_cost.shape
+
+    def window(self, start, length):
+        """Periods start .. start + length - 1, padded with idle periods (no demand, capacity or cost)."""
+        def take(a):
+            out = np.zeros((length,) + a.shape[1:])
+            part = a[start:start + length]
+            out[:len(part)] = part
+            return out
+        data = MultiPeriodData.__new__(MultiPeriodData)
+        for name in ("capacity", "demand", "prod_cost", "shipping_cost", "holding_cost"):
+            setattr(data, name, take(getattr(self, name)))
+        data.initial_inventory = self.initial_inventory
+        return data
+
+
+class MultiPeriodModel:
+    """
+    The time-indexed Super Chip LP.
+
+    Variables (MVars): production p[t, f, c], shipments s[t, f, c, r] and
+    end-of-period inventory inv[t, f, c]. Rows:
+
+        capacity[t, f]:   sum_c p[t, f, c] <= capacity[t, f]
+        balance[t, f, c]: inv[t] - inv[t - 1] - p[t] + sum_r s[t, r] = 0
+                          (= initial inventory for t = 0)
+        demand[t, r, c]:  sum_f s[t, f, c, r] >= demand[t, r, c]
+
+    Each row family is assembled as a coefficient array over the flattened
+    columns, then `set_data` loads costs and right-hand sides in place.
+    """
+
+    def __init__(self, data, env=None, name="super_chip_multiperiod"):
+        T, F, C, R = data.shape
+        m = Model(name, env=env)
+        m.modelSense = GRB.MINIMIZE
+        m.setParam("outputFlag", 0)
+        self.p = m.addMVar((T, F, C), lb=0.0, name="p")
+        self.s = m.addMVar((T, F, C, R), lb=0.0, name="s")
+        self.inv = m.addMVar((T, F, C), lb=0.0, name="inv")
+        columns = (self.p.reshape(-1).tolist() + self.s.reshape(-1).tolist()
+                   + self.inv.reshape(-1).tolist())
+        n_fc = T * F * C
+        p0, s0, i0 = 0, n_fc, n_fc + n_fc * R
+
+        tf = np.arange(T * F)[:, None]
+        cap_idx = p0 + tf * C + np.arange(C)
+        self.capacity = add_rows(m, columns, cap_idx, np.ones(cap_idx.shape), GRB.LESS_EQUAL,
+                                 np.zeros(T * F), "capacity")
+
+        tfc = np.arange(n_fc)
+        bal_idx = np.column_stack([i0 + tfc, i0 + tfc - F * C, p0 + tfc, s0 + tfc[:, None] * R + np.arange(R)])
+        bal_val = np.column_stack([np.ones(n_fc), -(tfc >= F * C).astype(float), -np.ones(n_fc), np.ones((n_fc, R))])
+        bal_idx[:F * C, 1] = 0    # no previous inventory in the first period
+        self.balance = add_rows(m, columns, bal_idx, bal_val, GRB.EQUAL, np.zeros(n_fc), "balance")
+
+        # demand[t, r, c] sums s[t, f, c, r] over f
+        t, r, c = np.unravel_index(np.arange(T * R * C), (T, R, C))
+        dem_idx = s0 + ((t[:, None] * F + np.arange(F)) * C + c[:, None]) * R + r[:, None]
+        self.demand = add_rows(m, columns, dem_idx, np.ones(dem_idx.shape), GRB.GREATER_EQUAL,
+                               np.zeros(T * R * C), "demand")
+        self.model = m
+        self.shape = (T, F, C, R)
+        self.set_data(data)
+
+    def set_data(self, data, initial_inventory=None):
+        """Load costs, capacities, demand and the starting inventory in place."""
+        T, F, C, R = self.shape
+        self.p.Obj = data.prod_cost
+        self.s.Obj = data.shipping_cost
+        self.inv.Obj = data.holding_cost
+        stock = data.initial_inventory if initial_inventory is None else initial_inventory
+        bal_rhs = np.zeros((T, F, C))
+        bal_rhs[0] = stock
+        m = self.model
+        m.setAttr("RHS", self.capacity, data.capacity.ravel().tolist())
+        m.setAttr("RHS", self.balance, bal_rhs.ravel().tolist())
+        m.setAttr("RHS", self.demand, data.demand.ravel().tolist())
+
+    def optimize(self):
+        self.model.optimize()
+        return self.model.Status
+
+
+class MultiPeriodResult:
+    """
+    Multi-period plan.
+
+    Attributes:
+        production (np.ndarray): (T, F, C).
+        shipments (np.ndarray): (T, F, C, R).
+        inventory (np.ndarray): (T, F, C) end-of-period stock.
+        capacity_duals (np.ndarray): (T, F) Pi of the capacity rows (monolithic solves only).
+        demand_duals (np.ndarray): (T, R, C) Pi of the demand rows (monolithic solves only).
+    """
+
+    def __init__(self, data, status, production, shipments, inventory, runtime, iterations,
+                 windows=1, capacity_duals=None, demand_duals=None):
+        self.status = status
+        self.production = production
+        self.shipments = shipments
+        self.inventory = inventory
+        self.runtime = runtime
+        self.iterations = iterations
+        self.windows = windows
+        self.capacity_duals = capacity_duals
+        self.demand_duals = demand_duals
+        self.cost = (float((data.prod_cost * production).sum() + (data.shipping_cost * shipments).sum()
+                           + (data.holding_cost * inventory).sum())
+                     if status == GRB.OPTIMAL else float("inf"))
+
+    def facility_totals(self):
+        """(T, F) units produced per facility and period."""
+        return self.production.sum(axis=2)
+
+    def __repr__(self):
+        T, F, C = self.production.shape
+        return (f"MultiPeriodResult(cost={self.cost:g}, periods={T}, windows={self.windows}, "
+                f"runtime={self.runtime:.3f}s)")
+
+
+def multiperiod_solve(data, window=None, step=1, warm_start=True, env=None):
+    """
+    Solve the multi-period Super Chip model.
+
+    Args:
+        data (MultiPeriodData): Time-indexed data.
+        window (int, optional): None solves all periods as one LP. Otherwise a
+            window of this many periods is re-optimised and its first `step`
+            periods committed, carrying the inventory into the next window.
+        step (int, optional): Periods committed per window. Defaults to 1.
+        warm_start (bool, optional): Load each window into the previous
+            window's model in place, so the simplex restarts from its optimal
+            basis. False discards the basis before every window. Defaults to True.
+        env (gurobipy.Env, optional): Environment to build the model in.
+
+    Returns:
+        MultiPeriodResult: Status is that of the first window that failed, if any.
+    """
+    start = time.perf_counter()
+    T, F, C, R = data.shape
+    if window is None or window >= T:
+        mpm = MultiPeriodModel(data, env=env)
+        status = mpm.optimize()
+        if status != GRB.OPTIMAL:
+            return MultiPeriodResult(data, status, np.zeros((T, F, C)), np.zeros((T, F, C, R)),
+                                     np.zeros((T, F, C)), time.perf_counter() - start,
+                                     int(mpm.model.IterCount))
+        m = mpm.model
+        return MultiPeriodResult(
+            data, status, mpm.p.X, mpm.s.X, mpm.inv.X, time.perf_counter() - start, int(m.IterCount),
+            capacity_duals=np.array(m.getAttr("Pi", mpm.capacity)).reshape(T, F),
+            demand_duals=np.array(m.getAttr("Pi", mpm.demand)).reshape(T, R, C),
+        )
+
+    production = np.zeros((T, F, C))
+    shipments = np.zeros((T, F, C, R))
+    inventory = np.zeros((T, F, C))
+    stock = data.initial_inventory
+    mpm = None
+    windows = iterations = 0
+    status = GRB.OPTIMAL
+    for t0 in range(0, T, step):
+        chunk = data.window(t0, window)
+        if mpm is None:
+            mpm = MultiPeriodModel(chunk, env=env, name="super_chip_window")
+        mpm.set_data(chunk, initial_inventory=stock)
+        if not warm_start:
+            mpm.model.reset()
+        status = mpm.optimize()
+        windows += 1
+        iterations += int(mpm.model.IterCount)
+        if status != GRB.OPTIMAL:
+            break
+        k = min(step, T - t0)
+        production[t0:t0 + k] = mpm.p.X[:k]
+        shipments[t0:t0 + k] = mpm.s.X[:k]
+        inventory[t0:t0 + k] = mpm.inv.X[:k]
+        stock = inventory[t0 + k - 1]
+    return MultiPeriodResult(data, status, production, shipments, inventory,
+                             time.perf_counter() - start, iterations, windows)
@@ -0,0 +1,247 @@
+import time
+
+import numpy as np
+
+
+def tour_length(tour, distance):
+    tour = np.asarray(tour)
+    return float(distance[tour, np.roll(tour, -1)].sum())
+
+
+def neighbour_lists(distance, k=10):
+    """(N, k) array with the k nearest other stops of each stop, nearest first."""
+    n = len(distance)
+    k = min(k, n - 1)
+    d = distance.astype(float, copy=True)
+    np.fill_diagonal(d, np.inf)
+    nearest = np.argpartition(d, k - 1, axis=1)[:, :k]
+    order = np.argsort(np.take_along_axis(d, nearest, axis=1), axis=1)
+    return np.take_along_axis(nearest, order, axis=1)
+
+
+def nearest_neighbour(distance, start=0):
+    """Greedy tour: always move to the closest stop not visited yet."""
+    n = len(distance)
+    tour = np.empty(n, dtype=np.int64)
+    visited = np.zeros(n, dtype=bool)
+    node = start
+    for k in range(n):
+        tour[k] = node
+        visited[node] = True
+        if k < n - 1:
+            row = np.where(visited, np.inf, distance[node])
+            node = int(np.argmin(row))
+    return tour
+
+
+def two_opt(tour, distance, neighbours, tol=1e-9):
+    """
+    Best-improvement 2-opt restricted to neighbour lists.
+
+    Each pass scores every move that adds an edge (a, c) with c among the nearest
+    stops of a, for all positions at once, and applies the best one. Returns the
+    improved tour and the number of moves applied.
+    """
+    t = np.array(tour, dtype=np.int64)
+    n = len(t)
+    pos = np.empty(n, dtype=np.int64)
+    moves = 0
+    while True:
+        pos[t] = np.arange(n)
+        a = t
+        b = np.roll(t, -1)
+        c = neighbours[a]
+        j = pos[c]
+        d = t[(j + 1) % n]
+        gain = (distance[a, b][:, None] + distance[c, d]
+                - distance[a[:, None], c] - distance[b[:, None], d])
+        gain[(c == b[:, None]) | (d == a[:, None])] = -np.inf
+        best = np.argmax(gain)
+        i, kk = divmod(int(best), gain.shape[1])
+        if gain[i, kk] <= tol:
+            return t, moves
+        j = int(j[i, kk])
+        if i < j:
+            t[i + 1:j + 1] = t[i + 1:j + 1][::-1]
+        else:
+            t[j + 1:i + 1] = t[j + 1:i + 1][::-1]
+        moves += 1
+
+
+def or_opt(tour, distance, neighbours, segment_lengths=(1, 2, 3), tol=1e-9):
+    """
+    Best-improvement Or-opt: move a segment of 1-3 consecutive stops next to one
+    of the nearest stops of its first stop, in either orientation. Returns the
+    improved tour and the number of moves applied.
+    """
+    t = np.array(tour, dtype=np.int64)
+    n = len(t)
+    pos = np.empty(n, dtype=np.int64)
+    moves = 0
+    while True:
+        pos[t] = np.arange(n)
+        best_gain, best_move = tol, None
+        for L in segment_lengths:
+            if n < L + 3:
+                continue
+            idx = np.arange(n)
+            s0 = t
+            se = t[(idx + L - 1) % n]
+            prev = t[idx - 1]
+            nxt = t[(idx + L) % n]
+            removed = distance[prev, s0] + distance[se, nxt] - distance[prev, nxt]
+
+            c = neighbours[s0]
+            pc = pos[c]
+            inside = (pc - idx[:, None]) % n < L
+            # forward: c -> s0 .. se -> succ(c)
+            d = t[(pc + 1) % n]
+            fwd = removed[:, None] - (distance[c, s0[:, None]] + distance[se[:, None], d] - distance[c, d])
+            fwd[inside | (c == prev[:, None])] = -np.inf
+            # reversed: pred(c) -> se .. s0 -> c
+            e = t[pc - 1]
+            rev = removed[:, None] - (distance[e, se[:, None]] + distance[s0[:, None], c] - distance[e, c])
+            rev[inside | (c == nxt[:, None])] = -np.inf
+
+            for gain, reverse in ((fwd, False), (rev, True)):
+                best = int(np.argmax(gain))
+                i, kk = divmod(best, gain.shape[1])
+                if gain[i, kk] > best_gain:
+                    best_gain, best_move = gain[i, kk], (i, L, int(c[i, kk]), reverse)
+        if best_move is None:
+            return t, moves
+
+        i, L, c, reverse = best_move
+        r = np.roll(t, -i)
+        seg, rest = r[:L], r[L:]
+        q = int(np.flatnonzero(rest == c)[0])
+        if reverse:
+            t = np.concatenate([rest[:q], seg[::-1], rest[q:]])
+        else:
+            t = np.concatenate([rest[:q + 1], seg, rest[q + 1:]])
+        moves += 1
+
+
+def improve_tour(tour, distance, neighbours=None, k=10):
+    """Alternate 2-opt and Or-opt until neither finds an improving move."""
+    if neighbours is None:
+        neighbours = neighbour_lists(distance, k)
+    t = np.asarray(tour, dtype=np.int64)
+    while True:
+        t, _ = two_opt(t, distance, neighbours)
+        t, moves_oropt = or_opt(t, distance, neighbours)
+        if moves_oropt == 0:
+            return t
+
+
+def heuristic_tour(distance, k=10, start=0):
+    """
+    Nearest-neighbour tour improved with 2-opt and Or-opt on k-nearest neighbour
+    lists, starting at `start`.
+
+    The moves assume a symmetric matrix; an asymmetric one is symmetrised
+    ((D + D^T) / 2) for the improvement phase only.
+
+    Args:
+        distance (array-like): (N, N) distance matrix.
+        k (int, optional): Length of the neighbour lists. Defaults to 10.
+        start (int, optional): First stop of the tour. Defaults to 0.
+
+    Returns:
+        List[int]: The tour, as a list of stops beginning with `start`.
+    """
+    distance = np.asarray(distance, dtype=float)
+    n = len(distance)
+    if n <= 3:
+        return [start] + [i for i in range(n) if i != start]
+    tour = nearest_neighbour(distance, start)
+    sym = distance if np.allclose(distance, distance.T) else (distance + distance.T) / 2
+    tour = improve_tour(tour, sym, neighbour_lists(sym, k))
+    k0 = int(np.flatnonzero(tour == start)[0])
+    return np.roll(tour, -k0).tolist()
+
+
+def lp_bound(distance, env=None, max_rounds=100):
+    """
+    Lower bound on the tour length from the LP relaxation of the TSP formulation
+    (`SymmetricTSPSolver` for symmetric matrices, `TSPSolver` otherwise),
+    tightened with subtour cuts on the connected components of the fractional
+    support until it is connected (or `max_rounds` is reached).
+
+    Returns:
+        Tuple[float, int]: the bound and the number of cuts added.
+    """
+    from gurobipy import GRB
+    from utils.tsp_solver import SymmetricTSPSolver, TSPSolver
+
+    distance = np.asarray(distance, dtype=float)
+    symmetric = len(distance) >= 3 and np.allclose(distance, distance.T)
+    solver = (SymmetricTSPSolver if symmetric else TSPSolver)(distance, env=env)
+    m = solver.build()
+    x = m._x
+    finder = solver.finder
+    m.setAttr("VType", finder.variables, [GRB.CONTINUOUS] * len(finder.variables))
+    m.setAttr("UB", finder.variables, [1.0] * len(finder.variables))
+    m.Params.LazyConstraints = 0
+
+    cuts = 0
+    for _ in range(max_rounds):
+        m.optimize()
+        if m.Status != GRB.OPTIMAL:
+            break
+        values = np.array(m.getAttr("X", finder.variables))
+        components = _components(solver.n, finder.arc_i[values > 1e-6], finder.arc_j[values > 1e-6])
+        if len(components) == 1:
+            break
+        for comp in components:
+            m.addConstr(solver.subtour_expr(x, comp) <= len(comp) - 1)
+            cuts += 1
+    bound = m.ObjVal if m.Status == GRB.OPTIMAL else float("-inf")
+    m.dispose()
+    return bound, cuts
+
+
+def _components(n, i, j):
+    parent = list(range(n))
+
+    def root(a):
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
+
+    for a, b in zip(i.tolist(), j.tolist()):
+        ra, rb = root(a), root(b)
+        if ra != rb:
+            parent[ra] = rb
+    groups = {}
+    for a in range(n):
+        groups.setdefault(root(a), []).append(a)
+    return list(groups.values())
+
+
+def tsp_heuristic(distance, k=10, bound=True, env=None):
+    """
+    Fast approximate mode: the `heuristic_tour` without branch-and-bound.
+
+    Args:
+        distance (array-like): (N, N) distance matrix.
+        k (int, optional): Length of the neighbour lists. Defaults to 10.
+        bound (bool, optional): Also solve `lp_bound` to report the optimality
+            gap. Needs Gurobi and one variable per edge, so switch it off for very
+            large instances. Defaults to True.
+        env (gurobipy.Env, optional): Environment for the bound LP.
+
+    Returns:
+        TSPResult: `status` is None, and `gap` is relative to the tour length like
+        Gurobi's MIPGap (NaN when `bound` is False).
+    """
+    from utils.tsp_solver import TSPResult
+
+    start = time.perf_counter()
+    distance = np.asarray(distance, dtype=float)
+    tour = heuristic_tour(distance, k)
+    length = tour_length(tour, distance)
+    lower, cuts = lp_bound(distance, env) if bound else (float("nan"), 0)
+    gap = (length - lower) / length if length else 0.0
+    return TSPResult(tour, length, None, gap, lower, cuts, time.perf_counter() - start)
@@ -0,0 +1,195 @@
+import time
+from itertools import combinations
+
+import gurobipy as gp
+from gurobipy import GRB
+import numpy as np
+
+from utils.subtour import SubtourFinder
+from utils.tsp_heuristics import heuristic_tour
+
+
+class TSPResult:
+    def __init__(self, tour, length, status, gap, bound, cuts_added, runtime):
+        self.tour = tour
+        self.length = length
+        self.status = status
+        self.gap = gap
+        self.bound = bound
+        self.cuts_added = cuts_added
+        self.runtime = runtime
+
+    def __repr__(self):
+        return (f"TSPResult(length={self.length:.2f}, stops={len(self.tour)}, "
+                f"gap={self.gap:.4%}, cuts={self.cuts_added}, runtime={self.runtime:.2f}s)")
+
+
+class TSPSolver:
+    """
+    Branch-and-cut TSP solver.
+
+    Builds the assignment formulation of `TSPSolve` in practice_code/TSP.py, but
+    instead of re-optimizing from scratch after every round of `sbtrElim` cuts,
+    subtour-elimination constraints are added as lazy constraints from a MIPSOL
+    callback. The whole solve is a single branch-and-bound run, and each cut is
+    the subset form sum(x[i, j] for i, j in S) <= |S| - 1, which covers both
+    directions of the subtour.
+
+    Unless `warm_start` is off, branch-and-bound starts from the nearest
+    neighbour + 2-opt / Or-opt tour of `heuristic_tour`, given to Gurobi as a MIP
+    start through the `Start` attribute.
+
+    Args:
+        distance (array-like):
+            (N, N) distance matrix. The diagonal is ignored, so the big-M
+            `Distance[i][i] = m` trick is not needed.
+        env (gurobipy.Env, optional): Environment to build the model in.
+        time_limit (float, optional): Gurobi TimeLimit in seconds.
+        mip_gap (float, optional): Gurobi MIPGap.
+        output_flag (int, optional): Gurobi OutputFlag. Defaults to 0.
+        warm_start (bool, optional): Seed the search with a heuristic tour.
+            Defaults to True.
+    """
+
+    def __init__(self, distance, env=None, time_limit=None, mip_gap=None, output_flag=0,
+                 warm_start=True):
+        self.distance = np.asarray(distance, dtype=float)
+        n, n2 = self.distance.shape
+        if n != n2:
+            raise ValueError("distance must be a square matrix")
+        self.n = n
+        self.env = env
+        self.time_limit = time_limit
+        self.mip_gap = mip_gap
+        self.output_flag = output_flag
+        self.warm_start = warm_start
+        self.start_tour = None
+        self.cuts_added = 0
+
+    def _new_model(self, name):
+        m = gp.Model(name, env=self.env)
+        m.ModelSense = GRB.MINIMIZE
+        m.Params.OutputFlag = self.output_flag
+        m.Params.LazyConstraints = 1
+        if self.time_limit is not None:
+            m.Params.TimeLimit = self.time_limit
+        if self.mip_gap is not None:
+            m.Params.MIPGap = self.mip_gap
+        return m
+
+    def build(self):
+        n = self.n
+        m = self._new_model("tsp")
+        arcs = [(i, j) for i in range(n) for j in range(n) if i != j]
+        x = m.addVars(arcs, obj={(i, j): self.distance[i, j] for i, j in arcs},
+                      vtype=GRB.BINARY, name="x")
+        m.addConstrs((x.sum(i, "*") == 1 for i in range(n)), name="to")
+        m.addConstrs((x.sum("*", j) == 1 for j in range(n)), name="from")
+
+        m._x = x
+        m._solver = self
+        self.model = m
+        self.cuts_added = 0
+        self.finder = SubtourFinder.from_vars(x, n)
+        return m
+
+    @staticmethod
+    def subtour_expr(x, cycle):
+        """Left-hand side of the subset cut for `cycle`: every arc inside it."""
+        return gp.quicksum(x[i, j] for i in cycle for j in cycle if i != j)
+
+    @staticmethod
+    def _callback(model, where):
+        if where != GRB.Callback.MIPSOL:
+            return
+        solver = model._solver
+        cycles = solver.finder.from_callback(model)
+        if len(cycles) == 1:
+            return
+        for cycle in cycles:
+            model.cbLazy(solver.subtour_expr(model._x, cycle) <= len(cycle) - 1)
+            solver.cuts_added += 1
+
+    def set_start(self, tour):
+        """Pass `tour` to Gurobi as the MIP start."""
+        self.start_tour = list(tour)
+        self.model.setAttr("Start", self.finder.variables, self.finder.tour_values(tour).tolist())
+
+    def solve(self) -> TSPResult:
+        start = time.perf_counter()
+        if self.n <= 1:
+            # no arcs to choose: the tour is the single stop (or empty)
+            return TSPResult(list(range(self.n)), 0.0, GRB.OPTIMAL, 0.0, 0.0, 0, time.perf_counter() - start)
+        m = self.build()
+        if self.warm_start and self.n >= 3:
+            self.set_start(heuristic_tour(self.distance))
+        m.optimize(self._callback)
+
+        if m.SolCount == 0:
+            return TSPResult([], float("inf"), m.Status, float("inf"), m.ObjBound,
+                             self.cuts_added, time.perf_counter() - start)
+
+        cycles = self.finder.from_model(m)
+        tour = cycles[0] if len(cycles) == 1 else []
+        if tour:
+            # start the tour at stop 0, as printed by the practice scripts
+            k = tour.index(0)
+            tour = tour[k:] + tour[:k]
+        return TSPResult(tour, m.ObjVal, m.Status, m.MIPGap, m.ObjBound,
+                         self.cuts_added, time.perf_counter() - start)
+
+
+class SymmetricTSPSolver(TSPSolver):
+    """
+    Branch-and-cut TSP solver for symmetric distance matrices.
+
+    One binary variable per edge {i, j} with i < j, N(N-1)/2 in total instead of
+    the N(N-1) arcs of `TSPSolver` (and the N^2 variables, diagonal included, of
+    `TSPSolve` in practice_code/TSP.py). Every stop has degree 2, and each subtour
+    S gets a single cut sum(x[i, j] for {i, j} in S) <= |S| - 1, so there is no
+    `sbtrElim+` / `sbtrElim-` pair and no big-M coefficient anywhere in the model.
+
+    Only the upper triangle of `distance` is used. Arguments as for `TSPSolver`.
+    """
+
+    def __init__(self, distance, **kwargs):
+        super().__init__(distance, **kwargs)
+        if self.n < 3:
+            raise ValueError("the symmetric formulation needs at least 3 stops")
+
+    def build(self):
+        n = self.n
+        m = self._new_model("tsp_symmetric")
+        edges = list(combinations(range(n), 2))
+        x = m.addVars(edges, obj={(i, j): self.distance[i, j] for i, j in edges},
+                      vtype=GRB.BINARY, name="x")
+        m.addConstrs((x.sum(i, "*") + x.sum("*", i) == 2 for i in range(n)), name="degree")
+
+        m._x = x
+        m._solver = self
+        self.model = m
+        self.cuts_added = 0
+        self.finder = SubtourFinder.from_vars(x, n, directed=False)
+        return m
+
+    @staticmethod
+    def subtour_expr(x, cycle):
+        """Left-hand side of the subset cut for `cycle`: every edge inside it."""
+        return gp.quicksum(x[i, j] for i, j in combinations(sorted(cycle), 2))
+
+
+def tsp_solve(distance, symmetric=None, **kwargs) -> TSPResult:
+    """
+    Solve the TSP over `distance` in a single branch-and-cut run.
+
+    Args:
+        distance (array-like): (N, N) distance matrix.
+        symmetric (bool, optional): Use `SymmetricTSPSolver`. Defaults to None,
+            which picks it whenever `distance` is symmetric.
+        **kwargs: Passed on to the solver, see `TSPSolver`.
+    """
+    distance = np.asarray(distance, dtype=float)
+    if symmetric is None:
+        symmetric = len(distance) >= 3 and np.allclose(distance, distance.T)
+    solver = SymmetricTSPSolver if symmetric else TSPSolver
+    return solver(distance, **kwargs).solve()
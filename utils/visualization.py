@@ -1,4 +1,3 @@
-from bokeh.plotting import figure, output_file, show
 import os
 
 class BarPlotter:
@@ -11,6 +10,8 @@ class BarPlotter:
              y_label: str = "y",
              width: int = 800,
              height: int = 400):
+        from bokeh.plotting import figure, output_file, show
+
         cats = [str(v) for v in x]
 
         os.makedirs(output_dir, exist_ok=True)